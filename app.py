@@ -1,7 +1,17 @@
 # app.py — Home & Navegación para el Agente Comercial Babel
 
-import streamlit as st
-from datetime import datetime
+from core import profiler
+
+profiler.begin_run("inicio")
+with profiler.span("import"):
+    import streamlit as st
+    from datetime import datetime
+
+    from core import state
+    from core.memory import count_projects
+    from core.warmup import start_warm_up
+
+start_warm_up()  # con BABEL_WARMUP=1: fuentes, estilos, índices… en segundo plano
 
 # ---------- Configuración de página ----------
 st.set_page_config(
@@ -9,11 +19,13 @@ st.set_page_config(
     page_icon="💼",
     layout="wide",
 )
+with profiler.span("estado"):
+    state.attach()
 
 # ---------- Estado inicial (ids seguros) ----------
 DEFAULT_STATE = {
     "lead": {},                              # empresa, contacto, correo, tel, descripción
-    "memoria_proyectos": [],                 # lista de proyectos anteriores
+    "memoria_proyectos": [],                 # proyectos anteriores similares al lead activo
     "score": None,                           # 0..100
     "calificado": False,                     # True si score >= 70
     "business_case": {},                     # dict con campos del caso de negocio
@@ -41,6 +53,7 @@ st.sidebar.page_link("app.py", label="🏠 Inicio")
 # ⚠️ Importante: estos nombres deben existir exactamente en tu carpeta /pages
 st.sidebar.page_link("pages/1_Lead_y_Memoria.py", label="1️⃣ Lead y Memoria")
 st.sidebar.page_link("pages/2_Calificacion_y_Caso.py", label="2️⃣ Calificación + Caso")
+st.sidebar.page_link("pages/3_Analitica.py", label="3️⃣ Analítica")
 
 st.sidebar.markdown("---")
 st.sidebar.caption("© Babel • Agente Comercial IA • v2025.10")
@@ -55,8 +68,8 @@ with col_title:
 col1, col2, col3 = st.columns(3)
 with col1:
     st.metric("Score (Calificación)", kpi_value(st.session_state["score"], "%"))
-with col2:
-    st.metric("Proyectos en memoria", len(st.session_state["memoria_proyectos"]))
+with col2, profiler.span("memoria"):
+    st.metric("Proyectos en memoria", count_projects())  # solo SQLite: sin cargar FAISS
 with col3:
     st.metric("Listo para PDF", "Sí" if st.session_state["listo_pdf"] else "No")
 
@@ -97,9 +110,17 @@ with st.expander("❓ ¿Qué hace cada fase?"):
 - Si alcanza el umbral: habilita **Chat guiado** para completar el Caso de Negocio.
 - Integra **Inteligencia competitiva** (Babel vs. competidores) para enriquecer la solución.
 - Marca **Listo para PDF** para permitir la descarga del documento final en esa misma página.
+
+**3) Analítica**
+- Distribución de score, % de leads **≥ 70** y criterios que más bloquean la calificación, por día, semana o mes.
         """
     )
 
 # ---------- Footer ----------
 st.markdown("---")
 st.caption("Hecho con Streamlit • Mantén los nombres de archivo de /pages EXACTOS para evitar errores de navegación.")
+
+with profiler.span("estado"):
+    state.commit()
+profiler.end_run()
+profiler.render_panel()
@@ -0,0 +1,75 @@
+# bench/bench_analytics.py — Tablero de analítica con millones de calificaciones
+#
+#   python bench/bench_analytics.py [--events 5000000] [--leads 1000000] [--days 730] [--new 1000]
+#
+# Carga N eventos sintéticos en el almacén columnar y mide: escritura, primer
+# pliegue completo, abrir el almacén en un proceso nuevo (snapshot + cola de
+# `--new` eventos) frente a recalcular todo, y el costo de cada consulta del
+# tablero por periodo.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.analytics import PERIODS, ScoreAnalytics  # noqa: E402
+
+
+def _ms(t0: float) -> float:
+    return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=5_000_000)
+    ap.add_argument("--days", type=int, default=730)
+    ap.add_argument("--new", type=int, default=1000)
+    ap.add_argument("--leads", type=int, default=1_000_000, help="leads distintos (los demás eventos re-califican)")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(7)
+    now = int(time.time())
+    # Probabilidad de "Sí" distinta por criterio para que haya un bloqueante claro
+    p_yes = np.array([0.7, 0.5, 0.6, 0.9, 0.8])
+    X = rng.random((args.events, len(p_yes))) < p_yes
+    ts = np.sort(now - rng.integers(0, args.days * 86400, args.events)).astype(np.int64)
+    lead_ids = rng.integers(1, args.leads + 1, args.events)
+
+    tmp = tempfile.TemporaryDirectory()
+    an = ScoreAnalytics(tmp.name)
+    t0 = time.perf_counter()
+    an.record_many(X, lead_ids=lead_ids, ts=ts)
+    print(f"Escritura: {args.events:,} eventos en {_ms(t0):.0f} ms")
+
+    t0 = time.perf_counter()
+    an.refresh()
+    print(f"Pliegue completo (sin snapshot): {_ms(t0):.0f} ms")
+
+    an.record_many(X[:args.new], lead_ids=lead_ids[:args.new], ts=np.full(args.new, now, dtype=np.int64))
+    t0 = time.perf_counter()
+    nuevo = ScoreAnalytics(tmp.name)
+    folded = nuevo.refresh()
+    print(f"Abrir en un proceso nuevo (snapshot + {folded:,} nuevos): {_ms(t0):.1f} ms")
+
+    os.remove(os.path.join(tmp.name, "agregados.npz"))
+    t0 = time.perf_counter()
+    ScoreAnalytics(tmp.name, snapshot_every=10 ** 12).refresh()
+    print(f"Abrir recalculando toda la historia: {_ms(t0):.0f} ms")
+
+    for period in PERIODS:
+        t0 = time.perf_counter()
+        for _ in range(20):
+            s = nuevo.summary(period)
+        print(f"Consulta por {period:<7}: {_ms(t0) / 20:6.2f} ms · {len(s['periodos'])} periodos · "
+              f"{s['total']:,} leads / {s['total_evaluaciones']:,} evaluaciones · "
+              f"{s['calificados'].sum() / s['total']:.0%} de leads con score ≥ 70")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# bench/bench_crawler.py — Crawler competitivo contra un servidor HTTP local
+#
+#   python bench/bench_crawler.py [--urls 50] [--latency 0.1] [--workers 8]
+#
+# El servidor local simula latencia de red y responde 304 a peticiones
+# condicionales, así que la segunda vuelta mide la caché en disco.
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.crawler import Crawler, DiskCache, comparison_section  # noqa: E402
+
+LATENCY = 0.1
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(LATENCY)
+        body = (f"<html><head><title>Competidor {self.path}</title></head><body>"
+                f"<p>Ofrecemos soporte 24/7 con SLA garantizado, ahorro del 30% y seguridad ISO 27001.</p>"
+                f"<p>Página {self.path}</p></body></html>").encode("utf-8")
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    global LATENCY
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--urls", type=int, default=50)
+    ap.add_argument("--latency", type=float, default=0.1)
+    ap.add_argument("--workers", type=int, default=8)
+    args = ap.parse_args()
+    LATENCY = args.latency
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    urls = [f"{base}/competidor/{i}" for i in range(args.urls)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Un solo host local: sin pausa por host para medir la concurrencia
+        crawler = Crawler(max_workers=args.workers, per_host_interval=0.0, cache=DiskCache(tmp),
+                          allow_private=True)  # servidor local de la prueba
+        for vuelta, max_age in (("fría", 3600), ("caché fresca", 3600), ("revalidación 304", 0)):
+            crawler.max_age = max_age
+            t0 = time.perf_counter()
+            pages = crawler.crawl(urls)
+            dt = time.perf_counter() - t0
+            print(f"vuelta {vuelta}: {len(pages)} URLs en {dt:.2f}s "
+                  f"({sum(p['cached'] for p in pages)} desde caché) · {crawler.stats}")
+        serial = args.urls * args.latency
+        print(f"referencia secuencial sin caché ≈ {serial:.1f}s")
+        print(comparison_section(pages[:3]))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
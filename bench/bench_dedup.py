@@ -0,0 +1,92 @@
+# bench/bench_dedup.py — Importación de leads con detección de casi duplicados (MinHash + LSH)
+#
+#   python bench/bench_dedup.py [--rows 100000] [--dup-rate 0.1]
+#
+# Genera un CRM sintético con una fracción de casi duplicados plantados (otra
+# grafía de la empresa, mismo correo con otro contacto, sufijo de país), lo
+# importa con `import_leads` en un store temporal y reporta filas/s, duplicados
+# recuperados y latencia de consulta por alta sobre el índice ya cargado.
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import unicodedata
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.dedup import LeadDedup, import_leads  # noqa: E402
+from core.leads import LeadStore  # noqa: E402
+
+PREFIJOS = ["Grupo", "Corporativo", "Industrias", "Servicios", "Tecnologías", "Comercial", ""]
+SUFIJOS = ["S.A. de C.V.", "SA de CV", "S.A.", "Inc.", "", "", "SAPI de CV"]
+NOMBRES = ["Ana", "Luis", "Carlos", "María", "José", "Laura", "Pedro", "Sofía", "Jorge", "Lucía", "Miguel", "Elena"]
+APELLIDOS = ["López", "García", "Martínez", "Hernández", "Pérez", "Sánchez", "Ramírez", "Torres", "Flores", "Rivera"]
+DESCS = ["Portal de autoservicio con integración CRM", "App móvil de pagos", "Migración a la nube y analítica",
+         "Chatbot de atención a clientes", "Plataforma de e-commerce B2B", ""]
+
+
+def _ascii(s: str) -> str:
+    return unicodedata.normalize("NFKD", s.lower()).encode("ascii", "ignore").decode()
+
+
+def make_rows(n: int, dup_rate: float, seed: int = 1) -> tuple:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        raiz = "".join(rnd.choice("bcdfghjklmnpqrstvz") + rnd.choice("aeiou") for _ in range(rnd.randint(2, 4)))
+        nombre = f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)}"
+        dominio = rnd.choice([raiz + ".com", raiz + ".com.mx", "gmail.com"])
+        rows.append({"empresa": f"{rnd.choice(PREFIJOS)} {raiz.capitalize()} {rnd.choice(SUFIJOS)}".strip(),
+                     "nombre": nombre, "correo": f"{_ascii(nombre).replace(' ', '.')}{i}@{dominio}",
+                     "telefono": "", "descripcion": rnd.choice(DESCS)})
+    dups = []
+    for i in rnd.sample(range(n), int(n * dup_rate)):
+        d = dict(rows[i])
+        k = rnd.random()
+        if k < 0.4:
+            d["empresa"] = d["empresa"].replace("S.A. de C.V.", "SA de CV").upper()
+        elif k < 0.7:
+            d["nombre"] = f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)}"
+        else:
+            d["empresa"] += " México"
+            d["descripcion"] = ""
+        dups.append(d)
+    return rows, dups
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100000)
+    ap.add_argument("--dup-rate", type=float, default=0.1)
+    args = ap.parse_args()
+
+    rows, dups = make_rows(args.rows, args.dup_rate)
+    tmp = tempfile.TemporaryDirectory()
+    store = LeadStore(os.path.join(tmp.name, "leads.db"))
+    dedup = LeadDedup()
+
+    t0 = time.perf_counter()
+    base = import_leads(store, dedup, rows)
+    t_base = time.perf_counter() - t0
+    print(f"Importación inicial: {base['filas']} filas en {t_base:.1f}s ({base['filas'] / t_base:,.0f} filas/s)")
+
+    t0 = time.perf_counter()
+    res = import_leads(store, dedup, dups)
+    t_dup = time.perf_counter() - t0
+    print(f"Lote con {len(dups)} casi duplicados en {t_dup:.2f}s: {res['fusionados']} fusionados, "
+          f"{len(res['marcados'])} marcados, {res['nuevos']} insertados como nuevos")
+
+    probes = dups[:1000] or rows[:1000]
+    t0 = time.perf_counter()
+    for d in probes:
+        dedup.query(d)
+    print(f"Consulta por alta con {len(dedup):,} leads indexados: "
+          f"{(time.perf_counter() - t0) / len(probes) * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# bench/bench_journal.py — Tiempo de retomar un caso según su largo (snapshots vs. reproducir todo)
+#
+#   python bench/bench_journal.py [--events 100 1000 10000]
+#
+# Escribe casos de N turnos en la bitácora y mide `load()` con snapshots cada
+# SNAPSHOT_EVERY eventos frente a reproducir la bitácora completa.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.journal import SNAPSHOT_EVERY, CaseJournal  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    print(f"{'eventos':>8}{'escritura µs/ev':>17}{'retomar (snapshots) ms':>25}{'retomar (todo) ms':>20}")
+    for n in args.events:
+        res = []
+        for every in (SNAPSHOT_EVERY, 10 ** 9):
+            j = CaseJournal(os.path.join(tmp.name, f"casos_{n}_{every}.db"), snapshot_every=every)
+            case = j.load(1)
+            t0 = time.perf_counter()
+            for i in range(n):
+                j.record(case, "turno", key=case.current_key,
+                         text=f"Turno {i}: ahorro del 20%, USD 40,000, integración con CRM y usuarios de Ventas.")
+            write_us = (time.perf_counter() - t0) / n * 1e6
+            t0 = time.perf_counter()
+            for _ in range(args.repeat):
+                j.load(1)
+            res.append((write_us, (time.perf_counter() - t0) / args.repeat * 1000))
+            j.close()
+        print(f"{n:>8}{res[0][0]:>17.0f}{res[0][1]:>25.2f}{res[1][1]:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# bench/bench_load.py — Prueba de carga: N sesiones comerciales simuladas en paralelo
+#
+#   python bench/bench_load.py [--sessions 8] [--concurrency 4]
+#   python bench/bench_load.py --save-baseline bench/baseline_load.json
+#   python bench/bench_load.py --baseline bench/baseline_load.json --tolerance 0.3
+#
+# Cada sesión recorre el flujo real con el arnés headless `AppTest` de Streamlit:
+# guarda un lead (1_Lead_y_Memoria.py), responde las 5 preguntas de TAB A, envía
+# las 14 respuestas del cuestionario por el chat y genera el PDF de TAB C; al final
+# descarga el PDF (llama al `data=` del botón) y exporta el mismo plan a PPTX, y
+# comprueba la firma de ambos archivos.
+# Con --baseline, termina con código 1 si algún p95 empeora más que la tolerancia.
+#
+# AppTest no admite varias sesiones en hilos del mismo proceso (usa un Runtime
+# global), así que la concurrencia se simula con procesos que comparten el mismo
+# directorio de datos, como varios procesos de Streamlit tras un balanceador.
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LEAD_PAGE = os.path.join(ROOT, "pages", "1_Lead_y_Memoria.py")
+CASE_PAGE = os.path.join(ROOT, "pages", "2_Calificacion_y_Caso.py")
+PDF_BUTTON = "⬇️ Descargar Plan de Negocio (PDF)"
+RADIOS = ("cal_fecha", "cal_mkt", "cal_pres", "cal_prio", "cal_dec")
+
+_lat = {}        # paso -> [segundos] (por proceso)
+_deferred = {}   # file_id -> callable de `data=` de los st.download_button (por proceso)
+
+
+def _timed(step: str, fn):
+    t0 = time.perf_counter()
+    at = fn()
+    dt = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+    _lat.setdefault(step, []).append(dt)
+    return at
+
+
+def _capture_downloads():
+    # Con `data=` callable, Streamlit solo registra la función y la ejecuta al hacer
+    # clic; el Runtime simulado de AppTest no sobrevive a run(), así que se guarda aquí
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    if getattr(MediaFileManager.add_deferred, "_bench", False):
+        return
+    add_deferred = MediaFileManager.add_deferred
+
+    def capture(self, data_callable, *args, **kwargs):
+        file_id = add_deferred(self, data_callable, *args, **kwargs)
+        _deferred[file_id] = data_callable
+        return file_id
+
+    capture._bench = True
+    MediaFileManager.add_deferred = capture
+
+
+def _download(at, label: str) -> bytes:
+    """Bytes que entrega el botón de descarga `label` (como al hacer clic)."""
+    btn = next((b for b in at.get("download_button") if b.proto.label == label), None)
+    if btn is None:
+        raise RuntimeError(f"no aparece el botón {label!r}")
+    fn = _deferred.pop(btn.proto.deferred_file_id, None)
+    if fn is None:
+        raise RuntimeError(f"el botón {label!r} no tiene datos diferidos")
+    data = fn()
+    _deferred.clear()   # los file_id de reruns anteriores ya no se usan
+    return data
+
+
+def _answers() -> dict:
+    from core.plan import QUESTION_KEYS
+    return {k: f"Respuesta de {k}: ahorro del 20% en costos, integración con CRM, usuarios de Ventas; "
+               f"presupuesto USD 80,000 y lanzamiento en marzo." for k in QUESTION_KEYS}
+
+
+def _init_worker(data_dir: str):
+    import logging
+    os.environ["BABEL_DATA_DIR"] = data_dir
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    run_session(f"calentamiento-{os.getpid()}", _answers())  # imports y cachés del proceso
+    _lat.clear()
+
+
+def _worker(i) -> tuple:
+    _lat.clear()
+    run_session(i, _answers())
+    return dict(_lat), peak_rss_mb()
+
+
+def run_session(i: int, answers: dict):
+    # AppTest sustituye sys.modules["__main__"] por la página; se restaura al final
+    # para que el pool pueda seguir resolviendo las funciones de este módulo.
+    main_mod = sys.modules["__main__"]
+    try:
+        _run_session(i, answers)
+    finally:
+        sys.modules["__main__"] = main_mod
+
+
+def _run_session(i: int, answers: dict):
+    from streamlit.testing.v1 import AppTest
+    _capture_downloads()
+
+    # 1) Lead
+    lead = AppTest.from_file(LEAD_PAGE, default_timeout=60)
+    _timed("lead_abrir", lead.run)
+    lead.text_input[0].set_value(f"Empresa Carga {i}")
+    lead.text_input[1].set_value(f"Contacto {i}")
+    lead.text_input[2].set_value(f"contacto{i}@empresa{i}.com")
+    lead.text_area[0].set_value("Portal de autoservicio con integración CRM y analítica")
+    _timed("lead_guardar", lead.button[0].click().run)
+
+    # 2) Calificación (TAB A)
+    case = AppTest.from_file(CASE_PAGE, default_timeout=60)
+    case.session_state["active_lead_idx"] = lead.session_state["active_lead_idx"]  # misma sesión del rep
+    _timed("caso_abrir", case.run)
+    for key in RADIOS:
+        case.radio(key=key).set_value("Sí")
+    _timed("calificar", case.button[0].click().run)
+
+    # 3) Chat con las 14 preguntas (TAB B); cada envío provoca st.rerun()
+    from core.plan import QUESTION_KEYS
+    for k in QUESTION_KEYS:
+        _timed("chat_turno", case.chat_input[0].set_value(answers[k]).run)
+
+    # 4) PDF (TAB C): se genera al pintar la pestaña con el plan completo
+    if not case.session_state["ready_for_pdf"] or not case.session_state["pdf_bytes"]:
+        raise RuntimeError("el plan no quedó listo para PDF")
+    _timed("pdf_rerun", case.run)
+
+    # 5) Descargas: el PDF que entrega el botón y el PPTX del mismo plan
+    pdf = _download(case, PDF_BUTTON)
+    if not pdf.startswith(b"%PDF-"):
+        raise RuntimeError(f"la descarga no es un PDF: {pdf[:8]!r}")
+    from core.export import render_plan_pptx
+    pptx = render_plan_pptx(case.session_state["plan_md"])
+    if not pptx.startswith(b"PK\x03\x04"):
+        raise RuntimeError(f"el PPTX no es un zip: {pptx[:8]!r}")
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 if sys.platform != "darwin" else rss / 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=8)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--baseline", help="JSON de referencia; falla si un p95 empeora más que --tolerance")
+    ap.add_argument("--tolerance", type=float, default=0.3)
+    ap.add_argument("--save-baseline", help="guardar los resultados como nueva referencia")
+    args = ap.parse_args()
+
+    # Datos en un directorio temporal: la prueba no toca data/
+    tmp = tempfile.TemporaryDirectory()
+
+    lat, rss = {}, []
+    with ProcessPoolExecutor(max_workers=args.concurrency, initializer=_init_worker,
+                             initargs=(tmp.name,)) as pool:
+        # Esperar a que todos los workers estén calientes antes de medir
+        list(pool.map(time.sleep, [0.01] * args.concurrency))
+        t0 = time.perf_counter()
+        for steps, peak in pool.map(_worker, range(args.sessions)):
+            rss.append(peak)
+            for step, xs in steps.items():
+                lat.setdefault(step, []).extend(xs)
+        dt = time.perf_counter() - t0
+    reruns = sum(len(xs) for xs in lat.values())
+
+    result = {"sessions": args.sessions, "concurrency": args.concurrency,
+              "reruns_por_s": reruns / dt, "rss_pico_mb": max(rss), "pasos": {}}
+    print(f"{args.sessions} sesiones ({args.concurrency} procesos) en {dt:.1f}s · "
+          f"{reruns} reruns → {result['reruns_por_s']:.1f} reruns/s · RSS pico por proceso {result['rss_pico_mb']:.0f} MB")
+    print(f"{'paso':<14}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for step, xs in lat.items():
+        p50, p95, p99 = np.percentile(np.array(xs) * 1000, [50, 95, 99])
+        result["pasos"][step] = {"n": len(xs), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+        print(f"{step:<14}{len(xs):>6}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+        print(f"referencia guardada en {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            base = json.load(fh)
+        regresiones = [
+            f"{step}: p95 {cur['p95_ms']:.1f} ms vs {base['pasos'][step]['p95_ms']:.1f} ms"
+            for step, cur in result["pasos"].items()
+            if step in base.get("pasos", {}) and cur["p95_ms"] > base["pasos"][step]["p95_ms"] * (1 + args.tolerance)
+        ]
+        if regresiones:
+            print("❌ Regresiones (> {:.0%}):\n  ".format(args.tolerance) + "\n  ".join(regresiones))
+            sys.exit(1)
+        print("✅ Sin regresiones respecto a la referencia.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench/bench_memory.py — Latencia de alta y búsqueda en la memoria de proyectos
+#
+#   python bench/bench_memory.py [--projects 100000] [--k 5]
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.memory import ProjectMemory  # noqa: E402
+
+WORDS = ("plataforma portal app móvil dashboard analítica CRM ERP integración nube migración chatbot IA "
+         "automatización pagos logística inventario banca seguros retail salud educación gobierno "
+         "facturación reportes seguridad datos APIs microservicios clientes ventas marketing soporte").split()
+
+
+def make_projects(n: int, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    return [{"nombre": f"Proyecto {i}", "cliente": f"Cliente {rnd.randrange(5000)}",
+             "descripcion": " ".join(rnd.choices(WORDS, k=12)), "resultado": " ".join(rnd.choices(WORDS, k=4))}
+            for i in range(n)]
+
+
+def pct(xs, p):
+    return float(np.percentile(np.asarray(xs) * 1000, p))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--projects", type=int, default=100_000)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--queries", type=int, default=500)
+    args = ap.parse_args()
+
+    projects = make_projects(args.projects)
+    with tempfile.TemporaryDirectory() as tmp:
+        mem = ProjectMemory(tmp)
+        t0 = time.perf_counter()
+        for i in range(0, len(projects), 10_000):
+            mem.add_many(projects[i:i + 10_000], flush=False)
+        t_bulk = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        mem.flush()
+        t_flush = time.perf_counter() - t0
+        print(f"alta masiva: {args.projects:,} proyectos en {t_bulk:.2f}s "
+              f"({args.projects / t_bulk:,.0f}/s) · flush a disco {t_flush * 1000:.0f} ms")
+
+        adds = []
+        for p in make_projects(100, seed=11):
+            t0 = time.perf_counter()
+            mem.add(p, flush=False)
+            adds.append(time.perf_counter() - t0)
+        print(f"alta individual (índice de {mem.index.ntotal:,}): p50 {pct(adds, 50):.2f} ms · p95 {pct(adds, 95):.2f} ms")
+
+        rnd = random.Random(3)
+        lat = []
+        for _ in range(args.queries):
+            q = " ".join(rnd.choices(WORDS, k=8))
+            t0 = time.perf_counter()
+            mem.search(q, k=args.k)
+            lat.append(time.perf_counter() - t0)
+        print(f"búsqueda top-{args.k}: p50 {pct(lat, 50):.2f} ms · p95 {pct(lat, 95):.2f} ms")
+
+        mem.flush()
+        t0 = time.perf_counter()
+        ProjectMemory(tmp)
+        print(f"apertura desde disco: {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# bench/bench_pdf.py — Planes renderizados a PDF por minuto (un núcleo)
+#
+#   python bench/bench_pdf.py [--plans 1000]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.markdown import parse_markdown  # noqa: E402
+from core.pdf import register_fonts, render_plan_pdf  # noqa: E402
+from core.plan import QUESTION_KEYS, build_plan  # noqa: E402
+
+FRASES = ("Reducir el tiempo de atención un 30% con automatización.",
+          "Integración con SAP y Salesforce, tablero de KPIs, alertas; exportación a Excel.",
+          "Licitación pública con evaluación técnica y económica.",
+          "Presupuesto de USD 120,000 aprobado por Finanzas.",
+          "Lanzamiento en marzo con piloto de 4 semanas.",
+          "Riesgo de adopción por cambio de procesos y seguridad de datos.")
+
+
+def make_plans(n: int, seed: int = 1) -> list:
+    rnd = random.Random(seed)
+    return [build_plan({k: f"{rnd.choice(FRASES)} (caso {i})" for k in QUESTION_KEYS})[0] for i in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--plans", type=int, default=1000)
+    args = ap.parse_args()
+
+    plans = make_plans(args.plans)
+    register_fonts()
+    render_plan_pdf(plans[0])  # calentar estilos, fuentes y logo
+
+    t0 = time.perf_counter()
+    total = 0
+    for md in plans:
+        total += len(render_plan_pdf(md))
+    dt = time.perf_counter() - t0
+    print(f"{args.plans} planes en {dt:.1f}s → {args.plans / dt * 60:,.0f} planes/min "
+          f"({dt / args.plans * 1000:.1f} ms/plan, {total / args.plans / 1024:.0f} KB/plan)")
+
+    recientes = plans[-200:]  # dentro del tamaño de la caché del AST
+    t0 = time.perf_counter()
+    for md in recientes:
+        parse_markdown(md)
+    print(f"AST desde caché: {(time.perf_counter() - t0) / len(recientes) * 1e6:.1f} µs/plan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# bench/bench_refine.py — Pipeline de refinamiento con IA contra un endpoint local simulado
+#
+#   python bench/bench_refine.py [--latency 0.5] [--timeout 2]
+#
+# El servidor local imita /v1/chat/completions de OpenAI: devuelve el JSON de
+# entrada con los textos en mayúscula tras `--latency` segundos.
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.plan import QUESTION_KEYS  # noqa: E402
+from core.refine import PromptCache, Refiner  # noqa: E402
+
+LATENCY = 0.5
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        fields = json.loads(req["messages"][-1]["content"])
+        time.sleep(LATENCY)
+        content = json.dumps({k: v["respuesta"].upper() for k, v in fields.items()}, ensure_ascii=False)
+        body = json.dumps({
+            "id": "mock", "object": "chat.completion", "created": int(time.time()), "model": req["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    global LATENCY
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.5)
+    ap.add_argument("--timeout", type=float, default=2.0)
+    ap.add_argument("--batch-tokens", type=int, default=120)
+    args = ap.parse_args()
+    LATENCY = args.latency
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}/v1"
+    answers = {k: f"respuesta de prueba para {k} con algo de contexto adicional del cliente" for k in QUESTION_KEYS}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        r = Refiner(base_url=base, timeout=args.timeout, batch_tokens=args.batch_tokens,
+                    cache=PromptCache(os.path.join(tmp, "c.db")))
+        # Calentar: import de openai, vocabulario de tiktoken y conexión
+        r.refine_now({"objetivos": "calentamiento"})
+        r.stats["requests"] = 0
+        t0 = time.perf_counter()
+        fut = r.submit(answers)
+        t_submit = time.perf_counter() - t0
+        fut.result()
+        t_done = time.perf_counter() - t0
+        print(f"submit (no bloquea): {t_submit * 1000:.1f} ms · {r.stats['requests']} lotes en paralelo "
+              f"listos en {t_done:.2f}s (secuencial ≈ {r.stats['requests'] * LATENCY:.1f}s)")
+
+        t0 = time.perf_counter()
+        got = r.refine_now(answers)
+        print(f"segunda vuelta desde caché: {len(got)} campos en {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+        # Endpoint más lento que el timeout: se cae a ai_refine (lookup vacío)
+        LATENCY = args.timeout + 1
+        slow = Refiner(base_url=base, timeout=args.timeout, cache=PromptCache(os.path.join(tmp, "s.db")))
+        t0 = time.perf_counter()
+        got = slow.refine_now(answers)
+        print(f"timeout: {len(got)} campos refinados tras {time.perf_counter() - t0:.2f}s · {slow.stats}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
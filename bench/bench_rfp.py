@@ -0,0 +1,78 @@
+# bench/bench_rfp.py — Ingesta de RFP en PDF: páginas/segundo y memoria pico
+#
+#   python bench/bench_rfp.py [--pages 500]
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.rfp import extract_fields, iter_chunks, iter_pages  # noqa: E402
+
+FILLER = ("El proveedor deberá describir su metodología de trabajo y el equipo asignado. "
+          "Se valorará la claridad de la propuesta técnica y la documentación entregada. "
+          "Los entregables se revisarán en comités quincenales con el área usuaria. ")
+SIGNAL_LINES = ("El presupuesto máximo es de USD 250,000 más impuestos.",
+                "La fecha estimada de lanzamiento es el 15/03/2026.",
+                "La forma de adjudicación será mediante licitación pública.",
+                "Criterios de evaluación: precio, calidad y experiencia.")
+
+
+def make_pdf(path: str, pages: int, seed: int = 5):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    rnd = random.Random(seed)
+    c = canvas.Canvas(path, pagesize=letter)
+    for _ in range(pages):
+        y = 740
+        for _ in range(45):
+            line = rnd.choice(SIGNAL_LINES) if rnd.random() < 0.01 else FILLER[rnd.randrange(0, 120):][:95]
+            c.drawString(40, y, line)
+            y -= 15
+        c.showPage()
+    c.save()
+
+
+def rss_mb() -> float:
+    """RSS actual del proceso (Linux); NaN si no está disponible."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return float("nan")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=500)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rfp.pdf")
+        make_pdf(path, args.pages)
+        size_mb = os.path.getsize(path) / 1e6
+
+        t0 = time.perf_counter()
+        n = 0
+        samples = []
+        for text in iter_pages(path):
+            n += 1
+            extract_fields(iter_chunks([text]))
+            if n % 50 == 0:
+                samples.append(rss_mb())
+        dt = time.perf_counter() - t0
+
+        print(f"{n} páginas ({size_mb:.1f} MB) en {dt:.2f}s → {n / dt:,.0f} páginas/s")
+        print("RSS (MB) cada 50 páginas: " + " ".join(f"{m:.0f}" for m in samples))
+
+        t0 = time.perf_counter()
+        fields = extract_fields(iter_chunks(iter_pages(path)))
+        print(f"ingesta completa en {time.perf_counter() - t0:.2f}s · campos: {', '.join(sorted(fields))}")
+
+
+if __name__ == "__main__":
+    main()
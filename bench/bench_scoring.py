@@ -0,0 +1,53 @@
+# bench/bench_scoring.py — Rendimiento del motor de calificación por lotes
+#
+#   python bench/bench_scoring.py [--rows 100000]
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.scoring import CRITERIA_KEYS, score_file, score_rows  # noqa: E402
+
+
+def make_rows(n: int, seed: int = 7) -> list:
+    rng = np.random.default_rng(seed)
+    yes = rng.random((n, len(CRITERIA_KEYS))) < 0.6
+    return [
+        {"empresa": f"Empresa {i}", **{k: ("Sí" if v else "No") for k, v in zip(CRITERIA_KEYS, row)}}
+        for i, row in enumerate(yes.tolist())
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000)
+    args = ap.parse_args()
+
+    rows = make_rows(args.rows)
+
+    t0 = time.perf_counter()
+    scores, ok = score_rows(rows)
+    t_mem = time.perf_counter() - t0
+    print(f"score_rows (memoria): {args.rows:,} filas en {t_mem:.3f}s → {args.rows / t_mem:,.0f} filas/s "
+          f"({int(ok.sum()):,} calificados)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "leads.csv"), os.path.join(tmp, "out.csv")
+        with open(src, "w", newline="", encoding="utf-8") as fh:
+            w = csv.DictWriter(fh, fieldnames=list(rows[0]))
+            w.writeheader()
+            w.writerows(rows)
+        t0 = time.perf_counter()
+        score_file(src, dst)
+        t_io = time.perf_counter() - t0
+    print(f"score_file (CSV→CSV): {args.rows:,} filas en {t_io:.3f}s → {args.rows / t_io:,.0f} filas/s")
+
+
+if __name__ == "__main__":
+    main()
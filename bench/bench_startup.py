@@ -0,0 +1,92 @@
+# bench/bench_startup.py — Arranque en frío y costo por rerun de la página del caso
+#
+#   python bench/bench_startup.py [--repeat 3] [--reruns 20]
+#
+# Cada medición corre en un proceso nuevo (caché de imports vacía). Se compara el
+# primer rerun de 2_Calificacion_y_Caso.py con un plan completo (construye plan y
+# PDF) sin precalentar y tras `core.warmup.warm_up()`, además del rerun estable.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+T0 = time.perf_counter()
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CASE_PAGE = os.path.join(ROOT, "pages", "2_Calificacion_y_Caso.py")
+
+
+def child(warm: bool, reruns: int) -> dict:
+    import logging
+
+    from streamlit.testing.v1 import AppTest
+
+    from core.plan import QUESTION_KEYS
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    out = {"import_ms": (time.perf_counter() - T0) * 1000}
+
+    if warm:
+        from core.warmup import warm_up
+        t0 = time.perf_counter()
+        warm_up()
+        out["warmup_ms"] = (time.perf_counter() - t0) * 1000
+
+    # Caso completo en la bitácora del lead 1 (se retoma al abrir la página)
+    from core.journal import get_journal
+    journal = get_journal()
+    case = journal.load(1)
+    if not case.complete:
+        for k in QUESTION_KEYS:
+            journal.record(case, "turno", key=k, text=f"Respuesta {k}: ahorro 20%, USD 50,000, marzo, Ventas.")
+
+    at = AppTest.from_file(CASE_PAGE, default_timeout=60)
+    at.session_state["lead_score"] = 100
+    at.session_state["active_lead_idx"] = 1
+    t0 = time.perf_counter()
+    at.run()
+    out["primer_rerun_ms"] = (time.perf_counter() - t0) * 1000
+    if at.exception or not at.session_state["pdf_bytes"]:
+        raise RuntimeError("la página no generó el PDF")
+
+    xs = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        xs.append((time.perf_counter() - t0) * 1000)
+    out["rerun_p50_ms"] = sorted(xs)[len(xs) // 2]
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--reruns", type=int, default=20)
+    ap.add_argument("--child", choices=("frio", "caliente"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child == "caliente", args.reruns)))
+        return
+
+    tmp = tempfile.TemporaryDirectory()
+    env = {**os.environ, "BABEL_DATA_DIR": tmp.name, "PYTHONPATH": ROOT}
+    cols = ("import_ms", "warmup_ms", "primer_rerun_ms", "rerun_p50_ms")
+    print(f"{'modo':<10}" + "".join(f"{c:>17}" for c in cols))
+    for mode in ("frio", "caliente"):
+        runs = []
+        for _ in range(args.repeat):
+            res = subprocess.run([sys.executable, __file__, "--child", mode, "--reruns", str(args.reruns)],
+                                 env=env, capture_output=True, text=True, check=True)
+            runs.append(json.loads(res.stdout.strip().splitlines()[-1]))
+        med = {c: sorted(r.get(c, 0.0) for r in runs)[len(runs) // 2] for c in cols}
+        print(f"{mode:<10}" + "".join(f"{med[c]:>17.1f}" for c in cols))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# bench/bench_state.py — Costo de persistir el estado de sesión por rerun (deltas vs. completo)
+#
+#   python bench/bench_state.py [--sessions 200] [--turns 60] [--idle 2]
+#
+# Simula sesiones de chat del caso; cada turno va seguido de `--idle` reruns sin
+# cambios (cambio de pestaña, refresco…). Tras cada rerun se sincroniza con el backend
+# (SQLite y un doble local de Redis en memoria con la API de redis-py). Compara
+# escribir solo las claves cambiadas con reescribir todas, y mide la restauración.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.plan import QUESTION_KEYS, next_unanswered  # noqa: E402
+from core.state import (PERSISTED_KEYS, RedisStateBackend, SQLiteStateBackend,  # noqa: E402
+                        dumps, persist, restore)
+
+
+class LocalRedis:
+    """Doble en memoria del subconjunto de redis-py que usa RedisStateBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def hgetall(self, name):
+        return {k.encode(): v for k, v in self.data.get(name, {}).items()}
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+
+class _Pipe:
+    def __init__(self, r):
+        self.r, self.ops = r, []
+
+    def hset(self, name, mapping):
+        self.ops.append(lambda: self.r.data.setdefault(name, {}).update(mapping))
+
+    def hdel(self, name, *keys):
+        self.ops.append(lambda: [self.r.data.get(name, {}).pop(k, None) for k in keys])
+
+    def expire(self, name, ttl):
+        self.ops.append(lambda: None)
+
+    def execute(self):
+        for op in self.ops:
+            op()
+        self.ops = []
+
+
+def _sync(backend, st: dict, sid: str, full: bool) -> int:
+    if full:
+        blobs = {k: dumps(st[k]) for k in PERSISTED_KEYS if k in st}
+        backend.save(sid, blobs)
+    else:
+        blobs, _ = persist(st, backend, sid)
+    return sum(map(len, blobs.values()))
+
+
+def simulate(backend, sessions: int, turns: int, idle: int, full: bool) -> tuple:
+    written, t_sync = 0, 0.0
+    for s in range(sessions):
+        sid = f"{s:032x}"
+        # Las respuestas y el chat van a la bitácora del lead (core/journal.py); aquí, lo derivado
+        st = {"active_lead_idx": s + 1, "lead_score": 90, "lead": {"empresa": f"Empresa {s}", "correo": f"c{s}@x.com"}}
+        answers, cur = dict.fromkeys(QUESTION_KEYS, ""), QUESTION_KEYS[0]
+        for t in range(turns):
+            cur = cur or QUESTION_KEYS[t % len(QUESTION_KEYS)]
+            text = f"Respuesta {t} de la sesión {s}: ahorro del 20%, USD 40,000, integración CRM."
+            answers[cur] = (answers[cur] + " " + text).strip()
+            cur = next_unanswered(answers)
+            st["plan_md"] = "# Plan\n" + "\n".join(f"{k}: {v}" for k, v in answers.items())
+            st["ready_for_pdf"] = cur is None
+            for _ in range(1 + idle):
+                t0 = time.perf_counter()
+                written += _sync(backend, st, sid, full)
+                t_sync += time.perf_counter() - t0
+    n = sessions * turns * (1 + idle)
+    return t_sync / n * 1e6, written / n
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=200)
+    ap.add_argument("--turns", type=int, default=60)
+    ap.add_argument("--idle", type=int, default=2)
+    args = ap.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    backends = {
+        "sqlite": lambda: SQLiteStateBackend(os.path.join(tmp.name, f"state_{time.time_ns()}.db")),
+        "redis (doble)": lambda: RedisStateBackend(client=LocalRedis()),
+    }
+    print(f"{args.sessions} sesiones × {args.turns} turnos (+{args.idle} reruns sin cambios por turno)")
+    print(f"{'backend':<15}{'modo':<10}{'µs/rerun':>10}{'bytes/rerun':>13}{'restaurar µs':>14}")
+    for name, make in backends.items():
+        for full in (True, False):
+            backend = make()
+            us, nbytes = simulate(backend, args.sessions, args.turns, args.idle, full)
+            t0 = time.perf_counter()
+            for s in range(args.sessions):
+                restore({}, backend, f"{s:032x}")
+            rest = (time.perf_counter() - t0) / args.sessions * 1e6
+            print(f"{name:<15}{'completo' if full else 'deltas':<10}{us:>10.0f}{nbytes:>13.0f}{rest:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# bench/bench_suggest.py — Sugerencias de respuesta con decenas de miles de casos completos
+#
+#   python bench/bench_suggest.py [--cases 30000] [--queries 2000]
+#
+# Genera casos completos sintéticos (vocabulario por industria, con respuestas
+# repetidas entre casos como pasa en la realidad), los agrega uno por uno con
+# `add_case` y mide: alta por caso, abrir el índice en un proceso nuevo (con
+# snapshot vs. reconstruyendo desde la tabla) y latencia p50/p99 de `suggest`
+# para una pregunta al azar con el contexto de un caso a medio llenar.
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.plan import QUESTION_KEYS  # noqa: E402
+from core.suggest import AnswerSuggester, case_context  # noqa: E402
+
+INDUSTRIAS = {
+    "pagos": "app móvil pagos QR wallet conciliación tarjetas comercios fraude",
+    "retail": "e-commerce catálogo inventario tiendas omnicanal promociones lealtad",
+    "salud": "expediente clínico citas pacientes telemedicina farmacia laboratorio",
+    "logística": "rastreo flotillas rutas almacén entregas última milla GPS",
+    "banca": "onboarding KYC crédito originación core bancario cumplimiento",
+    "educación": "LMS alumnos cursos evaluaciones inscripciones campus",
+    "seguros": "pólizas siniestros cotizador agentes renovaciones ajustadores",
+}
+COMUNES = "integración CRM ERP reportes dashboard usuarios roles SLA soporte nube seguridad API móvil web".split()
+
+
+def make_case(rnd: random.Random) -> tuple:
+    ind = rnd.choice(list(INDUSTRIAS))
+    vocab = INDUSTRIAS[ind].split()
+    answers = {}
+    for k in QUESTION_KEYS:
+        if rnd.random() < 0.3:   # respuestas "de plantilla" que se repiten
+            answers[k] = f"{k} estándar para {ind}: {' '.join(vocab[:3])}"
+        else:
+            words = rnd.sample(vocab, 3) + rnd.sample(COMUNES, 3)
+            answers[k] = f"{k.capitalize()} con {', '.join(words)}; presupuesto USD {rnd.randint(10, 500)},000"
+    return ind, answers
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=30000)
+    ap.add_argument("--queries", type=int, default=2000)
+    args = ap.parse_args()
+
+    rnd = random.Random(11)
+    cases = [make_case(rnd) for _ in range(args.cases)]
+    tmp = tempfile.TemporaryDirectory()
+    path = os.path.join(tmp.name, "sugerencias.db")
+
+    sug = AnswerSuggester(path)
+    t0 = time.perf_counter()
+    for i, (_, answers) in enumerate(cases):
+        sug.add_case(answers, i + 1)
+    t_add = time.perf_counter() - t0
+    docs = sum(len(f) for f in sug.fields.values())
+    print(f"Alta: {len(sug):,} casos en {t_add:.1f}s ({t_add / len(cases) * 1e3:.2f} ms/caso) · "
+          f"{docs:,} respuestas únicas indexadas")
+
+    sug.snapshot()
+    t0 = time.perf_counter()
+    AnswerSuggester(path)
+    print(f"Abrir en un proceso nuevo con snapshot del índice: {time.perf_counter() - t0:.2f}s")
+    os.remove(path + ".idx")
+    t0 = time.perf_counter()
+    AnswerSuggester(path, snapshot_every=10 ** 12)
+    print(f"Abrir reconstruyendo desde la tabla: {time.perf_counter() - t0:.1f}s")
+
+    xs = []
+    for _ in range(args.queries):
+        _, answers = make_case(rnd)
+        cut = rnd.randrange(1, len(QUESTION_KEYS))
+        key = QUESTION_KEYS[cut]
+        ctx = case_context({k: answers[k] for k in QUESTION_KEYS[:cut]}, {"descripcion": "Plataforma web"}, skip=key)
+        t0 = time.perf_counter()
+        sug.suggest(key, ctx)
+        xs.append((time.perf_counter() - t0) * 1000)
+    xs.sort()
+    print(f"suggest(): p50 {xs[len(xs) // 2]:.2f} ms · p99 {xs[int(len(xs) * 0.99)]:.2f} ms "
+          f"({args.queries} consultas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# core — lógica compartida del Agente Comercial Babel (sin dependencias de UI)
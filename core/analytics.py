@@ -0,0 +1,310 @@
+# core/analytics.py — Analítica de calificación sobre un almacén columnar append-only
+#
+# Cada calificación es un evento (ts, lead_id, score, respuestas) que se agrega
+# al final de un archivo binario por columna en data/analitica/. Los agregados
+# por día (histograma de score y conteo de criterios que bloquean, contando cada
+# lead una vez con su última calificación) se mantienen de forma incremental: cada refresco pliega solo las filas nuevas, y un
+# snapshot (agregados.npz) guarda los agregados y hasta qué fila cubren, así un
+# proceso nuevo tampoco relee toda la historia. Semanas y meses se derivan de
+# los días al consultar: el costo del tablero depende del número de días, no de
+# eventos.
+#
+# respuestas: máscara de bits, bit j = criterio j de CRITERIA respondido "Sí".
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from core.config import data_path
+from core.scoring import CRITERIA_KEYS, THRESHOLD, answers_matrix, score_matrix
+
+try:  # bloqueo entre procesos al agregar; sin fcntl basta el lock del proceso
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+COLUMNS = (("ts", "<i8"), ("lead_id", "<i8"), ("score", "u1"), ("respuestas", "u1"))
+DAY = 86400
+BINS = 101                  # scores 0..100
+SNAPSHOT_EVERY = 50000      # filas plegadas entre snapshots
+FOLD_CHUNK = 1 << 20        # filas leídas por bloque al ponerse al día
+PERIODS = ("dia", "semana", "mes")
+
+_BITS = (1 << np.arange(len(CRITERIA_KEYS))).astype(np.uint8)
+
+
+def answers_bits(X: np.ndarray) -> np.ndarray:
+    """Matriz booleana n×5 de respuestas → máscara uint8 por fila."""
+    return (X.astype(np.uint8) * _BITS).sum(axis=1).astype(np.uint8)
+
+
+class ScoreLog:
+    """Eventos de calificación en un archivo por columna (append-only, varios procesos)."""
+
+    def __init__(self, path=None):
+        self.dir = Path(path or data_path("analitica", "ts.bin").parent)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._locked():
+            self._repair()
+
+    def _file(self, col: str) -> Path:
+        return self.dir / f"{col}.bin"
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.dir / ".lock", "a") as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _sizes(self) -> list:
+        return [(self._file(c).stat().st_size if self._file(c).exists() else 0) // np.dtype(t).itemsize
+                for c, t in COLUMNS]
+
+    def _repair(self):
+        """Recorta las columnas a la fila completa más corta (escritura interrumpida)."""
+        n = min(self._sizes())
+        for c, t in COLUMNS:
+            size = n * np.dtype(t).itemsize
+            p = self._file(c)
+            if not p.exists():
+                p.touch()
+            elif p.stat().st_size != size:
+                os.truncate(p, size)
+
+    def __len__(self) -> int:
+        return min(self._sizes())
+
+    def append(self, ts, lead_id, score, respuestas) -> int:
+        """Agrega filas (arrays de igual largo) al final de cada columna; devuelve cuántas."""
+        cols = dict(zip((c for c, _ in COLUMNS), (ts, lead_id, score, respuestas)))
+        arrs = {c: np.ascontiguousarray(cols[c], dtype=t).reshape(-1) for c, t in COLUMNS}
+        n = len(arrs["ts"])
+        if not n:
+            return 0
+        with self._locked():
+            for c, _ in COLUMNS:
+                with open(self._file(c), "ab") as fh:
+                    fh.write(arrs[c].tobytes())
+        return n
+
+    def read(self, start: int, stop: int) -> dict:
+        """Columnas de las filas [start, stop)."""
+        out = {}
+        for c, t in COLUMNS:
+            dt = np.dtype(t)
+            out[c] = np.fromfile(self._file(c), dtype=dt, count=stop - start, offset=start * dt.itemsize)
+        return out
+
+
+class Aggregates:
+    """Agregados por día (UTC) que cubren las filas [0, rows) del registro.
+
+    Cada lead cuenta una vez, con su última calificación y en el día de esa
+    calificación: al llegar otra del mismo lead se retira la anterior del
+    histograma y de los bloqueos. Para eso se guarda, por lead_id (ids densos del
+    store de leads), el día, score y respuestas de su última calificación.
+    `evals` cuenta todas las calificaciones (re-calificaciones incluidas). Los
+    eventos sin lead (lead_id 0) no se pueden deduplicar y cuentan cada uno.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.days = np.zeros(0, dtype=np.int64)
+        self.evals = np.zeros(0, dtype=np.int64)
+        self.hist = np.zeros((0, BINS), dtype=np.int64)
+        self.blocks = np.zeros((0, len(CRITERIA_KEYS)), dtype=np.int64)
+        self.last_day = np.full(0, -1, dtype=np.int64)      # -1: lead sin calificar
+        self.last_score = np.zeros(0, dtype=np.uint8)
+        self.last_bits = np.zeros(0, dtype=np.uint8)
+
+    def _ensure_days(self, d: np.ndarray):
+        days = np.union1d(self.days, d)
+        if len(days) == len(self.days):
+            return
+        pos = np.searchsorted(days, self.days)
+        evals = np.zeros(len(days), dtype=np.int64)
+        hist = np.zeros((len(days), BINS), dtype=np.int64)
+        blocks = np.zeros((len(days), len(CRITERIA_KEYS)), dtype=np.int64)
+        evals[pos], hist[pos], blocks[pos] = self.evals, self.hist, self.blocks
+        self.days, self.evals, self.hist, self.blocks = days, evals, hist, blocks
+
+    def _ensure_leads(self, max_id: int):
+        n = len(self.last_day)
+        if max_id < n:
+            return
+        size = max(max_id + 1, 2 * n)
+        self.last_day = np.concatenate([self.last_day, np.full(size - n, -1, dtype=np.int64)])
+        self.last_score = np.concatenate([self.last_score, np.zeros(size - n, dtype=np.uint8)])
+        self.last_bits = np.concatenate([self.last_bits, np.zeros(size - n, dtype=np.uint8)])
+
+    def _add(self, day: np.ndarray, score: np.ndarray, bits: np.ndarray, sign: int):
+        nd = len(self.days)
+        r = np.searchsorted(self.days, day)
+        score = np.minimum(score, BINS - 1).astype(np.int64)
+        self.hist += sign * np.bincount(r * BINS + score, minlength=nd * BINS).reshape(nd, BINS)
+        # Bloquea: criterio en "No" en un lead que no alcanzó el umbral
+        low = score < THRESHOLD
+        r_low, bits_low = r[low], bits[low]
+        for j, bit in enumerate(_BITS):
+            self.blocks[:, j] += sign * np.bincount(r_low[(bits_low & bit) == 0], minlength=nd)
+
+    def fold(self, cols: dict):
+        """Suma al agregado un bloque de eventos (vectorizado)."""
+        n = len(cols["ts"])
+        if not n:
+            return
+        d = cols["ts"] // DAY
+        self._ensure_days(d)
+        self.evals += np.bincount(np.searchsorted(self.days, d), minlength=len(self.days))
+        lid = cols["lead_id"]
+        anon = np.flatnonzero(lid <= 0)
+        # Última calificación de cada lead dentro del bloque
+        named = np.flatnonzero(lid > 0)[::-1]
+        leads, first = np.unique(lid[named], return_index=True)
+        last = named[first]
+        # Retirar la calificación anterior de los leads que ya estaban contados
+        if len(leads):
+            self._ensure_leads(int(leads[-1]))
+            prev = self.last_day[leads]
+            had = prev >= 0
+            if had.any():
+                self._add(prev[had], self.last_score[leads[had]], self.last_bits[leads[had]], -1)
+            self.last_day[leads] = d[last]
+            self.last_score[leads] = cols["score"][last]
+            self.last_bits[leads] = cols["respuestas"][last]
+        keep = np.concatenate([anon, last])
+        self._add(d[keep], cols["score"][keep], cols["respuestas"][keep], +1)
+        self.rows += n
+
+    _ARRAYS = ("days", "evals", "hist", "blocks", "last_day", "last_score", "last_bits")
+
+    def save(self, path: Path):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as fh:
+            np.savez(fh, rows=np.int64(self.rows), **{k: getattr(self, k) for k in self._ARRAYS})
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path):
+        agg = cls()
+        try:
+            with np.load(path) as z:
+                if z["hist"].shape[1:] != (BINS,) or z["blocks"].shape[1:] != (len(CRITERIA_KEYS),):
+                    return agg
+                arrays = {k: z[k] for k in cls._ARRAYS}
+                agg.rows = int(z["rows"])
+        except (OSError, ValueError, KeyError):  # sin snapshot o de un formato anterior: recalcular
+            return agg
+        for k, v in arrays.items():
+            setattr(agg, k, v)
+        return agg
+
+
+def _period_keys(days: np.ndarray, period: str) -> np.ndarray:
+    """Primer día (epoch) del periodo de cada día: semanas de lunes, meses de calendario."""
+    if period == "dia":
+        return days
+    if period == "semana":
+        return days - (days + 3) % 7          # 1970-01-01 fue jueves
+    if period == "mes":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    raise ValueError(f"periodo no soportado: {period}")
+
+
+class ScoreAnalytics:
+    """Registro de eventos + agregados incrementales compartidos por el proceso."""
+
+    def __init__(self, path=None, snapshot_every: int = SNAPSHOT_EVERY):
+        self.log = ScoreLog(path)
+        self.snapshot_path = self.log.dir / "agregados.npz"
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self.agg = Aggregates.load(self.snapshot_path)
+        if self.agg.rows > len(self.log):   # snapshot de otro almacén: reconstruir
+            self.agg = Aggregates()
+        self._snap_rows = self.agg.rows
+
+    # ---- escritura ----
+    def record(self, answers: dict, lead_id=None, ts=None) -> int:
+        """Registra una calificación individual; devuelve su score."""
+        X = answers_matrix({k: [answers.get(k) or ""] for k in CRITERIA_KEYS}, 1)
+        score = score_matrix(X)
+        self.log.append([int(ts if ts is not None else time.time())], [int(lead_id or 0)],
+                        score, answers_bits(X))
+        return int(score[0])
+
+    def record_many(self, X: np.ndarray, lead_ids=None, ts=None) -> int:
+        """Registra un lote ya convertido a matriz booleana n×5 (p. ej. de `answers_matrix`)."""
+        n = len(X)
+        ts = np.full(n, int(time.time()), dtype=np.int64) if ts is None else ts
+        lead_ids = np.zeros(n, dtype=np.int64) if lead_ids is None else lead_ids
+        return self.log.append(ts, lead_ids, score_matrix(X), answers_bits(X))
+
+    # ---- agregados ----
+    def refresh(self) -> int:
+        """Pliega las filas agregadas desde el último refresco (de cualquier proceso); devuelve cuántas."""
+        with self._lock:
+            n = len(self.log)
+            start = self.agg.rows
+            for a in range(start, n, FOLD_CHUNK):
+                self.agg.fold(self.log.read(a, min(a + FOLD_CHUNK, n)))
+            if self.agg.rows - self._snap_rows >= self.snapshot_every:
+                self.agg.save(self.snapshot_path)
+                self._snap_rows = self.agg.rows
+            return n - start
+
+    def summary(self, period: str = "semana", desde=None, hasta=None) -> dict:
+        """Totales y serie por periodo entre los días `desde`..`hasta` (date o None).
+
+        Las cifras por lead usan la última calificación de cada lead y lo ubican en
+        el periodo de esa calificación; `evaluaciones` cuenta todas.
+        """
+        self.refresh()
+        with self._lock:
+            days, evals, hist, blocks = self.agg.days, self.agg.evals, self.agg.hist, self.agg.blocks
+            sel = np.ones(len(days), dtype=bool)
+            if desde is not None:
+                sel &= days >= np.datetime64(desde, "D").astype(np.int64)
+            if hasta is not None:
+                sel &= days <= np.datetime64(hasta, "D").astype(np.int64)
+            days, evals, hist, blocks = days[sel], evals[sel], hist[sel], blocks[sel]
+        keys, inv = np.unique(_period_keys(days, period), return_inverse=True)
+        p_evals = np.bincount(inv, weights=evals, minlength=len(keys)).astype(np.int64)
+        p_hist = np.zeros((len(keys), BINS), dtype=np.int64)
+        p_blocks = np.zeros((len(keys), len(CRITERIA_KEYS)), dtype=np.int64)
+        np.add.at(p_hist, inv, hist)
+        np.add.at(p_blocks, inv, blocks)
+        values = np.arange(BINS)
+        leads = p_hist.sum(axis=1)
+        return {
+            "periodos": keys.astype("datetime64[D]"),
+            "leads": leads,
+            "evaluaciones": p_evals,
+            "calificados": p_hist[:, THRESHOLD:].sum(axis=1),
+            "score_medio": np.divide(p_hist @ values, leads, out=np.zeros(len(keys)), where=leads > 0),
+            "bloqueos": p_blocks,             # periodos × criterios
+            "histograma": p_hist.sum(axis=0),  # leads por score 0..100
+            "total": int(leads.sum()),
+            "total_evaluaciones": int(p_evals.sum()),
+            "primer_dia": days[0].astype("datetime64[D]") if len(days) else None,
+            "ultimo_dia": days[-1].astype("datetime64[D]") if len(days) else None,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_analytics() -> ScoreAnalytics:
+    """Almacén de analítica compartido por el proceso."""
+    return ScoreAnalytics()
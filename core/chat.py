@@ -0,0 +1,106 @@
+# core/chat.py — Historial del chat del caso en forma compacta y paginada
+#
+# Los mensajes recientes se guardan tal cual; las páginas antiguas completas se
+# congelan comprimidas (zlib). La vista solo pinta la ventana más reciente y una
+# página antigua a petición, así el coste por turno no depende del largo del chat.
+
+import json
+import struct
+import zlib
+from functools import lru_cache
+
+PAGE_SIZE = 20       # mensajes por página congelada / página del historial
+CHAT_WINDOW = 20     # mensajes recientes que se pintan en cada rerun
+
+
+@lru_cache(maxsize=32)
+def _thaw(blob: bytes) -> tuple:
+    return tuple(tuple(m) for m in json.loads(zlib.decompress(blob)))
+
+
+class ChatHistory:
+    """Secuencia de (rol, contenido) con la misma interfaz básica que una lista."""
+
+    __slots__ = ("_frozen", "_tail")
+
+    def __init__(self, msgs=()):
+        self._frozen = []   # páginas antiguas: bytes zlib de PAGE_SIZE mensajes cada una
+        self._tail = []     # mensajes recientes sin comprimir
+        for m in msgs:
+            self.append(m)
+
+    def append(self, msg):
+        role, content = msg
+        self._tail.append((role, content))
+        # Conservar al menos una página sin comprimir para la ventana visible
+        if len(self._tail) >= 2 * PAGE_SIZE:
+            page, self._tail = self._tail[:PAGE_SIZE], self._tail[PAGE_SIZE:]
+            self._frozen.append(zlib.compress(json.dumps(page, ensure_ascii=False).encode("utf-8"), 6))
+
+    def __len__(self):
+        return len(self._frozen) * PAGE_SIZE + len(self._tail)
+
+    def __bool__(self):
+        return bool(self._tail or self._frozen)
+
+    def __iter__(self):
+        for blob in self._frozen:
+            yield from _thaw(blob)
+        yield from self._tail
+
+    def __getitem__(self, idx):
+        n = len(self)
+        if isinstance(idx, int):
+            if idx < 0:
+                idx += n
+            if not 0 <= idx < n:
+                raise IndexError(idx)
+            return self._slice(idx, idx + 1)[0]
+        r = range(*idx.indices(n))
+        if not r:
+            return []
+        if r.step == 1:
+            return self._slice(r.start, r.stop)
+        # Paso ≠ 1 (incluido negativo): descomprimir el tramo que cubre el rango y tomar de ahí
+        lo, hi = min(r[0], r[-1]), max(r[0], r[-1]) + 1
+        block = self._slice(lo, hi)
+        return [block[i - lo] for i in r]
+
+    def _slice(self, start: int, stop: int) -> list:
+        """Mensajes [start, stop) descomprimiendo solo las páginas congeladas necesarias."""
+        out = []
+        frozen_n = len(self._frozen) * PAGE_SIZE
+        for p in range(start // PAGE_SIZE, min(len(self._frozen), -(-stop // PAGE_SIZE))):
+            base = p * PAGE_SIZE
+            out.extend(_thaw(self._frozen[p])[max(0, start - base):stop - base])
+        if stop > frozen_n:
+            out.extend(self._tail[max(0, start - frozen_n):stop - frozen_n])
+        return out
+
+    def tail(self, n: int = CHAT_WINDOW) -> list:
+        return self[max(0, len(self) - n):]
+
+    def nbytes(self) -> int:
+        """Tamaño aproximado del historial en memoria (texto + páginas comprimidas)."""
+        return sum(len(b) for b in self._frozen) + sum(len(c.encode("utf-8")) for _, c in self._tail)
+
+    def to_list(self) -> list:
+        return [list(m) for m in self]
+
+    # ---- Serialización compacta: las páginas congeladas se copian tal cual ----
+    def to_bytes(self) -> bytes:
+        head = json.dumps({"pages": [len(b) for b in self._frozen], "tail": self._tail},
+                          ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return struct.pack(">I", len(head)) + head + b"".join(self._frozen)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ChatHistory":
+        (n,) = struct.unpack_from(">I", data)
+        head = json.loads(data[4:4 + n])
+        h = cls()
+        pos = 4 + n
+        for size in head["pages"]:
+            h._frozen.append(bytes(data[pos:pos + size]))
+            pos += size
+        h._tail = [tuple(m) for m in head["tail"]]
+        return h
@@ -0,0 +1,15 @@
+# core/config.py — Rutas compartidas
+
+import os
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Datos persistentes locales (SQLite, índices, cachés). Se puede mover con BABEL_DATA_DIR.
+DATA_DIR = Path(os.environ.get("BABEL_DATA_DIR", ROOT_DIR / "data"))
+
+
+def data_path(*parts) -> Path:
+    p = DATA_DIR.joinpath(*parts)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    return p
@@ -0,0 +1,224 @@
+# core/crawler.py — Inteligencia competitiva: descarga y comparación de páginas
+#
+# Sesión `requests` con pool de conexiones, hilos acotados, límite de ritmo por
+# host y caché HTTP en disco que respeta ETag / Last-Modified (peticiones
+# condicionales: un 304 reutiliza el cuerpo guardado).
+#
+# Las URLs las escribe el usuario y el servidor las descarga: solo http/https,
+# nada que resuelva a una dirección privada, de loopback, link-local, reservada o
+# multicast (también en cada redirección), y el cuerpo se lee en streaming hasta
+# MAX_BYTES.
+
+import hashlib
+import ipaddress
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urljoin, urlsplit
+
+from core.config import data_path
+from core.signals import scan_signals
+
+USER_AGENT = "BabelAgenteComercial/2025.10 (+inteligencia competitiva)"
+MAX_TEXT_CHARS = 20_000
+MAX_BYTES = 2 * 1024 * 1024     # cuerpo máximo por página (ya descomprimido)
+MAX_REDIRECTS = 5
+CHUNK_BYTES = 64 * 1024
+
+# Señales que se resumen en la tabla comparativa
+COMPARE_SIGNALS = (("criteria", "Criterios de valor"), ("kpis", "KPIs / resultados"),
+                   ("award", "Licitaciones"), ("risk", "Seguridad / cumplimiento"))
+
+
+class HostRateLimiter:
+    """Intervalo mínimo entre peticiones al mismo host (compartido por todos los hilos)."""
+
+    def __init__(self, min_interval: float = 0.2):
+        self.min_interval = min_interval
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, 0.0))
+            self._next[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class DiskCache:
+    """Caché HTTP en disco: un JSON por URL con validadores y el texto extraído."""
+
+    def __init__(self, directory=None):
+        self.dir = str(directory or data_path("http_cache", ".keep").parent)
+        os.makedirs(self.dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str):
+        try:
+            with open(self._path(url), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, entry: dict):
+        path = self._path(url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def check_url(url: str, allow_private: bool = False):
+    """ValueError si `url` no es http/https o su host resuelve a una dirección no pública."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"URL no permitida (solo http/https): {url}")
+    if allow_private:
+        return
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        infos = socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)
+    except socket.gaierror as e:
+        raise ValueError(f"no se pudo resolver {parts.hostname}: {e}") from e
+    for *_, addr in infos:
+        ip = ipaddress.ip_address(addr[0].split("%")[0])   # sin zona (fe80::1%eth0)
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"dirección no pública no permitida: {parts.hostname} ({ip})")
+
+
+def read_limited(resp, limit: int = MAX_BYTES) -> str:
+    """Texto de una respuesta `stream=True`, cortando en cuanto pasa de `limit` bytes."""
+    size = resp.headers.get("Content-Length", "")
+    if size.isdigit() and int(size) > limit:
+        raise ValueError(f"respuesta demasiado grande ({int(size)} bytes; máximo {limit})")
+    chunks, n = [], 0
+    for chunk in resp.iter_content(CHUNK_BYTES):
+        n += len(chunk)
+        if n > limit:
+            raise ValueError(f"respuesta demasiado grande (más de {limit} bytes)")
+        chunks.append(chunk)
+    return b"".join(chunks).decode(resp.encoding or "utf-8", errors="replace")
+
+
+def extract_text(html: str) -> tuple:
+    """(título, texto visible) de una página HTML."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "svg", "nav", "footer", "header"]):
+        tag.decompose()
+    title = (soup.title.get_text(strip=True) if soup.title else "")
+    text = " ".join(soup.get_text(" ").split())
+    return title, text[:MAX_TEXT_CHARS]
+
+
+class Crawler:
+    def __init__(self, max_workers: int = 8, per_host_interval: float = 0.2,
+                 timeout: float = 10.0, max_age: float = 3600.0, cache: DiskCache = None, session=None,
+                 max_bytes: int = MAX_BYTES, allow_private: bool = False):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_age = max_age  # segundos en que una copia en caché se sirve sin revalidar
+        self.max_bytes = max_bytes
+        self.allow_private = allow_private  # solo pruebas/benchmarks contra un servidor local
+        self.cache = cache or DiskCache()
+        self.limiter = HostRateLimiter(per_host_interval)
+        self.stats = {"fetched": 0, "fresh": 0, "not_modified": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+        self.session = session
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, url: str) -> dict:
+        """Descarga `url` (condicional si está en caché) y devuelve {url, title, text, cached, error}."""
+        cached = self.cache.get(url)
+        if cached and time.time() - cached.get("fetched_at", 0) < self.max_age:
+            self._count("fresh")
+            return {"url": url, "title": cached["title"], "text": cached["text"], "cached": True, "error": None}
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        try:
+            target = url
+            for _ in range(MAX_REDIRECTS + 1):
+                # Redirecciones a mano: cada salto pasa por la misma validación
+                check_url(target, self.allow_private)
+                self.limiter.wait(urlsplit(target).netloc)
+                resp = self.session.get(target, headers=headers, timeout=self.timeout,
+                                        stream=True, allow_redirects=False)
+                if not resp.is_redirect:
+                    break
+                resp.close()
+                target = urljoin(target, resp.headers["Location"])
+            else:
+                raise ValueError(f"demasiadas redirecciones (más de {MAX_REDIRECTS})")
+            with resp:
+                if resp.status_code == 304 and cached:
+                    self._count("not_modified")
+                    self.cache.put(url, {**cached, "fetched_at": time.time()})
+                    return {"url": url, "title": cached["title"], "text": cached["text"], "cached": True, "error": None}
+                resp.raise_for_status()
+                html = read_limited(resp, self.max_bytes)
+        except Exception as e:
+            self._count("errors")
+            if cached:  # sin red: servir la última versión conocida
+                return {"url": url, "title": cached["title"], "text": cached["text"], "cached": True, "error": str(e)}
+            return {"url": url, "title": "", "text": "", "cached": False, "error": str(e)}
+
+        self._count("fetched")
+        title, text = extract_text(html)
+        self.cache.put(url, {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+                             "title": title, "text": text, "fetched_at": time.time()})
+        return {"url": url, "title": title, "text": text, "cached": False, "error": None}
+
+    def crawl(self, urls) -> list:
+        """Descarga en paralelo (hilos acotados) conservando el orden de `urls`."""
+        urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(self.fetch, urls))
+
+
+def comparison_section(pages: list, own_host: str = "babel") -> str:
+    """Sección markdown 'Comparación competitiva' a partir de las páginas descargadas."""
+    ok = [p for p in pages if p["text"]]
+    if not ok:
+        return ""
+    head = "| Sitio | " + " | ".join(label for _, label in COMPARE_SIGNALS) + " |"
+    sep = "|---" * (len(COMPARE_SIGNALS) + 1) + "|"
+    rows = []
+    for p in ok:
+        parts = urlsplit(p["url"])
+        host = parts.netloc or p["url"]
+        site = (host + parts.path.rstrip("/"))[:60]
+        name = f"**{site}** (Babel)" if own_host and own_host in host.lower() else site
+        sigs = scan_signals(p["text"])
+        rows.append(f"| {name} | " + " | ".join("✔" if s in sigs else "—" for s, _ in COMPARE_SIGNALS) + " |")
+    return "\n".join(["## 7. Comparación competitiva", "", head, sep, *rows, "", "---", ""])
+
+
+@lru_cache(maxsize=None)
+def get_crawler() -> Crawler:
+    """Crawler compartido por el proceso (un solo pool de conexiones y caché)."""
+    return Crawler()
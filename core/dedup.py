@@ -0,0 +1,310 @@
+# core/dedup.py — Detección de leads casi duplicados (MinHash + LSH)
+#
+# Cada lead se reduce a un conjunto de rasgos normalizados y de ahí a una firma
+# MinHash de NUM_PERM enteros, calculada por lotes con NumPy. Los rasgos son
+# específicos a propósito (trigramas de la empresa sin sufijos legales ni palabras
+# genéricas, nombre completo, correo, dominio corporativo, descripción como un
+# solo rasgo): rasgos muy comunes harían que miles de leads compartieran banda.
+# Las firmas se indexan por bandas (LSH): un lead nuevo solo se compara con los
+# que comparten alguna banda, así que el costo por alta no crece con el tamaño
+# del store. El mismo correo con otro nombre de contacto se resuelve aparte, con
+# un índice exacto por correo normalizado.
+#
+# Al importar solo se fusiona con el mismo contacto: mismo correo, o mismo nombre
+# con similitud (Jaccard estimada) ≥ MERGE_AT. Cualquier otro parecido ≥ FLAG_AT
+# (p. ej. otra persona de la misma empresa) se marca para revisión, nunca se fusiona.
+#
+#   python -m core.dedup leads.csv        # importa con deduplicación y resume
+
+import argparse
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from core.text import fold
+
+NUM_PERM = 64
+BANDS = 16                  # 16 bandas × 4 filas → umbral LSH ≈ (1/16)^(1/4) ≈ 0.5
+FLAG_AT = 0.5
+MERGE_AT = 0.8
+
+_PRIME = np.uint64(4294967291)          # primo < 2^32: las firmas caben en uint32
+_rng = np.random.default_rng(20251)
+_A = _rng.integers(1, 2 ** 31, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 31, NUM_PERM, dtype=np.uint64)
+
+_word_rx = re.compile(r"[a-z0-9]+")          # lo que no es ASCII no entra en los rasgos
+# Sufijos legales y palabras genéricas que no distinguen a una empresa
+_GENERIC = frozenset("sa de cv sab sapi rl s a c v inc llc ltd limited sl slu sas srl spa corp corporation co "
+                     "company cia grupo group the corporativo corporacion industrias servicios soluciones "
+                     "tecnologias tecnologia comercial comercializadora internacional mexico del la el los y".split())
+# Dominios de correo personal: no dicen nada de la empresa
+_FREE_MAIL = frozenset("gmail.com hotmail.com outlook.com live.com yahoo.com yahoo.com.mx icloud.com "
+                       "protonmail.com proton.me msn.com prodigy.net.mx".split())
+
+
+def _grams(prefix: str, s: str, n: int = 3):
+    if len(s) <= n:
+        return [prefix + s] if s else []
+    return [prefix + s[i:i + n] for i in range(len(s) - n + 1)]
+
+
+def features(lead: dict) -> set:
+    """Rasgos normalizados del lead (conjunto sobre el que se estima Jaccard)."""
+    empresa = "".join(w for w in _word_rx.findall(fold(lead.get("empresa"))) if w not in _GENERIC)
+    nombre = " ".join(_word_rx.findall(fold(lead.get("nombre"))))
+    correo = fold(lead.get("correo")).strip()
+    desc = " ".join(_word_rx.findall(fold(lead.get("descripcion"))))
+    feats = set(_grams("e:", empresa))
+    if nombre:
+        feats.add("n:" + nombre)
+    if correo:
+        dominio = correo.partition("@")[2]
+        feats.add("@:" + correo)
+        if dominio and dominio not in _FREE_MAIL:
+            feats.add("d:" + dominio)
+    if desc:
+        feats.add("w:" + desc)
+    return feats
+
+
+def email_key(lead: dict) -> str:
+    return fold(lead.get("correo")).strip()
+
+
+def name_key(lead: dict) -> str:
+    return " ".join(_word_rx.findall(fold(lead.get("nombre"))))
+
+
+def signatures(leads, chunk_rows: int = 4096) -> tuple:
+    """Firmas MinHash (n × NUM_PERM, uint32) y máscara de leads con algún rasgo."""
+    leads = list(leads)
+    sig = np.full((len(leads), NUM_PERM), np.iinfo(np.uint32).max, dtype=np.uint32)
+    feats = [features(l) for l in leads]
+    ok = np.fromiter((bool(f) for f in feats), dtype=bool, count=len(feats))
+    for start in range(0, len(leads), chunk_rows):
+        rows = [i for i in range(start, min(start + chunk_rows, len(leads))) if feats[i]]
+        if not rows:
+            continue
+        sizes = np.fromiter((len(feats[i]) for i in rows), dtype=np.intp, count=len(rows))
+        h = np.fromiter((zlib.crc32(f.encode("utf-8")) for i in rows for f in feats[i]),
+                        dtype=np.uint64, count=int(sizes.sum()))
+        perm = (h[:, None] * _A + _B) % _PRIME                       # (rasgos, NUM_PERM)
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        sig[rows] = np.minimum.reduceat(perm, offsets, axis=0).astype(np.uint32)
+    return sig, ok
+
+
+def band_keys(sigs) -> list:
+    """Una clave entera de 64 bits por banda y firma: (n, NUM_PERM) → n listas de BANDS enteros."""
+    sigs = np.ascontiguousarray(sigs, dtype=np.uint32)
+    v = sigs.reshape(len(sigs), BANDS, -1).astype(np.uint64)
+    keys = np.zeros(v.shape[:2], dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for r in range(v.shape[2]):
+            keys = keys * np.uint64(0x100000001B3) ^ v[:, :, r]
+    return keys.tolist()
+
+
+class LeadDedup:
+    """Índice LSH en memoria de las firmas de los leads del store.
+
+    Cada firma ocupa un slot (fila de una matriz NumPy); los buckets guardan
+    slots, así que dar de baja o renombrar un lead no toca los buckets.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = [dict() for _ in range(BANDS)]   # banda -> {clave: [slots]}
+        self._mat = np.empty((1024, NUM_PERM), dtype=np.uint32)
+        self._ids = []                                   # slot -> lead id (None si dado de baja)
+        self._slot = {}                                  # lead id -> slot
+        self._emails = {}                                # correo normalizado -> [slots]
+        self._names = []                                 # slot -> nombre de contacto normalizado
+        self.max_id = 0                                  # último id del store ya recorrido por sync()
+
+    def __len__(self):
+        return len(self._slot)
+
+    def _remove(self, lead_id):
+        slot = self._slot.pop(lead_id, None)
+        if slot is not None:
+            self._ids[slot] = None
+
+    def remove_many(self, ids) -> None:
+        with self._lock:
+            for lead_id in ids:
+                self._remove(int(lead_id))
+
+    def same_contact(self, lead_id, email: str = "", name: str = "") -> bool:
+        """¿El lead indexado tiene este correo o este nombre de contacto (normalizados)?"""
+        with self._lock:
+            slot = self._slot.get(lead_id)
+            if slot is None:
+                return False
+            return bool(email and slot in self._emails.get(email, ())) or bool(name and self._names[slot] == name)
+
+    def add_many(self, ids, sigs, ok=None, emails=None, keys=None, names=None) -> None:
+        if keys is None:
+            keys = band_keys(sigs) if len(ids) else []
+        with self._lock:
+            need = len(self._ids) + len(ids)
+            if need > len(self._mat):
+                mat = np.empty((max(need, 2 * len(self._mat)), NUM_PERM), dtype=np.uint32)
+                mat[:len(self._ids)] = self._mat[:len(self._ids)]
+                self._mat = mat
+            for j, lead_id in enumerate(ids):
+                lead_id = int(lead_id)
+                self._remove(lead_id)
+                slot = len(self._ids)
+                self._ids.append(lead_id)
+                self._names.append(names[j] if names else "")
+                self._slot[lead_id] = slot
+                if emails and emails[j]:
+                    self._emails.setdefault(emails[j], []).append(slot)
+                if ok is not None and not ok[j]:
+                    continue
+                self._mat[slot] = sigs[j]
+                for bucket, key in zip(self._buckets, keys[j]):
+                    bucket.setdefault(key, []).append(slot)
+
+    def add(self, lead_id: int, lead: dict) -> None:
+        sig, ok = signatures([lead])
+        self.add_many([lead_id], sig, ok, [email_key(lead)], names=[name_key(lead)])
+
+    def query_sig(self, sig, threshold: float = FLAG_AT, exclude=None, email: str = "", keys=None) -> list:
+        """[(id, similitud)] con Jaccard estimada ≥ threshold (1.0 si comparten correo)."""
+        ids = self._ids
+        with self._lock:
+            same = {ids[s] for s in self._emails.get(email, ())} if email else set()
+            slots = set()
+            if sig is not None:
+                for bucket, key in zip(self._buckets, keys or band_keys(sig[None])[0]):
+                    slots.update(bucket.get(key, ()))
+            slots = [s for s in slots if ids[s] is not None and ids[s] not in same]
+            sims = (self._mat[slots] == sig).mean(axis=1).tolist() if slots else []
+            cand = [(ids[s], sim) for s, sim in zip(slots, sims) if sim >= threshold]
+        same.discard(None)
+        same.discard(exclude)
+        out = [(i, 1.0) for i in same] + [(i, s) for i, s in cand if i != exclude]
+        return sorted(out, key=lambda x: -x[1])
+
+    def query(self, lead: dict, threshold: float = FLAG_AT, exclude=None) -> list:
+        sig, ok = signatures([lead])
+        return self.query_sig(sig[0] if ok[0] else None, threshold, exclude, email_key(lead))
+
+    def sync(self, store, batch: int = 10000) -> int:
+        """Indexa los leads del store con id mayor al último visto (altas de otros procesos)."""
+        n = 0
+        for rows in store.iter_rows(after_id=self.max_id, batch=batch):
+            last = rows[-1]["id"]
+            with self._lock:   # los que este proceso ya indexó con add/add_many no se recalculan
+                rows = [r for r in rows if r["id"] not in self._slot]
+            if not rows:
+                self.max_id = max(self.max_id, last)
+                continue
+            sigs, ok = signatures(rows)
+            self.add_many([r["id"] for r in rows], sigs, ok, [email_key(r) for r in rows],
+                          names=[name_key(r) for r in rows])
+            self.max_id = max(self.max_id, last)
+            n += len(rows)
+        return n
+
+
+def import_leads(store, dedup: LeadDedup, rows) -> dict:
+    """Importa leads fusionando los del mismo contacto y marcando los demás parecidos (≥ FLAG_AT).
+
+    Fusionar = completar los campos vacíos del lead existente. También se detectan
+    duplicados dentro del mismo lote, en un índice local con ids provisionales; las
+    filas nuevas entran al índice compartido solo cuando el store ya les dio id.
+    """
+    rows = [r for r in rows if any(str(r.get(k) or "").strip() for k in ("empresa", "nombre", "correo"))]
+    dedup.sync(store)
+    sigs, ok = signatures(rows)
+    keys = band_keys(sigs)
+    emails = [email_key(r) for r in rows]
+    names = [name_key(r) for r in rows]
+    lote = LeadDedup()
+    fusionados, marcados, pending = [], [], []
+    for j in range(len(rows)):
+        sig = sigs[j] if ok[j] else None
+        hits = sorted([(i, s, index) for index in (dedup, lote)
+                       for i, s in index.query_sig(sig, FLAG_AT, email=emails[j], keys=keys[j])],
+                      key=lambda h: -h[1])
+        target = next((i for i, s, index in hits
+                       if s >= MERGE_AT and index.same_contact(i, emails[j], names[j])), None)
+        if target is not None:
+            fusionados.append((j, target))
+            continue
+        if hits:
+            marcados.append((j, hits[0][0], hits[0][1]))
+        # Id provisional (negativo) hasta insertar el lote; solo existe en el índice local
+        lote.add_many([-(len(pending) + 1)], sigs[j:j + 1], ok[j:j + 1], emails[j:j + 1], keys[j:j + 1],
+                      names[j:j + 1])
+        pending.append(j)
+
+    ids = store.upsert_many([rows[j] for j in pending])
+    dedup.add_many(ids, sigs[pending], ok[pending], [emails[j] for j in pending], [keys[j] for j in pending],
+                   [names[j] for j in pending])
+    dedup.sync(store)   # avanza max_id sin saltarse altas de otras sesiones intercaladas
+    real = {-(k + 1): i for k, i in enumerate(ids)}
+
+    n_fus = 0
+    for j, target in fusionados:
+        target = real.get(target, target)
+        try:
+            n_fus += store.fill_missing(target, rows[j])
+        except sqlite3.IntegrityError:
+            marcados.append((j, target, 1.0))
+    return {
+        "filas": len(rows),
+        "nuevos": len(set(ids)),
+        "fusionados": len(fusionados),
+        "campos_completados": n_fus,
+        "marcados": [{"fila": j, "lead_id": real.get(t, t), "similitud": round(s, 2)} for j, t, s in marcados],
+    }
+
+
+def import_bytes(data: bytes, filename: str, store=None, dedup=None) -> dict:
+    """Importa un archivo subido (CSV/JSONL) con deduplicación; ver `import_leads`."""
+    from core.leads import get_store
+    from core.scoring import read_leads_bytes
+
+    rows = read_leads_bytes(data, filename)   # ValueError si el archivo no se puede leer
+    return import_leads(store or get_store(), dedup or get_dedup(), rows)
+
+
+@lru_cache(maxsize=None)
+def get_dedup() -> LeadDedup:
+    """Índice compartido por el proceso, construido a partir del store de leads."""
+    from core.leads import get_store
+    dedup = LeadDedup()
+    dedup.sync(get_store())
+    return dedup
+
+
+def main(argv=None):
+    from core.leads import get_store
+    from core.scoring import is_jsonl, read_leads
+
+    ap = argparse.ArgumentParser(description="Importa leads (CSV/JSONL) con detección de casi duplicados")
+    ap.add_argument("src")
+    args = ap.parse_args(argv)
+    with open(args.src, encoding="utf-8-sig", newline="") as fh:
+        rows = read_leads(fh, is_jsonl(args.src))
+    t0 = time.perf_counter()
+    res = import_leads(get_store(), get_dedup(), rows)
+    dt = time.perf_counter() - t0
+    print(f"{res['filas']} filas en {dt:.1f}s · {res['nuevos']} nuevos · {res['fusionados']} fusionados · "
+          f"{len(res['marcados'])} marcados como posibles duplicados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# core/export.py — Exportación masiva de planes (PDF y PPTX) sin interfaz
+#
+#   python -m core.export casos.jsonl -o salida/ [--format pdf pptx] [--workers N]
+#
+# Cada línea del JSONL es un dict de `case_answers` (opcionalmente con "id" o
+# "archivo" para nombrar la salida). Los casos se reparten en un
+# ProcessPoolExecutor; cada worker carga fuentes, estilos y logo una sola vez y
+# escribe directamente a disco, de modo que la memoria no depende del total.
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from io import BytesIO
+
+from core.markdown import parse_markdown
+from core.pdf import logo_bytes, plan_styles, render_plan_pdf
+from core.plan import build_plan
+
+FORMATS = ("pdf", "pptx")
+
+_slug_rx = re.compile(r"[^\w.-]+", re.U)
+
+
+def _slug(text: str) -> str:
+    return _slug_rx.sub("_", text.strip())[:80].strip("_") or "plan"
+
+
+def output_stem(case: dict, n: int) -> str:
+    name = case.get("archivo") or case.get("id") or case.get("nombre") or "plan"
+    return f"{n:06d}_{_slug(str(name))}"
+
+
+# ------------------------------ PPTX ------------------------------
+def render_plan_pptx(plan_md: str) -> bytes:
+    """Presentación del plan: portada + una diapositiva por sección (##)."""
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Inches(13.333), Inches(7.5)
+    ast = parse_markdown(plan_md or "")
+
+    title = next((b[2] for b in ast if b[0] == "heading" and b[1] == 1), "Plan de Negocio")
+    cover = prs.slides.add_slide(prs.slide_layouts[0])
+    cover.shapes.title.text = _plain(title)
+    cover.placeholders[1].text = "Plan de Negocio – Babel"
+    logo = logo_bytes()
+    if logo:
+        cover.shapes.add_picture(BytesIO(logo), Inches(0.4), Inches(0.3), height=Inches(0.9))
+
+    slide, body = None, None
+    for block in ast:
+        kind = block[0]
+        if kind == "heading" and block[1] in (2, 3):
+            slide = prs.slides.add_slide(prs.slide_layouts[1])
+            slide.shapes.title.text = _plain(block[2])
+            body = slide.placeholders[1].text_frame
+            body.clear()
+            first = True
+            continue
+        if body is None or kind == "rule":
+            continue
+        lines = []
+        if kind == "para":
+            lines = [block[1]]
+        elif kind == "list":
+            lines = list(block[2])
+        elif kind == "table":
+            lines = [" · ".join(r) for r in ((block[1],) if block[1] else ()) + block[2]]
+        for line in lines:
+            p = body.paragraphs[0] if first else body.add_paragraph()
+            first = False
+            _add_runs(p, line)
+            for r in p.runs:
+                r.font.size = Pt(16)
+    out = BytesIO()
+    prs.save(out)
+    return out.getvalue()
+
+
+_bold_split_rx = re.compile(r"(\*\*.+?\*\*)")
+
+
+def _plain(text: str) -> str:
+    return text.replace("**", "").replace("__", "")
+
+
+def _add_runs(paragraph, text: str):
+    for part in _bold_split_rx.split(" ".join(text.split())):
+        if not part:
+            continue
+        run = paragraph.add_run()
+        bold = part.startswith("**") and part.endswith("**")
+        run.text = part[2:-2] if bold else part
+        run.font.bold = bold
+
+
+# ------------------------------ Workers ------------------------------
+def _init_worker():
+    # Recursos pesados cargados una vez por proceso y reutilizados en cada documento
+    plan_styles()
+    logo_bytes()
+
+
+def _export_one(job) -> tuple:
+    n, case, out_dir, formats = job
+    md, _ = build_plan(case)
+    stem = output_stem(case, n)
+    written = 0
+    for fmt in formats:
+        data = render_plan_pdf(md) if fmt == "pdf" else render_plan_pptx(md)
+        path = os.path.join(out_dir, f"{stem}.{fmt}")
+        with open(path, "wb") as fh:
+            fh.write(data)
+        written += len(data)
+    return n, written
+
+
+def iter_cases(path):
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def export_cases(cases, out_dir, formats=("pdf",), workers=None, window: int = 64):
+    """Exporta en paralelo; genera (n, bytes escritos) a medida que terminan.
+
+    Como mucho `window` casos están en vuelo a la vez, así la memoria queda acotada
+    aunque el JSONL tenga miles de líneas.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = ((n, case, out_dir, tuple(formats)) for n, case in enumerate(cases, 1))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = set()
+        for job in jobs:
+            pending.add(pool.submit(_export_one, job))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        for fut in as_completed(pending):
+            yield fut.result()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Exporta planes de negocio (PDF/PPTX) desde un JSONL de case_answers.")
+    ap.add_argument("entrada", help="JSONL: un dict de case_answers por línea")
+    ap.add_argument("-o", "--salida", default="planes", help="directorio de salida (por defecto ./planes)")
+    ap.add_argument("--format", nargs="+", choices=FORMATS, default=["pdf"], dest="formats")
+    ap.add_argument("--workers", type=int, default=os.cpu_count(), help="procesos (por defecto: núcleos)")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    n_docs = total = 0
+    for _, written in export_cases(iter_cases(args.entrada), args.salida, args.formats, args.workers):
+        n_docs += len(args.formats)
+        total += written
+    dt = time.perf_counter() - t0
+    rate = n_docs / dt if dt else 0.0
+    print(f"{n_docs} documentos ({total / 1e6:.1f} MB) en {dt:.1f}s → {rate:.1f} docs/s "
+          f"({rate / args.workers:.1f} docs/s por núcleo, {args.workers} workers) → {args.salida}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# core/journal.py — Bitácora de casos por lead (event sourcing con snapshots)
+#
+# Cada turno del chat se agrega a una bitácora append-only por lead (SQLite WAL).
+# El estado del caso (respuestas, pregunta actual, chat) es el pliegue de esos
+# eventos. Cada SNAPSHOT_EVERY eventos se guarda un snapshot del estado, así
+# retomar un caso carga el último snapshot y reproduce solo la cola: el tiempo no
+# crece con el largo del caso y solo el caso activo vive en memoria.
+#
+# Eventos: turno {key, text} · rfp {campos, paginas} · reinicio {}
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+from core.chat import ChatHistory
+from core.config import data_path
+from core.plan import QUESTION_KEYS, next_unanswered, question_for
+
+SNAPSHOT_EVERY = 50
+NO_LEAD = 0          # casos sin lead activo (históricos; la página ya exige un lead)
+
+INTRO = "Usaremos el **cuestionario oficial**. A medida que respondas, iré armando el **Plan de Negocio** a la derecha."
+DONE = "✅ **Plan completo.** Revisa la vista previa a la derecha."
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS eventos (
+    lead_id INTEGER NOT NULL,
+    seq     INTEGER NOT NULL,
+    tipo    TEXT NOT NULL,
+    datos   TEXT NOT NULL,
+    ts      TEXT NOT NULL,
+    PRIMARY KEY (lead_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    lead_id     INTEGER PRIMARY KEY,
+    seq         INTEGER NOT NULL,
+    answers     TEXT NOT NULL,
+    current_key TEXT,
+    chat        BLOB NOT NULL,
+    ts          TEXT NOT NULL
+);
+"""
+
+
+class Case:
+    """Estado derivado del caso de un lead hasta el evento `seq`."""
+
+    __slots__ = ("lead_id", "seq", "snap_seq", "answers", "current_key", "chat")
+
+    def __init__(self, lead_id: int):
+        self.lead_id = lead_id
+        self.seq = 0
+        self.snap_seq = 0
+        self._reset()
+
+    def _reset(self):
+        self.answers = dict.fromkeys(QUESTION_KEYS, "")
+        self.current_key = QUESTION_KEYS[0]
+        self.chat = ChatHistory([("assistant", INTRO), ("assistant", question_for(self.current_key))])
+
+    @property
+    def complete(self) -> bool:
+        return self.current_key is None
+
+
+def apply(case: Case, tipo: str, datos: dict) -> None:
+    """Pliega un evento sobre el caso (misma lógica al registrar y al reproducir)."""
+    if tipo == "turno":
+        cur, text = datos["key"], datos["text"]
+        case.chat.append(("user", text))
+        if cur is not None:
+            case.answers[cur] = (case.answers.get(cur, "") + " " + text).strip()
+        case.current_key = next_unanswered(case.answers)
+        case.chat.append(("assistant", f"Anotado. **Siguiente:** {question_for(case.current_key)}"
+                          if case.current_key else DONE))
+    elif tipo == "rfp":
+        campos = datos["campos"]
+        case.answers.update(campos)
+        case.chat.append(("assistant", f"📄 Leí **{datos['paginas']} páginas** del RFP y pre-llené: "
+                                       f"**{', '.join(campos)}**. Revísalos en el plan."))
+        # Si la pregunta actual quedó respondida, avanzar
+        if case.current_key in campos:
+            case.current_key = next_unanswered(case.answers)
+            case.chat.append(("assistant", f"**Siguiente:** {question_for(case.current_key)}"
+                              if case.current_key else DONE))
+    elif tipo == "reinicio":
+        case._reset()
+    else:
+        raise ValueError(f"evento desconocido: {tipo}")
+
+
+class CaseJournal:
+    def __init__(self, path=None, snapshot_every: int = SNAPSHOT_EVERY):
+        self.path = str(path or data_path("casos.db"))
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def load(self, lead_id: int) -> Case:
+        """Último snapshot del lead + reproducción de los eventos posteriores."""
+        case = Case(int(lead_id or NO_LEAD))
+        with self._lock:
+            snap = self._conn.execute("SELECT seq, answers, current_key, chat FROM snapshots WHERE lead_id = ?",
+                                      (case.lead_id,)).fetchone()
+        if snap:
+            case.seq = case.snap_seq = snap[0]
+            case.answers = json.loads(snap[1])
+            case.current_key = snap[2]
+            case.chat = ChatHistory.from_bytes(snap[3])
+        self._catch_up(case)
+        return case
+
+    def _catch_up(self, case: Case) -> None:
+        with self._lock:
+            rows = self._conn.execute("SELECT seq, tipo, datos FROM eventos WHERE lead_id = ? AND seq > ? ORDER BY seq",
+                                      (case.lead_id, case.seq)).fetchall()
+        for seq, tipo, datos in rows:
+            apply(case, tipo, json.loads(datos))
+            case.seq = seq
+
+    def record(self, case: Case, tipo: str, **datos) -> None:
+        """Agrega el evento a la bitácora y lo aplica al caso (snapshot cada `snapshot_every`)."""
+        payload = json.dumps(datos, ensure_ascii=False, separators=(",", ":"))
+        now = datetime.now().isoformat(timespec="seconds")
+        while True:
+            try:
+                with self._lock, self._conn:
+                    self._conn.execute("INSERT INTO eventos (lead_id, seq, tipo, datos, ts) VALUES (?, ?, ?, ?, ?)",
+                                       (case.lead_id, case.seq + 1, tipo, payload, now))
+                break
+            except sqlite3.IntegrityError:
+                # Otra sesión/proceso escribió en el mismo caso: ponerse al día y reintentar
+                self._catch_up(case)
+        apply(case, tipo, datos)
+        case.seq += 1
+        if case.seq - case.snap_seq >= self.snapshot_every:
+            self.snapshot(case)
+
+    def snapshot(self, case: Case) -> None:
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO snapshots (lead_id, seq, answers, current_key, chat, ts) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(lead_id) DO UPDATE SET seq=excluded.seq, answers=excluded.answers, "
+                "current_key=excluded.current_key, chat=excluded.chat, ts=excluded.ts WHERE excluded.seq > snapshots.seq",
+                (case.lead_id, case.seq, json.dumps(case.answers, ensure_ascii=False), case.current_key,
+                 case.chat.to_bytes(), now))
+        case.snap_seq = case.seq
+
+    def history(self, lead_id: int) -> dict:
+        """Resumen del caso del lead: número de eventos y fecha del último."""
+        with self._lock:
+            n, last = self._conn.execute("SELECT COUNT(*), MAX(ts) FROM eventos WHERE lead_id = ?",
+                                         (int(lead_id or NO_LEAD),)).fetchone()
+        return {"eventos": n, "ultimo": last}
+
+    def lead_ids(self) -> list:
+        """Leads con al menos un evento en la bitácora."""
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT DISTINCT lead_id FROM eventos ORDER BY lead_id")]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=None)
+def get_journal(path=None) -> CaseJournal:
+    """Bitácora compartida por el proceso."""
+    return CaseJournal(path)
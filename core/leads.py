@@ -0,0 +1,175 @@
+# core/leads.py — Almacén persistente de leads (SQLite en modo WAL)
+#
+# Un lead se identifica por (empresa, correo) normalizados: guardar de nuevo el
+# mismo lead lo actualiza en lugar de duplicarlo. El store es compartido por todas
+# las sesiones del proceso; WAL permite lecturas concurrentes entre procesos.
+
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+from core.config import data_path
+
+LEAD_FIELDS = ("empresa", "nombre", "correo", "telefono", "descripcion")
+PAGE_SIZE = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id           INTEGER PRIMARY KEY,
+    empresa      TEXT NOT NULL DEFAULT '',
+    nombre       TEXT NOT NULL DEFAULT '',
+    correo       TEXT NOT NULL DEFAULT '',
+    telefono     TEXT NOT NULL DEFAULT '',
+    descripcion  TEXT NOT NULL DEFAULT '',
+    empresa_norm TEXT NOT NULL,
+    correo_norm  TEXT NOT NULL,
+    creado       TEXT NOT NULL,
+    actualizado  TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS leads_empresa_correo ON leads(empresa_norm, correo_norm);
+CREATE INDEX IF NOT EXISTS leads_correo ON leads(correo_norm);
+"""
+
+
+def _text(v) -> str:
+    # Valores de CSV/JSONL: None → "", números → texto ("telefono": 5512345678)
+    return "" if v is None else str(v).strip()
+
+
+def normalize(v: str) -> str:
+    return " ".join((v or "").split()).casefold()
+
+
+def _prefix_range(prefix: str):
+    # empresa_norm >= p AND empresa_norm < p + U+10FFFF aprovecha el índice (LIKE no)
+    return prefix, prefix + "\U0010ffff"
+
+
+class LeadStore:
+    def __init__(self, path=None):
+        self.path = str(path or data_path("leads.db"))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    _UPSERT_SQL = """
+        INSERT INTO leads (empresa, nombre, correo, telefono, descripcion,
+                           empresa_norm, correo_norm, creado, actualizado)
+        VALUES (:empresa, :nombre, :correo, :telefono, :descripcion, :en, :cn, :now, :now)
+        ON CONFLICT(empresa_norm, correo_norm) DO UPDATE SET
+            empresa=excluded.empresa, nombre=excluded.nombre, correo=excluded.correo,
+            telefono=excluded.telefono, descripcion=excluded.descripcion,
+            actualizado=excluded.actualizado
+        RETURNING id"""
+
+    @staticmethod
+    def _params(lead: dict, now: str) -> dict:
+        vals = {f: _text(lead.get(f)) for f in LEAD_FIELDS}
+        return {**vals, "en": normalize(vals["empresa"]), "cn": normalize(vals["correo"]), "now": now}
+
+    def upsert(self, lead: dict) -> int:
+        """Inserta o actualiza (por empresa+correo) y devuelve el id del lead."""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            row = self._conn.execute(self._UPSERT_SQL, self._params(lead, now)).fetchone()
+        return int(row[0])
+
+    def upsert_many(self, leads) -> list:
+        """Upsert de un lote completo en una sola transacción (importaciones de CRM)."""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            return [int(self._conn.execute(self._UPSERT_SQL, self._params(l, now)).fetchone()[0])
+                    for l in leads]
+
+    def get(self, lead_id):
+        if lead_id is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM leads WHERE id = ?", (int(lead_id),)).fetchone()
+        return dict(row) if row else None
+
+    def fill_missing(self, lead_id: int, lead: dict) -> int:
+        """Completa los campos vacíos de un lead existente (fusión de duplicados); devuelve cuántos."""
+        current = self.get(lead_id)
+        if not current:
+            return 0
+        fill = {f: _text(lead.get(f)) for f in LEAD_FIELDS
+                if not _text(current.get(f)) and _text(lead.get(f))}
+        if not fill:
+            return 0
+        merged = {**current, **fill}
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"""UPDATE leads SET {', '.join(f'{f} = :{f}' for f in fill)},
+                    empresa_norm = :en, correo_norm = :cn, actualizado = :now WHERE id = :id""",
+                {**fill, "en": normalize(merged["empresa"]), "cn": normalize(merged["correo"]),
+                 "now": now, "id": int(lead_id)})
+        return len(fill)
+
+    def iter_rows(self, after_id: int = 0, batch: int = 10000):
+        """Lotes de leads completos (con id) en orden de id, a partir de `after_id`."""
+        last = int(after_id)
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, {', '.join(LEAD_FIELDS)} FROM leads WHERE id > ? ORDER BY id LIMIT ?",
+                    (last, int(batch))).fetchall()
+            if not rows:
+                return
+            yield [dict(r) for r in rows]
+            last = rows[-1]["id"]
+
+    def count(self, prefix: str = "") -> int:
+        sql, params = self._where(prefix)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM leads {sql}", params).fetchone()[0]
+
+    def search(self, prefix: str = "", limit: int = PAGE_SIZE, offset: int = 0) -> list:
+        """Página de leads cuyo empresa o correo empieza por `prefix`, ordenados por empresa."""
+        sql, params = self._where(prefix)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT id, empresa, nombre, correo FROM leads {sql}
+                    ORDER BY empresa_norm, correo_norm LIMIT ? OFFSET ?""",
+                (*params, int(limit), int(offset)),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def position(self, lead_id, prefix: str = ""):
+        """Posición (desde 0) del lead en el listado de `search(prefix)`; None si no aparece en él."""
+        sql, params = self._where(prefix)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT empresa_norm, correo_norm FROM leads WHERE id = ? {sql.replace('WHERE', 'AND', 1)}",
+                (int(lead_id), *params)).fetchone()
+            if row is None:
+                return None
+            key = (row["empresa_norm"], row["correo_norm"])
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM leads {sql or 'WHERE 1'} AND (empresa_norm, correo_norm) < (?, ?)",
+                (*params, *key)).fetchone()[0]
+
+    @staticmethod
+    def _where(prefix: str):
+        p = normalize(prefix)
+        if not p:
+            return "", ()
+        lo, hi = _prefix_range(p)
+        return ("WHERE ((empresa_norm >= ? AND empresa_norm < ?) OR (correo_norm >= ? AND correo_norm < ?))",
+                (lo, hi, lo, hi))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=None)
+def get_store(path=None) -> LeadStore:
+    """Store compartido por el proceso (una conexión por archivo)."""
+    return LeadStore(path)
@@ -0,0 +1,83 @@
+# core/markdown.py — Parser de Markdown (subconjunto de build_plan) a un AST cacheado
+#
+# Bloques soportados: encabezados (#..######), párrafos, reglas (---), listas
+# (-, *, 1.) y tablas (| a | b |). El texto en línea se guarda tal cual; cada
+# renderer (PDF, PPTX...) decide cómo pintar **negrita** y *cursiva*.
+
+import re
+
+from core.memo import text_cache
+
+_heading_rx = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_rule_rx    = re.compile(r"^(?:-{3,}|\*{3,}|_{3,})\s*$")
+_ul_rx      = re.compile(r"^[-*+]\s+(.*)$")
+_ol_rx      = re.compile(r"^\d+[.)]\s+(.*)$")
+_table_sep_rx = re.compile(r"^\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$")
+
+
+def _cells(line: str) -> tuple:
+    return tuple(c.strip() for c in line.strip().strip("|").split("|"))
+
+
+@text_cache(max_bytes=16 * 1024 * 1024, max_entries=256)   # acotada por bytes (ver core/memo.py)
+def parse_markdown(md: str) -> tuple:
+    """Devuelve el AST como tupla (inmutable, cacheable) de bloques:
+
+    ("heading", nivel, texto) · ("para", texto) · ("rule",) ·
+    ("list", ordenada, (items...)) · ("table", (cabecera...), ((celdas...), ...))
+    """
+    blocks = []
+    para, items, ordered, table = [], [], False, []
+
+    def flush():
+        nonlocal para, items, table
+        if para:
+            blocks.append(("para", "\n".join(para)))
+            para = []
+        if items:
+            blocks.append(("list", ordered, tuple(items)))
+            items = []
+        if table:
+            rows = [_cells(l) for l in table if not _table_sep_rx.match(l)]
+            if len(table) > 1 and _table_sep_rx.match(table[1]):
+                blocks.append(("table", rows[0], tuple(rows[1:])))
+            else:
+                blocks.append(("table", (), tuple(rows)))
+            table = []
+
+    for raw in (md or "").split("\n"):
+        line = raw.rstrip()
+        s = line.strip()
+        if not s:
+            flush()
+            continue
+        if s.startswith("|"):
+            if not table:
+                flush()
+            table.append(s)
+            continue
+        if table:
+            flush()
+        m = _heading_rx.match(s)
+        if m:
+            flush()
+            blocks.append(("heading", len(m.group(1)), m.group(2)))
+            continue
+        if _rule_rx.match(s):
+            flush()
+            blocks.append(("rule",))
+            continue
+        m = _ul_rx.match(s) or _ol_rx.match(s)
+        if m and not para:
+            is_ol = m.re is _ol_rx
+            if items and is_ol != ordered:
+                flush()
+            ordered = is_ol
+            items.append(m.group(1))
+            continue
+        if items:
+            flush()
+        # Dos espacios al final = salto de línea forzado (como en st.markdown)
+        para.append(s + ("  " if raw.endswith("  ") else ""))
+    flush()
+    return tuple(blocks)
@@ -0,0 +1,76 @@
+# core/memo.py — Caché LRU para funciones de texto, acotada por bytes
+#
+# `lru_cache` sobre textos largos acota entradas, no memoria: cada turno del chat
+# agrega al texto de la respuesta, así que cada rerun deja una clave nueva y más
+# larga (un RFP pegado de varias páginas son cientos de KB por entrada, en una
+# caché compartida por todas las sesiones). Aquí la clave es un digest de los
+# argumentos (la caché no retiene los textos) y el total de los valores guardados
+# no pasa de `max_bytes`; un valor más grande que max_bytes / 8 no se guarda.
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+ENTRY_OVERHEAD = 120        # bytes aproximados por entrada (digest, tupla, nodo del dict)
+
+
+def _approx_size(value, raw_len: int) -> int:
+    # Textos: su largo; otros resultados (p. ej. un AST del texto): proporcional a la entrada
+    return len(value) if isinstance(value, str) else raw_len
+
+
+def text_cache(max_bytes: int = 4 * 1024 * 1024, max_entries: int = 4096, sizeof=None):
+    """Decorador: memoiza `fn(*textos)` por digest de los textos (None cuenta como "").
+
+    `sizeof(valor)` estima los bytes de un resultado si no es texto ni crece con la entrada.
+    """
+
+    def deco(fn):
+        items = OrderedDict()       # digest -> (valor, tamaño)
+        lock = threading.Lock()
+        info = {"hits": 0, "misses": 0, "bytes": 0}
+
+        @wraps(fn)
+        def wrapper(*args):
+            h, n = hashlib.blake2b(digest_size=16), 0
+            for a in args:
+                raw = ("" if a is None else a).encode("utf-8", "surrogatepass")
+                h.update(len(raw).to_bytes(8, "little"))
+                h.update(raw)
+                n += len(raw)
+            key = h.digest()
+            with lock:
+                hit = items.get(key)
+                if hit is not None:
+                    items.move_to_end(key)
+                    info["hits"] += 1
+                    return hit[0]
+                info["misses"] += 1
+            value = fn(*args)
+            size = (sizeof(value) if sizeof else _approx_size(value, n)) + ENTRY_OVERHEAD
+            if size > max_bytes // 8:
+                return value
+            with lock:
+                if key not in items:
+                    items[key] = (value, size)
+                    info["bytes"] += size
+                    while info["bytes"] > max_bytes or len(items) > max_entries:
+                        _, (_, s) = items.popitem(last=False)
+                        info["bytes"] -= s
+            return value
+
+        def cache_info() -> dict:
+            with lock:
+                return {**info, "entries": len(items), "max_bytes": max_bytes, "max_entries": max_entries}
+
+        def cache_clear():
+            with lock:
+                items.clear()
+                info.update(hits=0, misses=0, bytes=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return deco
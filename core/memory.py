@@ -0,0 +1,207 @@
+# core/memory.py — Memoria semántica de proyectos (FAISS + embeddings locales)
+#
+# Los proyectos previos se guardan en SQLite (metadatos) y sus embeddings en un
+# índice FAISS persistido en disco. El proveedor de embeddings es enchufable; el
+# de por defecto (hashing) es determinista y funciona sin red.
+#
+# SQLite manda: antes de buscar, agregar o persistir, cada proceso indexa los
+# proyectos con id mayor al último que vio (altas de otros procesos). Un archivo
+# de índice atrasado solo cuesta ponerse al día al abrirlo.
+
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from core.config import data_path
+from core.text import strip_marks
+
+PROJECT_FIELDS = ("nombre", "cliente", "descripcion", "resultado")
+
+_token_rx = re.compile(r"\w+", re.U)
+
+
+def _fold(text: str) -> str:
+    # minúsculas (lower, no casefold) y sin acentos: los vectores ya guardados en el
+    # índice se calcularon así, cambiarlo obligaría a re-embeber toda la memoria
+    return strip_marks((text or "").lower())
+
+
+class HashingEmbedder:
+    """Embeddings por hashing de unigramas y bigramas (TF sublineal, L2 normalizado).
+
+    Determinista entre procesos (crc32, no `hash()`), sin vocabulario ni red.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str):
+        toks = _token_rx.findall(_fold(text))
+        return toks + [a + " " + b for a, b in zip(toks, toks[1:])]
+
+    def embed(self, texts) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            feats = self._features(text)
+            if not feats:
+                continue
+            h = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in feats), dtype=np.uint32, count=len(feats))
+            idx = (h % self.dim).astype(np.intp)
+            sign = np.where(h & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(out[i], idx, sign)
+        # TF sublineal conservando el signo, luego norma L2 (producto interno = coseno)
+        np.copyto(out, np.sign(out) * np.log1p(np.abs(out)))
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+# Registro de proveedores locales; BABEL_EMBEDDER elige cuál usar
+EMBEDDERS = {"hashing": HashingEmbedder}
+
+
+def get_embedder(name: str = None, **kwargs):
+    name = name or os.environ.get("BABEL_EMBEDDER", "hashing")
+    try:
+        return EMBEDDERS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Proveedor de embeddings desconocido: {name!r} (disponibles: {', '.join(EMBEDDERS)})")
+
+
+def project_text(p: dict) -> str:
+    return " \n".join((p.get(f) or "") for f in PROJECT_FIELDS)
+
+
+def _memory_dir(directory=None) -> str:
+    return str(directory or data_path("memoria", "proyectos.db").parent)
+
+
+def count_projects(directory=None) -> int:
+    """Número de proyectos guardados, leído de SQLite sin abrir FAISS (p. ej. para la home)."""
+    path = os.path.join(_memory_dir(directory), "proyectos.db")
+    if not os.path.exists(path):
+        return 0
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM proyectos").fetchone()[0]
+    except sqlite3.OperationalError:  # base creada sin tabla todavía
+        return 0
+    finally:
+        conn.close()
+
+
+class ProjectMemory:
+    """Proyectos previos con búsqueda top-k por similitud (coseno) en FAISS."""
+
+    def __init__(self, directory=None, embedder=None):
+        import faiss  # pesado: solo se importa al abrir la memoria
+
+        self._faiss = faiss
+        self.embedder = embedder or get_embedder()
+        base = _memory_dir(directory)
+        os.makedirs(base, exist_ok=True)
+        self.index_path = os.path.join(base, f"proyectos_{self.embedder.name}_{self.embedder.dim}.faiss")
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(base, "proyectos.db"), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS proyectos (
+                       id INTEGER PRIMARY KEY, nombre TEXT, cliente TEXT,
+                       descripcion TEXT, resultado TEXT, creado TEXT)""")
+        self._dirty = False
+        self.max_id = 0
+        self.index = self._load_index()
+        self.sync()
+
+    def _load_index(self):
+        faiss = self._faiss
+        if os.path.exists(self.index_path):
+            index = faiss.read_index(self.index_path)
+            ids = faiss.vector_to_array(index.id_map) if index.ntotal else np.zeros(0, dtype=np.int64)
+            max_id = int(ids.max()) if len(ids) else 0
+            # Vale si cubre exactamente los proyectos con id ≤ max_id; la cola se indexa en sync()
+            n = self._conn.execute("SELECT COUNT(*) FROM proyectos WHERE id <= ?", (max_id,)).fetchone()[0]
+            if n == index.ntotal:
+                self.max_id = max_id
+                return index
+        # Índice ausente o inconsistente con SQLite: se reconstruye completo en sync()
+        self.max_id = 0
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedder.dim))
+
+    def sync(self) -> int:
+        """Indexa los proyectos con id mayor al último visto (altas de otros procesos)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM proyectos WHERE id > ? ORDER BY id", (self.max_id,)).fetchall()
+            if not rows:
+                return 0
+            vecs = self.embedder.embed([project_text(dict(r)) for r in rows])
+            self.index.add_with_ids(vecs, np.array([r["id"] for r in rows], dtype=np.int64))
+            self.max_id = rows[-1]["id"]
+            self._dirty = True
+            return len(rows)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM proyectos").fetchone()[0]
+
+    def add_many(self, projects, flush: bool = True) -> list:
+        projects = [{f: (p.get(f) or "").strip() for f in PROJECT_FIELDS} for p in projects]
+        if not projects:
+            return []
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            with self._conn:
+                ids = [self._conn.execute(
+                    "INSERT INTO proyectos (nombre, cliente, descripcion, resultado, creado) VALUES (?,?,?,?,?)",
+                    (*(p[f] for f in PROJECT_FIELDS), now)).lastrowid for p in projects]
+            self.sync()  # indexa estas altas y las de otros procesos
+        if flush:
+            self.flush()
+        return ids
+
+    def add(self, project: dict, flush: bool = True) -> int:
+        return self.add_many([project], flush=flush)[0]
+
+    def flush(self):
+        """Persiste el índice FAISS en disco (escritura atómica)."""
+        with self._lock:
+            self.sync()  # nunca escribir un índice más viejo que SQLite
+            if not self._dirty:
+                return
+            tmp = f"{self.index_path}.{os.getpid()}.tmp"
+            self._faiss.write_index(self.index, tmp)
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+
+    def search(self, text: str, k: int = 5) -> list:
+        """Top-k proyectos más parecidos a `text`: [{..., 'similitud': float}]."""
+        if not (text or "").strip():
+            return []
+        self.sync()
+        if self.index.ntotal == 0:
+            return []
+        q = self.embedder.embed([text])
+        with self._lock:
+            scores, ids = self.index.search(q, min(k, self.index.ntotal))
+            hits = [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
+            if not hits:
+                return []
+            rows = {r["id"]: dict(r) for r in self._conn.execute(
+                f"SELECT * FROM proyectos WHERE id IN ({','.join('?' * len(hits))})", [i for i, _ in hits])}
+        return [{**rows[i], "similitud": s} for i, s in hits if i in rows]
+
+
+@lru_cache(maxsize=None)
+def get_memory() -> ProjectMemory:
+    """Memoria compartida por el proceso."""
+    return ProjectMemory()
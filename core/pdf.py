@@ -0,0 +1,265 @@
+# core/pdf.py — Render del Plan de Negocio a PDF con caché LRU por contenido
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+# Subir esta versión cuando cambie la plantilla (márgenes, logo, estilos...)
+# invalida todas las entradas de caché previas.
+PDF_TEMPLATE_VERSION = "2"
+ROOT_DIR = Path(__file__).resolve().parent.parent
+LOGO_PATH = ROOT_DIR / "logo_babel.jpeg"
+FONT_PATH = ROOT_DIR / "DejaVuSans.ttf"
+FONT = "DejaVuSans"
+
+_bold_rx   = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+_italic_rx = re.compile(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])|(?<!\w)_(?!\s)(.+?)(?<!\s)_(?!\w)")
+_code_rx   = re.compile(r"`([^`]+)`")
+
+
+# ------------------------------ Recursos del proceso (se cargan una vez) ------------------------------
+def _first_existing(*paths):
+    return next((str(p) for p in paths if p and Path(p).exists()), None)
+
+
+@lru_cache(maxsize=1)
+def register_fonts() -> frozenset:
+    """Registra DejaVuSans (incluida en el repo) y devuelve los códigos de carácter que cubre."""
+    import reportlab
+    from reportlab.lib.fonts import addMapping
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    regular = TTFont(FONT, str(FONT_PATH))
+    pdfmetrics.registerFont(regular)
+    # Variantes: DejaVu junto al regular o del sistema; si no, Vera (incluida en reportlab)
+    rl_fonts = Path(reportlab.__file__).parent / "fonts"
+    variants = {
+        "bold":   ("DejaVuSans-Bold.ttf", "VeraBd.ttf"),
+        "italic": ("DejaVuSans-Oblique.ttf", "VeraIt.ttf"),
+    }
+    names = {}
+    for kind, (dejavu, vera) in variants.items():
+        path = _first_existing(ROOT_DIR / dejavu, Path("/usr/share/fonts/truetype/dejavu") / dejavu, rl_fonts / vera)
+        if path:
+            names[kind] = f"{FONT}-{kind}"
+            pdfmetrics.registerFont(TTFont(names[kind], path))
+        else:
+            names[kind] = FONT
+    addMapping(FONT, 0, 0, FONT)
+    addMapping(FONT, 1, 0, names["bold"])
+    addMapping(FONT, 0, 1, names["italic"])
+    addMapping(FONT, 1, 1, names["bold"])
+    return frozenset(regular.face.charToGlyph)
+
+
+@lru_cache(maxsize=1)
+def plan_styles() -> dict:
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    register_fonts()
+    base = getSampleStyleSheet()
+    navy = colors.HexColor("#1F3A5F")
+    st = {
+        "title":  ParagraphStyle("PlanTitle", parent=base["Title"], fontName=FONT, textColor=navy),
+        "h1":     ParagraphStyle("PlanH1", parent=base["Heading1"], fontName=FONT, fontSize=18, leading=22,
+                                 textColor=navy, spaceBefore=6, spaceAfter=8),
+        "h2":     ParagraphStyle("PlanH2", parent=base["Heading2"], fontName=FONT, fontSize=14, leading=18,
+                                 textColor=navy, spaceBefore=10, spaceAfter=6),
+        "h3":     ParagraphStyle("PlanH3", parent=base["Heading3"], fontName=FONT, fontSize=12, leading=15,
+                                 spaceBefore=8, spaceAfter=4),
+        "body":   ParagraphStyle("PlanBody", parent=base["Normal"], fontName=FONT, fontSize=10, leading=14,
+                                 spaceAfter=6),
+        "cell":   ParagraphStyle("PlanCell", parent=base["Normal"], fontName=FONT, fontSize=9, leading=11),
+        "toc1":   ParagraphStyle("PlanTOC1", parent=base["Normal"], fontName=FONT, fontSize=10, leading=14,
+                                 leftIndent=12),
+        "toc2":   ParagraphStyle("PlanTOC2", parent=base["Normal"], fontName=FONT, fontSize=9, leading=12,
+                                 leftIndent=28),
+        "navy":   navy,
+    }
+    st["h4"] = st["h5"] = st["h6"] = st["h3"]
+    return st
+
+
+@lru_cache(maxsize=1)
+def logo_bytes():
+    try:
+        return LOGO_PATH.read_bytes()
+    except OSError:
+        return None
+
+
+# ------------------------------ Markdown → flowables ------------------------------
+@lru_cache(maxsize=4096)
+def inline_markup(text: str) -> str:
+    """Texto en línea de Markdown → mini-markup de reportlab (escapado y sin glifos ausentes)."""
+    glyphs = register_fonts()
+    t = "".join(ch for ch in text if ord(ch) in glyphs or ch in "\n")
+    t = t.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    t = _code_rx.sub(r"\1", t)
+    t = _bold_rx.sub(lambda m: f"<b>{m.group(1) or m.group(2)}</b>", t)
+    t = _italic_rx.sub(lambda m: f"<i>{m.group(1) or m.group(2)}</i>", t)
+    return t.replace("  \n", "<br/>").replace("\n", " ").strip()
+
+
+def compile_flowables(ast: tuple, toc: bool = True) -> list:
+    """Convierte el AST de core.markdown en flowables con estilo (encabezados, tablas, reglas...).
+
+    Con `toc`, tras el encabezado principal se inserta un índice enlazado a las
+    secciones (## y ###); se resuelve en una sola pasada, sin multiBuild.
+    """
+    from reportlab.lib import colors
+    from reportlab.platypus import HRFlowable, ListFlowable, ListItem, Paragraph, Table, TableStyle
+
+    st = plan_styles()
+    sections = [(b[1], b[2]) for b in ast if b[0] == "heading" and b[1] in (2, 3)]
+    story = []
+    n_sec = 0
+    for block in ast:
+        kind = block[0]
+        if kind == "heading":
+            level, text = block[1], inline_markup(block[2])
+            if level in (2, 3):
+                n_sec += 1
+                p = Paragraph(f'<a name="sec{n_sec}"/>{text}', st[f"h{level}"])
+                p._outline = (level - 2, block[2], f"sec{n_sec}")  # marcador del visor PDF
+            else:
+                p = Paragraph(text, st[f"h{level}"])
+            story.append(p)
+            if toc and level == 1 and sections and n_sec == 0:
+                story.extend(
+                    Paragraph(f'<a href="#sec{i}" color="#1F3A5F">{inline_markup(t)}</a>',
+                              st["toc1" if lvl == 2 else "toc2"])
+                    for i, (lvl, t) in enumerate(sections, 1))
+                story.append(HRFlowable(width="100%", thickness=0.6, color=st["navy"],
+                                        spaceBefore=6, spaceAfter=10))
+        elif kind == "para":
+            story.append(Paragraph(inline_markup(block[1]), st["body"]))
+        elif kind == "rule":
+            story.append(HRFlowable(width="100%", thickness=0.6, color=colors.lightgrey,
+                                    spaceBefore=4, spaceAfter=8))
+        elif kind == "list":
+            story.append(ListFlowable(
+                [ListItem(Paragraph(inline_markup(it), st["body"])) for it in block[2]],
+                bulletType="1" if block[1] else "bullet", bulletFontName=FONT, leftIndent=14))
+        elif kind == "table":
+            header, rows = block[1], block[2]
+            data = ([[Paragraph(f"<b>{inline_markup(c)}</b>", st["cell"]) for c in header]] if header else [])
+            data += [[Paragraph(inline_markup(c), st["cell"]) for c in r] for r in rows]
+            if not data:
+                continue
+            t = Table(data, hAlign="LEFT", repeatRows=1 if header else 0)
+            style = [("GRID", (0, 0), (-1, -1), 0.4, colors.lightgrey),
+                     ("VALIGN", (0, 0), (-1, -1), "TOP")]
+            if header:
+                style.append(("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#E8EEF5")))
+            t.setStyle(TableStyle(style))
+            story.append(t)
+    return story
+
+
+def _plan_doc_class():
+    from reportlab.platypus import SimpleDocTemplate
+
+    class _PlanDoc(SimpleDocTemplate):
+        # Las secciones aparecen como marcadores (outline) en el visor de PDF
+        def afterFlowable(self, flowable):
+            outline = getattr(flowable, "_outline", None)
+            if outline is not None:
+                level, text, key = outline
+                self.canv.bookmarkPage(key)
+                self.canv.addOutlineEntry(text, key, level=level)
+
+    return _PlanDoc
+
+
+def render_plan_pdf(plan_md: str, toc: bool = True) -> bytes:
+    """Genera el PDF del plan compilando su Markdown (AST cacheado) a flowables."""
+    # Importar dentro para evitar errores si reportlab no está instalado
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import Image, Paragraph, Spacer
+
+    from core.markdown import parse_markdown
+
+    st = plan_styles()
+    pdf_buffer = BytesIO()
+    doc = _plan_doc_class()(
+        pdf_buffer,
+        pagesize=letter,
+        leftMargin=50, rightMargin=50, topMargin=80, bottomMargin=50,
+        title="Plan de Negocio – Babel",
+    )
+
+    story = []
+    # Logo (opcional)
+    logo = logo_bytes()
+    if logo:
+        story.append(Image(BytesIO(logo), width=120, height=60))
+        story.append(Spacer(1, 18))
+
+    # Título
+    story.append(Paragraph("<b>Plan de Negocio – Babel</b>", st["title"]))
+    story.append(Spacer(1, 12))
+
+    story.extend(compile_flowables(parse_markdown(plan_md or ""), toc=toc))
+    doc.build(story)
+    return pdf_buffer.getvalue()
+
+
+class PdfCache:
+    """Caché LRU acotada de PDFs, direccionada por hash(plan_md + versión de plantilla).
+
+    Se comparte entre sesiones (vive a nivel de proceso), por eso usa un lock.
+    """
+
+    def __init__(self, max_entries: int = 64, template_version: str = PDF_TEMPLATE_VERSION):
+        self.max_entries = max_entries
+        self.template_version = template_version
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, plan_md: str) -> str:
+        h = hashlib.sha256()
+        h.update(self.template_version.encode("utf-8"))
+        h.update(b"\0")
+        h.update((plan_md or "").encode("utf-8"))
+        return h.hexdigest()
+
+    def get_or_render(self, plan_md: str, render=render_plan_pdf) -> bytes:
+        key = self.key_for(plan_md)
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+        # Render fuera del lock: no bloquear a otras sesiones durante doc.build
+        data = render(plan_md)
+        with self._lock:
+            self._items[key] = data
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return data
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": len(self._items), "max_entries": self.max_entries}
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+
+# Instancia global del proceso (compartida por todas las sesiones de Streamlit)
+pdf_cache = PdfCache()
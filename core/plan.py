@@ -0,0 +1,284 @@
+# core/plan.py — Cuestionario oficial, parsers y construcción del Plan de Negocio
+
+from core.memo import text_cache
+from core.signals import extract_signals
+
+# ------------------------------ Cuestionario oficial ------------------------------
+QUESTIONS = [
+    ("objetivos",      "¿Cuáles son los **objetivos de negocio**?"),
+    ("problema",       "¿Cuál es el **problema a resolver**?"),
+    ("solucion",       "¿Cuál es la **solución esperada**?"),
+    ("target",         "¿Quién va a utilizar la solución? — **TARGET**"),
+    ("funcionalidades","¿Qué **funcionalidades** espera tener?"),
+    ("expectativas",   "¿Qué **expectativas** tiene con esta solución?"),
+    ("experiencia",    "¿Ha tenido **experiencia previa** similar a este proyecto?"),
+    ("adjudicacion",   "¿Cuál es la **forma de adjudicación**?"),
+    ("criterios",      "¿Cuáles son los **criterios de evaluación**?"),
+    ("lanzamiento",    "¿Cuál sería la **fecha de lanzamiento**?"),
+    ("presupuesto",    "¿Cuál es el **rango del presupuesto**?"),
+    ("caso",           "**Caso de negocio:** (beneficios, ROI/ahorros/KPIs)"),
+    ("nombre",         "**Nombre de proyecto:**"),
+    ("notas",          "**Notas generales:**"),
+]
+QUESTION_KEYS = tuple(k for k, _ in QUESTIONS)
+QUESTION_TEXT = dict(QUESTIONS)
+CHECKLIST_DONE = "Completo ✅"
+
+
+def question_for(key: str) -> str:
+    return QUESTION_TEXT.get(key, "¿Algo más?")
+
+def next_unanswered(a: dict):
+    """Primera pregunta del cuestionario sin responder (None si ya están todas)."""
+    return next((k for k in QUESTION_KEYS if not (a.get(k, "") or "").strip()), None)
+
+# ------------------------------ Parsers / señales ------------------------------
+# Todas las señales salen de una sola pasada precompilada (ver core/signals.py)
+def has_money(t: str) -> bool:
+    return "money" in extract_signals(t)
+
+def has_date(t: str) -> bool:
+    return "date" in extract_signals(t)
+
+def count_list_items(t: str) -> int:
+    t = (t or "").strip()
+    return t.count(",") + t.count(";") + (1 if len(t) > 0 else 0)
+
+def mentions_roles_or_area(t: str) -> bool:
+    return "roles" in extract_signals(t)
+
+def mentions_award(t: str) -> bool:
+    return "award" in extract_signals(t)
+
+def mentions_criteria(t: str) -> bool:
+    return "criteria" in extract_signals(t)
+
+def mentions_any(t: str, words) -> bool:
+    t = (t or "").lower()
+    return any(w.lower() in t for w in words)
+
+def has_kpis(t: str) -> bool:
+    return "kpis" in extract_signals(t)
+
+def has_risks(t: str) -> bool:
+    return "risk" in extract_signals(t)
+
+# ------------------------------ build_plan GLOBAL ------------------------------
+def ai_refine(label, text):
+    t = (text or "").strip()
+    if not t:
+        if label == "funcionalidades":
+            return "MVP con dashboard, gestión de usuarios/roles, alertas y exportación de reportes."
+        if label == "criterios":
+            return "Precio total, calidad de entrega, tiempo de implementación, soporte/SLA y experiencia comprobable."
+        if label == "lanzamiento":
+            return "Definir hito (mes/fecha o trimestre) y plan de piloto previo."
+        if label == "presupuesto":
+            return "Rango estimado a definir con Finanzas y Compras."
+        if label == "caso":
+            return "Se espera ROI positivo mediante ahorro operativo y mejora de KPIs de servicio."
+        return "Pendiente por confirmar."
+    t = t.replace("\n", " ").strip()
+    if label in ("objetivos", "problema", "solucion", "expectativas", "caso") and not has_kpis(t):
+        t += " (Incluir KPIs: ROI esperado, ahorro %, mejora de SLA/MTTR, conversión o NPS/CSAT)."
+    if label == "funcionalidades" and (t.count(",") + t.count(";")) < 2:
+        t += " (Detalle al menos 3–4 funcionalidades del MVP)."
+    return t
+
+# ---- Secciones memoizadas: cada una depende solo de sus respuestas ----
+# Acotadas por bytes y con clave por digest: las respuestas crecen en cada turno (ver core/memo.py)
+SECTION_CACHE_BYTES = 2 * 1024 * 1024
+
+@text_cache(max_bytes=SECTION_CACHE_BYTES, max_entries=2048)
+def _sec_titulo(nombre):
+    nombre = (nombre or "").strip() or "(pendiente)"
+    return f"""
+# {nombre}
+
+"""
+
+@text_cache(max_bytes=SECTION_CACHE_BYTES, max_entries=2048)
+def _sec_resumen(objetivos, problema, solucion, target):
+    return f"""## 1. Resumen ejecutivo
+**Objetivos de negocio:** {ai_refine("objetivos", objetivos)}
+
+**Problema a resolver:** {ai_refine("problema", problema)}
+
+**Solución esperada:** {ai_refine("solucion", solucion)}
+
+**TARGET / usuarios:** {ai_refine("target", target)}
+
+---
+
+"""
+
+@text_cache(max_bytes=SECTION_CACHE_BYTES, max_entries=2048)
+def _sec_alcance(funcionalidades, expectativas, caso):
+    return f"""## 2. Alcance y MVP
+**Funcionalidades (MVP):** {ai_refine("funcionalidades", funcionalidades)}
+
+**Expectativas de valor:** {ai_refine("expectativas", expectativas)}
+
+**Caso de negocio (beneficios/KPIs):** {ai_refine("caso", caso)}
+
+---
+
+"""
+
+@text_cache(max_bytes=SECTION_CACHE_BYTES, max_entries=2048)
+def _sec_entrega(lanzamiento, adjudicacion, criterios, experiencia):
+    return f"""## 3. Plan de entrega
+**Fecha de lanzamiento / hito:** {ai_refine("lanzamiento", lanzamiento)}
+
+**Tipo de adjudicación:** {ai_refine("adjudicacion", adjudicacion)}
+
+**Criterios de evaluación:** {ai_refine("criterios", criterios)}
+
+**Experiencia previa del cliente:** {ai_refine("experiencia", experiencia)}
+
+---
+
+"""
+
+@text_cache(max_bytes=SECTION_CACHE_BYTES, max_entries=2048)
+def _sec_presupuesto(presupuesto):
+    return f"""## 4. Presupuesto
+**Rango/Monto:** {ai_refine("presupuesto", presupuesto)}
+
+---
+
+"""
+
+@text_cache(max_bytes=SECTION_CACHE_BYTES, max_entries=2048)
+def _sec_riesgos(notas):
+    notas = (notas or "").strip()
+    notas_tienen_riesgos = has_risks(notas)  # detección local de riesgos/objeciones
+    return f"""## 5. Riesgos y mitigación
+**Riesgos/objeciones:** {notas if notas_tienen_riesgos else "Identificar riesgos técnicos/legales/operativos y plan de mitigación."}
+
+---
+
+"""
+
+@text_cache(max_bytes=SECTION_CACHE_BYTES, max_entries=2048)
+def _sec_siguiente(expectativas, caso):
+    siguiente = (
+        "Proponer **POC** de 2 semanas con alcance, métricas y responsables."
+        if (has_kpis(ai_refine("expectativas", expectativas)) or has_kpis(ai_refine("caso", caso))) else
+        "Agendar **workshop** (90 min) para cerrar funcionalidades, KPIs y timeline."
+    )
+    return f"""## 6. Siguiente paso
+{siguiente}
+
+---
+
+"""
+
+@text_cache(max_bytes=SECTION_CACHE_BYTES, max_entries=2048)
+def _sec_notas(notas):
+    notas = (notas or "").strip()
+    return f"""### Notas generales
+{notas or "—"}
+
+---
+
+"""
+
+def _sec_checklist(checklist):
+    return f"""**Checklist:** {checklist}
+"""
+
+# (nombre de sección, respuestas de las que depende, renderer) en orden de aparición
+PLAN_SECTIONS = (
+    ("titulo",      ("nombre",), _sec_titulo),
+    ("resumen",     ("objetivos", "problema", "solucion", "target"), _sec_resumen),
+    ("alcance",     ("funcionalidades", "expectativas", "caso"), _sec_alcance),
+    ("entrega",     ("lanzamiento", "adjudicacion", "criterios", "experiencia"), _sec_entrega),
+    ("presupuesto", ("presupuesto",), _sec_presupuesto),
+    ("riesgos",     ("notas",), _sec_riesgos),
+    ("siguiente",   ("expectativas", "caso"), _sec_siguiente),
+    ("notas",       ("notas",), _sec_notas),
+)
+
+def _answer(a: dict, k: str) -> str:
+    return a.get(k, "") or ""
+
+def _is_answered(v: str) -> bool:
+    return bool((v or "").strip())
+
+def _view(a: dict, refined: dict = None) -> dict:
+    """Texto que ve cada sección: la versión refinada por IA si ya llegó, si no la respuesta."""
+    refined = refined or {}
+    return {k: refined.get(k) or _answer(a, k) for k in QUESTION_KEYS}
+
+def build_plan(a: dict, refined: dict = None):
+    view = _view(a, refined)
+    parts = [render(*(view[k] for k in deps)) for _, deps, render in PLAN_SECTIONS]
+    faltantes = [k for k in QUESTION_KEYS if not _is_answered(_answer(a, k))]
+    checklist = ", ".join(faltantes) if faltantes else CHECKLIST_DONE
+    parts.append(_sec_checklist(checklist))
+    return "".join(parts), checklist
+
+
+class LivePlan:
+    """Plan en vivo de una sesión: solo re-renderiza las secciones cuyas respuestas cambiaron.
+
+    Los campos faltantes se calculan de las respuestas en cada turno (son pocas
+    claves); el checklist solo se re-renderiza junto con lo que cambió.
+    """
+
+    def __init__(self):
+        self._view = {}
+        self._parts = {}
+        self._missing = set(QUESTION_KEYS)
+        self._md = None
+
+    def update(self, a: dict, refined: dict = None) -> set:
+        """Sincroniza con `a` (y los textos refinados) y devuelve las claves que cambiaron."""
+        view = _view(a, refined)
+        changed = {k for k in QUESTION_KEYS if view[k] != self._view.get(k)}
+        # Faltantes según `a`, no según la vista: borrar una respuesta con texto refinado
+        # deja la sección igual pero el campo vuelve a faltar
+        missing = {k for k in QUESTION_KEYS if not _is_answered(_answer(a, k))}
+        if not changed and missing == self._missing and self._md is not None:
+            return changed
+        self._missing = missing
+        for k in changed:
+            self._view[k] = view[k]
+        for name, deps, render in PLAN_SECTIONS:
+            if name not in self._parts or changed.intersection(deps):
+                self._parts[name] = render(*(self._view[k] for k in deps))
+        self._md = "".join(self._parts[name] for name, _, _ in PLAN_SECTIONS) + _sec_checklist(self.checklist)
+        return changed
+
+    @property
+    def md(self) -> str:
+        return self._md or ""
+
+    @property
+    def missing(self) -> list:
+        return [k for k in QUESTION_KEYS if k in self._missing]
+
+    @property
+    def checklist(self) -> str:
+        faltantes = self.missing
+        return ", ".join(faltantes) if faltantes else CHECKLIST_DONE
+
+    @property
+    def complete(self) -> bool:
+        return not self._missing
+
+    @property
+    def progress(self) -> int:
+        total = len(QUESTION_KEYS)
+        return int(((total - len(self._missing)) / total) * 100)
+
+
+def add_section(md: str, section: str) -> str:
+    """Inserta una sección extra (p. ej. comparación competitiva) antes de las notas generales."""
+    if not section:
+        return md
+    marker = "### Notas generales"
+    if marker in md:
+        return md.replace(marker, section + "\n" + marker, 1)
+    return md + "\n" + section
@@ -0,0 +1,155 @@
+# core/profiler.py — Instrumentación por rerun: spans con tiempo y asignaciones
+#
+# `bloques_proceso` es la variación de sys.getallocatedblocks() durante el span:
+# un conteo de TODO el proceso, que incluye lo que asignaron en ese lapso otras
+# sesiones y el hilo de precalentamiento. Sirve como tendencia (fugas, spans que
+# siempre asignan mucho), no como la memoria propia del span. (tracemalloc
+# tampoco separa por hilo, y encarece cada asignación del proceso.)
+#
+# Activar con BABEL_PROFILE=1. Desactivado, `span()` devuelve un context manager
+# nulo compartido (sin llamadas a reloj ni asignaciones), así que el coste es
+# prácticamente cero.
+#
+# Uso en una página:
+#     profiler.begin_run("caso")
+#     with profiler.span("build_plan"):
+#         ...
+#     profiler.end_run()
+#     profiler.render_panel()   # panel de depuración en la barra lateral
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from core.config import data_path
+
+ENABLED = os.environ.get("BABEL_PROFILE", "").lower() not in ("", "0", "false", "no")
+HISTORY = 1000                  # muestras por span para p50/p95
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+_lock = threading.Lock()
+_samples = {}                   # span -> deque[(ms, bloques_proceso)]
+_local = threading.local()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "t0", "b0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.b0 = sys.getallocatedblocks()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.t0) * 1000
+        _record(self.name, ms, sys.getallocatedblocks() - self.b0)
+        return False
+
+
+def span(name: str):
+    """Context manager que mide `name` dentro del rerun actual (no-op si está desactivado)."""
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def _record(name, ms, blocks):
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run["spans"].append({"span": name, "ms": round(ms, 3), "bloques_proceso": blocks})
+    with _lock:
+        _samples.setdefault(name, deque(maxlen=HISTORY)).append((ms, blocks))
+
+
+def begin_run(page: str):
+    if not ENABLED:
+        return
+    if getattr(_local, "run", None) is not None:
+        end_run()  # rerun anterior cortado por st.rerun()/st.stop()
+    _local.run = {"page": page, "ts": time.time(), "t0": time.perf_counter(),
+                  "b0": sys.getallocatedblocks(), "spans": []}
+
+
+def end_run():
+    if not ENABLED:
+        return
+    run = getattr(_local, "run", None)
+    if run is None:
+        return
+    _local.run = None
+    ms = (time.perf_counter() - run["t0"]) * 1000
+    blocks = sys.getallocatedblocks() - run["b0"]
+    name = f"rerun:{run['page']}"
+    with _lock:
+        _samples.setdefault(name, deque(maxlen=HISTORY)).append((ms, blocks))
+    _append_log({"ts": run["ts"], "page": run["page"], "ms": round(ms, 3), "bloques_proceso": blocks,
+                 "spans": run["spans"]})
+
+
+def _append_log(entry: dict):
+    path = data_path("profile", "spans.jsonl")
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
+    with _lock:
+        try:
+            if path.exists() and path.stat().st_size + len(line) > LOG_MAX_BYTES:
+                for i in range(LOG_BACKUPS - 1, 0, -1):
+                    src = path.with_name(f"{path.name}.{i}")
+                    if src.exists():
+                        os.replace(src, path.with_name(f"{path.name}.{i + 1}"))
+                os.replace(path, path.with_name(f"{path.name}.1"))
+            with open(path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+        except OSError:
+            pass  # el perfilado nunca debe romper la app
+
+
+def summary() -> list:
+    """[{span, n, p50_ms, p95_ms, bloques_proceso_p50}] ordenado por p95 descendente."""
+    with _lock:
+        data = {k: np.array(v, dtype=float) for k, v in _samples.items() if v}
+    rows = []
+    for name, arr in data.items():
+        p50, p95 = np.percentile(arr[:, 0], [50, 95])
+        rows.append({"span": name, "n": len(arr), "p50_ms": round(float(p50), 2),
+                     "p95_ms": round(float(p95), 2), "bloques_proceso_p50": int(np.percentile(arr[:, 1], 50))})
+    return sorted(rows, key=lambda r: -r["p95_ms"])
+
+
+def render_panel():
+    """Panel de depuración en la barra lateral (solo si el perfilado está activo)."""
+    if not ENABLED:
+        return
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Perfil por rerun (debug)"):
+        rows = summary()
+        if rows:
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+        else:
+            st.caption("Aún no hay muestras.")
+        st.caption("bloques_proceso: variación de bloques asignados en todo el proceso durante el span "
+                   "(incluye otras sesiones e hilos).")
+        st.caption(f"Spans en {data_path('profile', 'spans.jsonl')}")
+        if st.button("Vaciar muestras", key="profiler_reset"):
+            with _lock:
+                _samples.clear()
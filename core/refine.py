@@ -0,0 +1,276 @@
+# core/refine.py — Refinamiento de respuestas con un LLM (asíncrono, con caché)
+#
+# Las peticiones se agrupan por presupuesto de tokens (tiktoken) y se envían en
+# paralelo a un endpoint compatible con OpenAI desde un event loop en segundo
+# plano, así el script de Streamlit nunca se bloquea. Cada respuesta se guarda en
+# una caché persistente prompt→respuesta. Mientras tanto (o si hay timeout/error)
+# el plan muestra el texto de `ai_refine` basado en reglas.
+#
+# Las respuestas de los clientes salen a un servicio externo, así que se activa
+# solo de forma explícita: BABEL_LLM=1 más OPENAI_API_KEY o BABEL_LLM_BASE_URL;
+# modelo en BABEL_LLM_MODEL.
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from core.config import data_path
+from core.plan import QUESTION_KEYS, QUESTION_TEXT
+
+PROMPT_VERSION = "1"
+DEFAULT_MODEL = "gpt-4o-mini"
+MEM_ENTRIES = 4096      # tope de las tablas en memoria (caché, fallos, truncados)
+# nombre y notas se muestran tal cual; el resto pasa por ai_refine / LLM
+REFINABLE = tuple(k for k in QUESTION_KEYS if k not in ("nombre", "notas"))
+
+SYSTEM_PROMPT = (
+    "Eres consultor comercial de Babel. Reescribe cada campo de un plan de negocio en español, "
+    "claro y conciso (máx. 3 frases), sin inventar cifras ni datos que no estén en la respuesta. "
+    "Responde SOLO con un objeto JSON {campo: texto_refinado} con las mismas claves recibidas."
+)
+
+
+class _LRU(OrderedDict):
+    """Dict acotado: al pasar de `maxsize` entradas se descarta la usada hace más tiempo."""
+
+    def __init__(self, maxsize: int = MEM_ENTRIES):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+# ------------------------------ Tokens ------------------------------
+@lru_cache(maxsize=1)
+def _encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None  # sin tiktoken (o sin su vocabulario) se estima por caracteres
+
+
+def count_tokens(text: str) -> int:
+    enc = _encoder()
+    return len(enc.encode(text)) if enc else len(text) // 4 + 1
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    enc = _encoder()
+    if enc is None:
+        return text[: max_tokens * 4]
+    toks = enc.encode(text)
+    return text if len(toks) <= max_tokens else enc.decode(toks[:max_tokens])
+
+
+def make_batches(fields: dict, batch_tokens: int) -> list:
+    """Agrupa {campo: texto} en lotes cuyo total de tokens no supera `batch_tokens`."""
+    batches, cur, used = [], {}, 0
+    for k, v in fields.items():
+        n = count_tokens(v) + 16  # margen por clave y pregunta
+        if cur and used + n > batch_tokens:
+            batches.append(cur)
+            cur, used = {}, 0
+        cur[k] = v
+        used += n
+    if cur:
+        batches.append(cur)
+    return batches
+
+
+# ------------------------------ Caché persistente ------------------------------
+class PromptCache:
+    def __init__(self, path=None):
+        self._lock = threading.Lock()
+        self._mem = _LRU()
+        self._conn = sqlite3.connect(str(path or data_path("llm_cache.db")), check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS respuestas (clave TEXT PRIMARY KEY, texto TEXT, creado REAL)")
+
+    def get(self, key: str):
+        with self._lock:
+            v = self._mem.get(key)
+            if v is not None:
+                return v
+            row = self._conn.execute("SELECT texto FROM respuestas WHERE clave = ?", (key,)).fetchone()
+            if row:
+                self._mem[key] = row[0]
+            return row[0] if row else None
+
+    def put_many(self, items: dict):
+        with self._lock, self._conn:
+            self._mem.update(items)
+            self._conn.executemany("INSERT OR REPLACE INTO respuestas VALUES (?, ?, ?)",
+                                   [(k, v, time.time()) for k, v in items.items()])
+
+
+# ------------------------------ Pipeline ------------------------------
+class Refiner:
+    def __init__(self, base_url=None, api_key=None, model=None, timeout: float = 8.0,
+                 batch_tokens: int = 1500, max_field_tokens: int = 400, concurrency: int = 4,
+                 retry_after: float = 300.0, cache: PromptCache = None):
+        self.base_url = base_url
+        self.api_key = api_key or "sin-clave"
+        self.model = model or DEFAULT_MODEL
+        self.timeout = timeout
+        self.batch_tokens = batch_tokens
+        self.max_field_tokens = max_field_tokens
+        self.retry_after = retry_after
+        self.cache = cache or PromptCache()
+        self.stats = {"requests": 0, "refined": 0, "timeouts": 0, "errors": 0}
+        self._sem_size = concurrency
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self._failed = _LRU()   # clave -> momento del fallo (no reintentar enseguida)
+        self._tok_lock = threading.Lock()
+        self._truncated = _LRU()   # digest del texto -> texto truncado (None: cabe completo)
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="refiner-loop", daemon=True).start()
+        self._client = None
+        self._sem = None
+
+    def key_for(self, label: str, text: str) -> str:
+        h = hashlib.sha256()
+        for part in (PROMPT_VERSION, self.model, label, text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _fit(self, text: str) -> str:
+        # Cada token ocupa al menos un byte: un texto corto cabe sin contar tokens; los
+        # largos se cuentan una vez por contenido (lookup corre en cada rerun)
+        if len(text.encode("utf-8")) <= self.max_field_tokens:
+            return text
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._tok_lock:
+            if key in self._truncated:
+                cut = self._truncated.get(key)
+                return text if cut is None else cut
+        cut = truncate_tokens(text, self.max_field_tokens)
+        with self._tok_lock:
+            self._truncated[key] = None if cut == text else cut
+        return cut
+
+    def _prepare(self, answers: dict) -> dict:
+        out = {}
+        for k in REFINABLE:
+            t = " ".join((answers.get(k) or "").split())
+            if t:
+                out[k] = self._fit(t)
+        return out
+
+    def lookup(self, answers: dict) -> dict:
+        """Textos refinados ya disponibles (no bloquea): {campo: texto}."""
+        out = {}
+        for k, t in self._prepare(answers).items():
+            v = self.cache.get(self.key_for(k, t))
+            if v:
+                out[k] = v
+        return out
+
+    def pending(self) -> bool:
+        with self._lock:
+            return bool(self._inflight)
+
+    def submit(self, answers: dict):
+        """Encola los campos sin refinar; devuelve un Future (o None si no hay nada que hacer)."""
+        now = time.time()
+        todo = {}
+        with self._lock:
+            for k, t in self._prepare(answers).items():
+                key = self.key_for(k, t)
+                if key in self._inflight or now - self._failed.get(key, -1e18) < self.retry_after:
+                    continue
+                if self.cache.get(key) is None:
+                    todo[k] = t
+                    self._inflight.add(key)
+        if not todo:
+            return None
+        return asyncio.run_coroutine_threadsafe(self._refine(todo), self._loop)
+
+    def refine_now(self, answers: dict) -> dict:
+        """Versión bloqueante (CLI / pruebas): espera a los lotes y devuelve lo refinado."""
+        fut = self.submit(answers)
+        if fut is not None:
+            fut.result()
+        return self.lookup(answers)
+
+    async def _refine(self, fields: dict) -> dict:
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(base_url=self.base_url, api_key=self.api_key,
+                                       timeout=self.timeout, max_retries=0)
+            self._sem = asyncio.Semaphore(self._sem_size)
+        results = await asyncio.gather(*(self._call(b) for b in make_batches(fields, self.batch_tokens)))
+        merged = {}
+        for r in results:
+            merged.update(r)
+        return merged
+
+    async def _call(self, batch: dict) -> dict:
+        keys = {k: self.key_for(k, t) for k, t in batch.items()}
+        payload = {k: {"pregunta": QUESTION_TEXT[k], "respuesta": t} for k, t in batch.items()}
+        try:
+            async with self._sem:
+                self.stats["requests"] += 1
+                resp = await asyncio.wait_for(self._client.chat.completions.create(
+                    model=self.model,
+                    temperature=0.2,
+                    response_format={"type": "json_object"},
+                    messages=[{"role": "system", "content": SYSTEM_PROMPT},
+                              {"role": "user", "content": json.dumps(payload, ensure_ascii=False)}],
+                ), timeout=self.timeout)
+            data = json.loads(resp.choices[0].message.content or "{}")
+            refined = {k: " ".join(str(data[k]).split()) for k in batch if isinstance(data.get(k), str) and data[k].strip()}
+            if refined:
+                self.cache.put_many({keys[k]: v for k, v in refined.items()})
+                self.stats["refined"] += len(refined)
+            self._mark_failed(keys[k] for k in batch if k not in refined)
+            return refined
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            self._mark_failed(keys.values())
+            return {}
+        except Exception:
+            self.stats["errors"] += 1
+            self._mark_failed(keys.values())
+            return {}
+        finally:
+            with self._lock:
+                self._inflight.difference_update(keys.values())
+
+    def _mark_failed(self, keys):
+        now = time.time()
+        with self._lock:
+            for k in keys:
+                self._failed[k] = now
+
+
+@lru_cache(maxsize=None)
+def get_refiner():
+    """Refinador del proceso, o None si no se activó con BABEL_LLM=1 y un endpoint (solo reglas)."""
+    if os.environ.get("BABEL_LLM", "").lower() not in ("1", "true", "yes"):
+        return None   # una clave de OpenAI en el entorno no basta para enviar datos de clientes
+    base_url = os.environ.get("BABEL_LLM_BASE_URL")
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not (base_url or api_key):
+        return None
+    return Refiner(base_url=base_url, api_key=api_key, model=os.environ.get("BABEL_LLM_MODEL"),
+                   timeout=float(os.environ.get("BABEL_LLM_TIMEOUT", "8")))
@@ -0,0 +1,89 @@
+# core/rfp.py — Ingesta de RFPs en PDF, página por página, hacia `case_answers`
+#
+# El texto se extrae con un generador (una página a la vez) y cada fragmento pasa
+# por el extractor de señales. Por campo solo se guardan unas pocas frases, así que
+# la memoria no crece con el número de páginas, y en cuanto todos los campos tienen
+# sus frases se deja de leer el PDF.
+
+import re
+
+from core.signals import scan_signals
+
+# campo de case_answers -> señal que lo alimenta
+FIELD_SIGNALS = {
+    "presupuesto":  "money",
+    "lanzamiento":  "date",
+    "adjudicacion": "award",
+    "criterios":    "criteria",
+    "target":       "roles",
+}
+MAX_SNIPPETS = 3         # frases por campo
+MAX_SNIPPET_CHARS = 300
+
+_sentence_rx = re.compile(r"(?<=[.;!?])\s+|\n{2,}")
+
+
+def iter_pages(source):
+    """Genera el texto de cada página de `source` (ruta o archivo binario) sin cargar todo el PDF en texto."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(source)
+    for i in range(len(reader.pages)):
+        page = reader.pages[i]
+        try:
+            yield page.extract_text() or ""
+        finally:
+            # pypdf cachea los objetos ya resueltos; soltar los de la página leída
+            reader.resolved_objects.clear()
+            del page
+
+
+def iter_chunks(pages):
+    """Parte cada página en frases normalizadas (espacios colapsados)."""
+    for text in pages:
+        for chunk in _sentence_rx.split(text):
+            chunk = " ".join(chunk.split())
+            if len(chunk) > 3:
+                yield chunk
+
+
+def extract_fields(chunks, fields=FIELD_SIGNALS) -> dict:
+    """Primeras frases con la señal de cada campo: {campo: 'frase 1 … frase 2'}."""
+    found = {f: [] for f in fields}
+    pending = set(fields)
+    for chunk in chunks:
+        sigs = scan_signals(chunk)
+        for f in list(pending):
+            if fields[f] in sigs:
+                snippet = chunk[:MAX_SNIPPET_CHARS]
+                if snippet not in found[f]:
+                    found[f].append(snippet)
+                if len(found[f]) >= MAX_SNIPPETS:
+                    pending.discard(f)
+        if not pending:
+            break  # no se consumen más páginas: extraer texto es lo caro del PDF
+    return {f: " … ".join(v) for f, v in found.items() if v}
+
+
+def ingest_rfp(source) -> tuple:
+    """Lee el RFP en streaming y devuelve (campos extraídos, páginas leídas)."""
+    n_pages = 0
+
+    def counted(pages):
+        nonlocal n_pages
+        for p in pages:
+            n_pages += 1
+            yield p
+
+    fields = extract_fields(iter_chunks(counted(iter_pages(source))))
+    return fields, n_pages
+
+
+def prefill_answers(answers: dict, fields: dict) -> list:
+    """Completa solo los campos vacíos de `answers`; devuelve las claves rellenadas."""
+    filled = []
+    for k, v in fields.items():
+        if not (answers.get(k) or "").strip():
+            answers[k] = f"[RFP] {v}"
+            filled.append(k)
+    return filled
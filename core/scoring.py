@@ -0,0 +1,157 @@
+# core/scoring.py — Motor de calificación 20/30/30/5/5 (un lead o lotes vectorizados)
+#
+# Uso por lotes:
+#   python -m core.scoring leads.csv -o leads_calificados.csv
+#   python -m core.scoring leads.jsonl -o leads_calificados.jsonl
+
+import argparse
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# (columna, pregunta, peso) en el orden de TAB A
+CRITERIA = [
+    ("fecha",       "¿Tiene fecha planeada para iniciar proyecto?", 20),
+    ("marketing",   "¿Es un proyecto para incrementar ventas o marketing?", 30),
+    ("presupuesto", "¿Cuenta con presupuesto?", 30),
+    ("prioridad",   "¿El proyecto resuelve un problema de prioridad 1, 2 o 3?", 5),
+    ("decision",    "¿Hablamos con tomador de decisión?", 5),
+]
+CRITERIA_KEYS = tuple(k for k, _, _ in CRITERIA)
+WEIGHTS = np.array([w for _, _, w in CRITERIA], dtype=np.int16)
+THRESHOLD = 70
+
+# Respuestas que cuentan como afirmativas (se comparan en minúsculas y sin espacios)
+YES_VALUES = np.array(["sí", "si", "s", "yes", "y", "true", "1", "x"])
+
+
+def answers_matrix(columns: dict, n: int) -> np.ndarray:
+    """Convierte {criterio: secuencia de respuestas} en una matriz booleana n×5."""
+    X = np.zeros((n, len(CRITERIA)), dtype=bool)
+    for j, key in enumerate(CRITERIA_KEYS):
+        col = columns.get(key)
+        if col is None:
+            continue
+        # Normalizar solo los valores distintos ("Sí", "No", ...) y expandir
+        uniq, inv = np.unique(np.asarray(col, dtype=str), return_inverse=True)
+        yes = np.isin(np.char.lower(np.char.strip(uniq)), YES_VALUES)
+        X[:, j] = yes[inv.reshape(-1)]
+    return X
+
+
+def score_matrix(X: np.ndarray) -> np.ndarray:
+    """Score 0..100 por fila: producto de la matriz de respuestas por el vector de pesos."""
+    return X.astype(np.int16) @ WEIGHTS
+
+
+def qualified(scores: np.ndarray) -> np.ndarray:
+    return scores >= THRESHOLD
+
+
+def score_lead(answers: dict) -> int:
+    """Score de un solo lead (mismo motor que el modo por lotes)."""
+    X = answers_matrix({k: [answers.get(k) or ""] for k in CRITERIA_KEYS}, 1)
+    return int(score_matrix(X)[0])
+
+
+def blocking_criteria(answers: dict) -> list:
+    """Criterios respondidos en negativo (los que restan puntos)."""
+    X = answers_matrix({k: [answers.get(k) or ""] for k in CRITERIA_KEYS}, 1)
+    return [k for k, ok in zip(CRITERIA_KEYS, X[0]) if not ok]
+
+
+# ------------------------------ E/S por lotes ------------------------------
+def is_jsonl(name: str) -> bool:
+    return str(name).lower().endswith((".jsonl", ".ndjson"))
+
+
+def read_leads(fh, jsonl: bool) -> list:
+    """Filas (dicts) de un CSV o JSONL; ValueError con la línea si el archivo no se puede leer."""
+    if not jsonl:
+        try:
+            return list(csv.DictReader(fh))
+        except csv.Error as e:
+            raise ValueError(f"CSV inválido: {e}") from None
+    rows = []
+    for n, line in enumerate(fh, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"línea {n}: JSON inválido ({e.msg})") from None
+        if not isinstance(row, dict):
+            raise ValueError(f"línea {n}: se esperaba un objeto JSON, no {type(row).__name__}")
+        rows.append(row)
+    return rows
+
+
+def read_leads_bytes(data: bytes, filename: str) -> list:
+    """`read_leads` para un archivo subido (UTF-8, con o sin BOM)."""
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("el archivo no está en UTF-8") from None
+    return read_leads(io.StringIO(text), is_jsonl(filename))
+
+
+def score_rows(rows: list):
+    """Devuelve (scores, calificado) como arrays de NumPy para `rows` (lista de dicts)."""
+    columns = {k: [r.get(k) or "" for r in rows] for k in CRITERIA_KEYS}
+    scores = score_matrix(answers_matrix(columns, len(rows)))
+    return scores, qualified(scores)
+
+
+def write_scored(fh, rows: list, scores, ok, jsonl: bool):
+    if jsonl:
+        for r, s, q in zip(rows, scores.tolist(), ok.tolist()):
+            fh.write(json.dumps({**r, "score": s, "calificado": q}, ensure_ascii=False) + "\n")
+        return
+    fields = list(rows[0].keys()) if rows else list(CRITERIA_KEYS)
+    fields += [f for f in ("score", "calificado") if f not in fields]
+    w = csv.DictWriter(fh, fieldnames=fields, extrasaction="ignore")
+    w.writeheader()
+    for r, s, q in zip(rows, scores.tolist(), ok.tolist()):
+        w.writerow({**r, "score": s, "calificado": "Sí" if q else "No"})
+
+
+def score_bytes(data: bytes, filename: str) -> tuple:
+    """Califica un archivo subido (CSV/JSONL) y devuelve (bytes calificados, n, n_calificados).
+
+    ValueError si el archivo no se puede leer.
+    """
+    jsonl = is_jsonl(filename)
+    rows = read_leads_bytes(data, filename)
+    scores, ok = score_rows(rows)
+    out = io.StringIO()
+    write_scored(out, rows, scores, ok, jsonl)
+    return out.getvalue().encode("utf-8"), len(rows), int(ok.sum())
+
+
+def score_file(src, dst) -> tuple:
+    jsonl = is_jsonl(src)
+    with open(src, encoding="utf-8-sig", newline="") as fh:
+        rows = read_leads(fh, jsonl)
+    scores, ok = score_rows(rows)
+    with open(dst, "w", encoding="utf-8", newline="") as fh:
+        write_scored(fh, rows, scores, ok, is_jsonl(dst))
+    return len(rows), int(ok.sum())
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Califica leads por lotes (20/30/30/5/5, umbral ≥ 70).")
+    ap.add_argument("entrada", help="CSV o JSONL con columnas " + ", ".join(CRITERIA_KEYS))
+    ap.add_argument("-o", "--salida", help="archivo de salida (por defecto <entrada>_calificados)")
+    args = ap.parse_args(argv)
+    src = Path(args.entrada)
+    dst = Path(args.salida) if args.salida else src.with_name(f"{src.stem}_calificados{src.suffix}")
+    n, n_ok = score_file(src, dst)
+    print(f"{n} leads calificados → {dst} ({n_ok} con score ≥ {THRESHOLD})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# core/signals.py — Extracción de señales en una sola pasada (parsers de calificación)
+#
+# Todas las listas de palabras y patrones se compilan UNA vez al importar en una
+# única alternancia. `extract_signals` recorre el texto (en minúsculas) una sola
+# vez y devuelve todas las señales encontradas; el resultado se cachea por digest del texto.
+
+import re
+
+from core.memo import text_cache
+
+# ------------------------------ Vocabulario ------------------------------
+month_words = ("enero","febrero","marzo","abril","mayo","junio","julio","agosto","septiembre","octubre","noviembre","diciembre","q1","q2","q3","q4","semana","mes")
+area_words = ("usuarios","operadores","clientes","agentes","analistas","administradores")
+award_words = ("licitación","invitación","adjudicación directa","concurso","RFP","RFQ","marco","convenio")
+criteria_words = ("precio","calidad","tiempo","soporte","SLA","experiencia","referencias","ROI","seguridad","cumplimiento","integración","capacidad","plazos")
+role_words = ("CTO","CFO","CEO","COO","CIO","CMO","Compras","Procurement","IT","Operaciones","Soporte","Ventas","Marketing","Finanzas","RH","Dirección","Direccion","Gerente","Jefe","Líder","Lider")
+risk_words = ("riesgo","objeción","objecion","costo","seguridad","legal","compliance","privacidad","cambio","adopción","adopcion","integración","integracion","soporte")
+kpi_words = ("NPS","CSAT","SLA","MTTR","conversión","conversion","ingres","ahorro","cost","%")
+kpi_word_bounded = ("horas","días","dias")
+
+money_pattern = r"(?:usd|us\$|mxn|\$|eur|€)\s?[\d.,]+|[\d.,]+\s?(?:usd|us\$|mxn|eur|€)"
+date_pattern  = r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b"
+
+SIGNALS = ("money", "date", "roles", "award", "criteria", "kpis", "risk")
+
+# término (minúsculas) -> [(señal, requiere \b a la izquierda, requiere \b a la derecha)]
+_TERMS = {}
+
+def _add_terms(words, signal, left=False, right=False):
+    for w in words:
+        _TERMS.setdefault(w.lower(), []).append((signal, left, right))
+
+_add_terms(month_words, "date")
+_add_terms(area_words, "roles")
+_add_terms(award_words, "award")
+_add_terms(criteria_words, "criteria")
+_add_terms(role_words, "roles", left=True, right=True)
+_add_terms(risk_words, "risk", left=True, right=True)
+_add_terms(kpi_words, "kpis")
+_add_terms(("roi",), "kpis", left=True)
+_add_terms(kpi_word_bounded, "kpis", left=True, right=True)
+
+# Cierre por prefijos: si en una posición coinciden dos términos, el corto es
+# prefijo del largo; la alternancia devuelve el largo y aquí se recuperan ambos.
+_MATCH_RULES = {
+    term: tuple((len(p), sig, left, right)
+                for p, rules in _TERMS.items() if term.startswith(p)
+                for sig, left, right in rules)
+    for term in _TERMS
+}
+
+def _trie_pattern(words) -> str:
+    """Alternancia factorizada por prefijos (trie), más rápida que una lista plana."""
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def walk(node):
+        ends = "" in node
+        branches = [re.escape(ch) + walk(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        # Sufijo opcional greedy: en cada posición se prefiere el término más largo
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if ends else body
+
+    return walk(trie)
+
+_SIGNAL_RX = re.compile(
+    rf"(?P<money>{money_pattern})|(?P<date>{date_pattern})|(?P<term>{_trie_pattern(_TERMS)})"
+)
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+def scan_signals(text: str) -> frozenset:
+    """Devuelve el conjunto de señales (ver SIGNALS) presentes en `text`."""
+    t = (text or "").lower()
+    n = len(t)
+    found = set()
+    search = _SIGNAL_RX.search
+    pos = 0
+    while len(found) < len(SIGNALS):
+        m = search(t, pos)
+        if m is None:
+            break
+        kind = m.lastgroup
+        s = m.start()
+        # Las coincidencias pueden solaparse: reanudar en el siguiente carácter
+        pos = s + 1
+        if kind != "term":
+            found.add(kind)
+            continue
+        for length, sig, left, right in _MATCH_RULES[m.group()]:
+            if sig in found:
+                continue
+            e = s + length
+            if left and s > 0 and _is_word(t[s - 1]):
+                continue
+            if right and e < n and _is_word(t[e]):
+                continue
+            found.add(sig)
+    return frozenset(found)
+
+
+# Versión cacheada por respuesta (las respuestas del chat se re-evalúan en cada rerun);
+# la clave es un digest del texto, así la caché no retiene respuestas largas
+extract_signals = text_cache(max_entries=4096, sizeof=lambda found: 32 * len(found))(scan_signals)
@@ -0,0 +1,231 @@
+# core/state.py — Estado de sesión persistido fuera del proceso de Streamlit
+#
+# Las claves de PERSISTED_KEYS se guardan en un backend compartido (SQLite por
+# defecto, o Redis) bajo un id de sesión que viaja en la URL (?sid=...). Así una
+# sesión sobrevive a reinicios/despliegues y puede atenderla cualquier proceso
+# detrás del balanceador. En cada rerun solo se escriben las claves cuyo valor
+# serializado cambió (se compara un digest por clave).
+#
+# Backend con BABEL_STATE_URL: vacío → data/state.db · sqlite:///ruta.db ·
+# redis://host:6379/0 (requiere el paquete `redis`) · off → sin persistencia.
+#
+# Uso en una página:
+#     state.attach()   # al inicio: restaura la sesión (una vez por sesión)
+#     ...
+#     state.commit()   # al final y antes de st.rerun(): guarda los cambios
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from functools import lru_cache
+
+from core.config import data_path
+
+# Valores derivados (case_plan, pdf_bytes, memoria_proyectos) no se guardan: se reconstruyen.
+# El caso (respuestas, chat) vive en la bitácora por lead (core/journal.py) y se retoma de ahí.
+PERSISTED_KEYS = (
+    "active_lead_idx", "lead", "lead_score", "score",
+    "plan_md", "ready_for_pdf", "comp_urls", "comp_md", "ultima_actualizacion",
+)
+TTL = int(os.environ.get("BABEL_STATE_TTL", 7 * 24 * 3600))   # segundos sin actividad
+COMPRESS_MIN = 512                                           # bytes a partir de los que se comprime
+
+_SID_KEY = "_state_sid"
+_DIGESTS_KEY = "_state_digests"
+_sid_rx = re.compile(r"[0-9a-f]{32}")
+
+
+# ------------------------------ Serialización ------------------------------
+# Un byte de tipo + carga: j = JSON, z = JSON con zlib
+def dumps(value) -> bytes:
+    raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(raw) >= COMPRESS_MIN:
+        return b"z" + zlib.compress(raw, 6)
+    return b"j" + raw
+
+
+def loads(blob: bytes):
+    kind, body = blob[:1], blob[1:]
+    if kind == b"z":
+        body = zlib.decompress(body)
+    return json.loads(body)
+
+
+def _digest(blob: bytes) -> str:
+    return hashlib.blake2b(blob, digest_size=8).hexdigest()
+
+
+# ------------------------------ Backends ------------------------------
+class StateBackend:
+    """Interfaz: blobs por (sesión, clave)."""
+
+    def load(self, sid: str) -> dict:
+        raise NotImplementedError
+
+    def save(self, sid: str, changed: dict, deleted=()) -> None:
+        raise NotImplementedError
+
+
+class SQLiteStateBackend(StateBackend):
+    """Una fila por (sesión, clave) en SQLite WAL; compartible por varios procesos del mismo host."""
+
+    def __init__(self, path=None, ttl: int = TTL):
+        self.path = str(path or data_path("state.db"))
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS state (
+                sid TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, updated REAL NOT NULL,
+                PRIMARY KEY (sid, key)) WITHOUT ROWID""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS state_updated ON state(updated)")
+        self.purge()
+
+    def load(self, sid: str) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM state WHERE sid = ? AND updated > ?",
+                                      (sid, time.time() - self.ttl)).fetchall()
+        return {k: bytes(v) for k, v in rows}
+
+    def save(self, sid: str, changed: dict, deleted=()) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            if changed:
+                self._conn.executemany(
+                    "INSERT INTO state (sid, key, value, updated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(sid, key) DO UPDATE SET value=excluded.value, updated=excluded.updated",
+                    [(sid, k, v, now) for k, v in changed.items()])
+            if deleted:
+                self._conn.executemany("DELETE FROM state WHERE sid = ? AND key = ?", [(sid, k) for k in deleted])
+            # Mantener viva toda la sesión, no solo las claves que cambiaron
+            self._conn.execute("UPDATE state SET updated = ? WHERE sid = ?", (now, sid))
+
+    def purge(self) -> int:
+        """Elimina las sesiones sin actividad en más de `ttl` segundos."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM state WHERE updated < ?", (time.time() - self.ttl,)).rowcount
+
+
+class RedisStateBackend(StateBackend):
+    """Un hash por sesión (babel:sesion:<sid>) con expiración; sirve para varios hosts.
+
+    `client` es cualquier objeto con la API de redis-py usada aquí (hgetall,
+    pipeline → hset/hdel/expire/execute), p. ej. un doble local en pruebas.
+    """
+
+    def __init__(self, url: str = None, client=None, ttl: int = TTL, prefix: str = "babel:sesion:"):
+        if client is None:
+            import redis  # opcional: solo si se configura un backend redis://
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def load(self, sid: str) -> dict:
+        raw = self.client.hgetall(self.prefix + sid)
+        return {(k.decode() if isinstance(k, bytes) else k): bytes(v) for k, v in raw.items()}
+
+    def save(self, sid: str, changed: dict, deleted=()) -> None:
+        name = self.prefix + sid
+        pipe = self.client.pipeline(transaction=False)
+        if changed:
+            pipe.hset(name, mapping=changed)
+        if deleted:
+            pipe.hdel(name, *deleted)
+        pipe.expire(name, self.ttl)
+        pipe.execute()
+
+
+def backend_from_url(url: str):
+    url = (url or "").strip()
+    if url.lower() in ("off", "none", "0"):
+        return None
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStateBackend(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteStateBackend(url[len("sqlite:///"):])
+    if url:
+        raise ValueError(f"BABEL_STATE_URL no soportada: {url}")
+    return SQLiteStateBackend()
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    """Backend compartido por el proceso (None si la persistencia está desactivada)."""
+    return backend_from_url(os.environ.get("BABEL_STATE_URL", ""))
+
+
+# ------------------------------ Sincronización ------------------------------
+def restore(state, backend, sid: str) -> int:
+    """Carga en `state` las claves guardadas de `sid` que aún no estén; devuelve cuántas."""
+    digests = {}
+    n = 0
+    for k, blob in backend.load(sid).items():
+        digests[k] = _digest(blob)
+        if k not in state:
+            state[k] = loads(blob)
+            n += 1
+    state[_DIGESTS_KEY] = digests
+    state[_SID_KEY] = sid
+    return n
+
+
+def persist(state, backend, sid: str) -> tuple:
+    """Escribe solo las claves que cambiaron desde la última sincronización."""
+    digests = state.get(_DIGESTS_KEY)
+    if digests is None:
+        digests = state[_DIGESTS_KEY] = {}
+    changed, deleted = {}, []
+    for k in PERSISTED_KEYS:
+        if k not in state:
+            if k in digests:
+                deleted.append(k)
+            continue
+        blob = dumps(state[k])
+        d = _digest(blob)
+        if digests.get(k) != d:
+            changed[k] = blob
+            digests[k] = d
+    for k in deleted:
+        del digests[k]
+    if changed or deleted:
+        backend.save(sid, changed, deleted)
+    return changed, deleted
+
+
+def attach():
+    """Resuelve el id de sesión de la URL y restaura su estado (una vez por sesión)."""
+    backend = get_backend()
+    if backend is None:
+        return None
+    import streamlit as st
+
+    ss = st.session_state
+    sid = st.query_params.get("sid") or ss.get(_SID_KEY)
+    if not sid or not _sid_rx.fullmatch(sid):
+        sid = uuid.uuid4().hex
+    if st.query_params.get("sid") != sid:
+        st.query_params["sid"] = sid
+    if ss.get(_SID_KEY) != sid:
+        restore(ss, backend, sid)
+    return sid
+
+
+def commit():
+    """Guarda los cambios de esta sesión en el backend."""
+    backend = get_backend()
+    if backend is None:
+        return
+    import streamlit as st
+
+    sid = st.session_state.get(_SID_KEY)
+    if sid:
+        persist(st.session_state, backend, sid)
@@ -0,0 +1,301 @@
+# core/suggest.py — Sugerencias de respuesta a partir de casos completos (BM25 por campo)
+#
+# Cuando un plan llega a "Completo ✅", sus respuestas se agregan a una tabla
+# append-only (data/sugerencias.db) y a un índice invertido por pregunta del
+# cuestionario. Para la pregunta actual del chat se buscan, con BM25, respuestas
+# pasadas a ESA pregunta que compartan términos con el contexto del caso en curso
+# (sus otras respuestas y la descripción del lead). Sin coincidencias se sugieren
+# las respuestas más repetidas. Respuestas idénticas se indexan una sola vez y
+# cuentan cuántas veces aparecieron.
+#
+# Las listas de postings viven en buffers `array` (alta O(1)) y se puntúan con
+# NumPy sin copiar: el costo por consulta depende de los términos del contexto,
+# no del número de casos. Cada SNAPSHOT_EVERY respuestas el índice se guarda en
+# disco (sugerencias.db.idx) junto con la última fila que cubre; un proceso nuevo
+# lo carga y solo indexa las respuestas posteriores.
+#
+#   python -m core.suggest            # indexa los casos completos de la bitácora
+#   python -m core.suggest -k presupuesto "app de pagos, CRM"   # prueba una consulta
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import pickle
+import re
+import sqlite3
+import sys
+import threading
+from array import array
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from core.config import data_path
+from core.plan import QUESTION_KEYS
+from core.text import fold
+
+K1 = 1.2
+B = 0.75
+TOP_K = 3
+MAX_QUERY_TERMS = 16        # términos más informativos (idf) del contexto que se usan
+SNAPSHOT_EVERY = 20000      # respuestas indexadas entre snapshots del índice
+SNAPSHOT_VERSION = 2        # cambia si cambia la tokenización (el índice se rehace)
+
+_word_rx = re.compile(r"\w+", re.U)
+# Palabras vacías en español (no aportan a la coincidencia)
+_STOP = frozenset("""a al algo algun alguna algunos ante antes como con contra cual cuando de del desde donde
+    durante e el ella ellos en entre era es esa ese eso esta este esto estos fue ha hay la las le les lo los mas
+    me mi muy nos o otra otro para pero por porque que se ser si sin sobre son su sus tambien tiene todo tu un una
+    uno unos y ya""".split())
+
+
+def tokenize(text: str) -> list:
+    return [w for w in _word_rx.findall(fold(text)) if w not in _STOP and (len(w) > 1 or w.isdigit())]
+
+
+def case_digest(answers: dict) -> str:
+    raw = json.dumps({k: (answers.get(k) or "").strip() for k in QUESTION_KEYS}, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class FieldIndex:
+    """Índice invertido BM25 de las respuestas a una pregunta (documentos únicos por texto)."""
+
+    def __init__(self):
+        self.texts = []
+        self._doc = {}                     # texto → id de documento
+        self.veces = array("q")            # apariciones de cada texto
+        self.dl = array("f")               # largo (términos) de cada documento
+        self.postings = {}                 # término → (array ids, array tf)
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_doc"]       # se reconstruye de `texts`
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._doc = {t: i for i, t in enumerate(self.texts)}
+
+    def add(self, text: str) -> None:
+        text = " ".join((text or "").split())
+        if not text:
+            return
+        doc = self._doc.get(text)
+        if doc is not None:
+            self.veces[doc] += 1
+            return
+        doc = self._doc[text] = len(self.texts)
+        self.texts.append(text)
+        self.veces.append(1)
+        toks = tokenize(text)
+        self.dl.append(len(toks))
+        self._total_len += len(toks)
+        tf = {}
+        for t in toks:
+            tf[t] = tf.get(t, 0) + 1
+        for t, n in tf.items():
+            p = self.postings.get(t)
+            if p is None:
+                p = self.postings[t] = (array("q"), array("f"))
+            p[0].append(doc)
+            p[1].append(n)
+
+    def idf(self, term: str) -> float:
+        p = self.postings.get(term)
+        df = len(p[0]) if p else 0
+        return math.log(1 + (len(self.texts) - df + 0.5) / (df + 0.5))
+
+    def search(self, terms, k: int = TOP_K) -> list:
+        """[(texto, score)] con mejor BM25 para `terms`; sin coincidencias, los más repetidos."""
+        n = len(self.texts)
+        if not n:
+            return []
+        veces = np.frombuffer(self.veces, dtype=np.int64)
+        terms = sorted((t for t in set(terms) if t in self.postings), key=self.idf, reverse=True)
+        if terms:
+            dl = np.frombuffer(self.dl, dtype=np.float32)
+            scores = np.zeros(n, dtype=np.float32)
+            avgdl = self._total_len / n or 1.0
+            for t in terms[:MAX_QUERY_TERMS]:
+                ids, tf = self.postings[t]
+                ids = np.frombuffer(ids, dtype=np.int64)
+                tf = np.frombuffer(tf, dtype=np.float32)
+                scores[ids] += self.idf(t) * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl[ids] / avgdl))
+            hit = np.flatnonzero(scores)
+            if len(hit):
+                # empates: primero la respuesta más repetida
+                order = np.lexsort((-veces[hit], -scores[hit]))[:k]
+                return [(self.texts[i], float(scores[i])) for i in hit[order]]
+        top = np.argsort(-veces, kind="stable")[:k]
+        return [(self.texts[i], 0.0) for i in top]
+
+
+class AnswerSuggester:
+    """Respuestas de casos completos (SQLite append-only) + un FieldIndex por pregunta."""
+
+    def __init__(self, path=None, snapshot_every: int = SNAPSHOT_EVERY):
+        self.path = str(path or data_path("sugerencias.db"))
+        self.snapshot_path = self.path + ".idx"
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS casos (
+                    digest TEXT PRIMARY KEY, lead_id INTEGER NOT NULL, ts TEXT NOT NULL);
+                CREATE TABLE IF NOT EXISTS respuestas (
+                    id INTEGER PRIMARY KEY, digest TEXT NOT NULL, clave TEXT NOT NULL, texto TEXT NOT NULL);
+            """)
+        self.fields = {k: FieldIndex() for k in QUESTION_KEYS}
+        self._cases = set()
+        self.max_id = 0
+        self._purge_no_lead()
+        self._load_snapshot()
+        self._snap_id = self.max_id
+        self.sync()
+
+    def __len__(self) -> int:
+        return len(self._cases)
+
+    def sync(self, batch: int = 50000) -> int:
+        """Indexa las respuestas con id mayor al último visto (casos de otros procesos)."""
+        n = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, digest, clave, texto FROM respuestas WHERE id > ? ORDER BY id LIMIT ?",
+                    (self.max_id, batch)).fetchall()
+                for rid, digest, clave, texto in rows:
+                    if clave in self.fields:
+                        self.fields[clave].add(texto)
+                    self._cases.add(digest)
+                    self.max_id = rid
+            if not rows:
+                break
+            n += len(rows)
+        if self.max_id - self._snap_id >= self.snapshot_every:
+            self.snapshot()
+        return n
+
+    def _purge_no_lead(self):
+        # Casos sin lead indexados por versiones anteriores: se borran y el índice se rehace
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM respuestas WHERE digest IN (SELECT digest FROM casos WHERE lead_id <= 0)")
+            self._conn.execute("DELETE FROM casos WHERE lead_id <= 0")
+        if cur.rowcount and os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "rb") as fh:
+                snap = pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return
+        with self._lock:
+            last = self._conn.execute("SELECT MAX(id) FROM respuestas").fetchone()[0] or 0
+        # Snapshot de otra base, otro cuestionario u otra tokenización: se reconstruye desde la tabla
+        if (snap.get("max_id", 0) > last or tuple(snap.get("fields", ())) != QUESTION_KEYS
+                or snap.get("version") != SNAPSHOT_VERSION):
+            return
+        self.fields, self._cases, self.max_id = snap["fields"], snap["cases"], snap["max_id"]
+
+    def snapshot(self):
+        """Guarda el índice en disco (escritura atómica)."""
+        with self._lock:
+            tmp = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as fh:
+                pickle.dump({"version": SNAPSHOT_VERSION, "max_id": self.max_id, "fields": self.fields,
+                             "cases": self._cases}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.snapshot_path)
+            self._snap_id = self.max_id
+
+    def add_case(self, answers: dict, lead_id=None) -> bool:
+        """Agrega un caso completo (idempotente por contenido); devuelve si era nuevo.
+
+        Solo casos de un lead: los casos sin lead (NO_LEAD) no se indexan.
+        """
+        if not lead_id or int(lead_id) <= 0:
+            return False
+        digest = case_digest(answers)
+        if digest in self._cases:
+            return False
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            cur = self._conn.execute("INSERT OR IGNORE INTO casos (digest, lead_id, ts) VALUES (?, ?, ?)",
+                                     (digest, int(lead_id or 0), now))
+            if cur.rowcount:
+                self._conn.executemany("INSERT INTO respuestas (digest, clave, texto) VALUES (?, ?, ?)",
+                                       [(digest, k, (answers.get(k) or "").strip()) for k in QUESTION_KEYS
+                                        if (answers.get(k) or "").strip()])
+        self.sync()
+        self._cases.add(digest)
+        return bool(cur.rowcount)
+
+    def suggest(self, key: str, context: str = "", k: int = TOP_K) -> list:
+        """Mejores respuestas pasadas a `key` para el contexto del caso en curso: [(texto, score)]."""
+        index = self.fields.get(key)
+        if index is None:
+            return []
+        self.sync()
+        with self._lock:
+            return index.search(tokenize(context), k)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def case_context(answers: dict, lead: dict = None, skip: str = None) -> str:
+    """Texto del caso en curso con el que se buscan sugerencias (otras respuestas + descripción del lead)."""
+    parts = [(answers.get(k) or "") for k in QUESTION_KEYS if k != skip]
+    if lead:
+        parts.append(lead.get("descripcion") or "")
+    return " ".join(p for p in parts if p)
+
+
+@lru_cache(maxsize=None)
+def get_suggester() -> AnswerSuggester:
+    """Índice de sugerencias compartido por el proceso."""
+    return AnswerSuggester()
+
+
+def backfill(suggester: AnswerSuggester, journal) -> int:
+    """Agrega los casos completos que ya están en la bitácora; devuelve cuántos eran nuevos."""
+    n = 0
+    for lead_id in journal.lead_ids():
+        if lead_id <= 0:
+            continue
+        case = journal.load(lead_id)
+        if case.complete and suggester.add_case(case.answers, lead_id):
+            n += 1
+    return n
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Índice de sugerencias de respuesta (casos completos).")
+    ap.add_argument("contexto", nargs="?", help="texto del caso para probar una consulta")
+    ap.add_argument("-k", "--clave", default="funcionalidades", choices=QUESTION_KEYS)
+    args = ap.parse_args(argv)
+    sug = get_suggester()
+    if args.contexto is None:
+        from core.journal import get_journal
+        n = backfill(sug, get_journal())
+        print(f"{n} casos nuevos desde la bitácora · {len(sug)} casos indexados", file=sys.stderr)
+        return
+    for texto, score in sug.suggest(args.clave, args.contexto):
+        print(f"{score:6.2f}  {texto}")
+
+
+if __name__ == "__main__":
+    main()
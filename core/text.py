@@ -0,0 +1,21 @@
+# core/text.py — Normalización de texto compartida (sin acentos, sin mayúsculas)
+
+import unicodedata
+
+
+def strip_marks(text: str) -> str:
+    """Quita acentos y demás marcas combinantes (NFKD); el resto de las letras se conserva."""
+    t = "" if text is None else str(text)   # JSON trae números donde se esperaba texto
+    if t.isascii():
+        return t
+    t = unicodedata.normalize("NFKD", t)
+    plain = t.encode("ascii", "ignore").decode("ascii")
+    # Atajo: si todo lo que no es ASCII eran marcas (texto latino), basta con descartarlo
+    if len(plain) == len(t) or all(unicodedata.combining(ch) for ch in set(t) if not ch.isascii()):
+        return plain
+    return "".join(ch for ch in t if not unicodedata.combining(ch))
+
+
+def fold(text: str) -> str:
+    """Minúsculas y sin acentos: "Integración" == "integracion"."""
+    return strip_marks(("" if text is None else str(text)).casefold())
@@ -0,0 +1,133 @@
+# core/warmup.py — Precalentamiento de los recursos del proceso
+#
+# Las dependencias pesadas (reportlab, faiss, pypdf, tiktoken…) se importan de
+# forma perezosa la primera vez que se usan, y lo que se construye con ellas
+# (fuentes, estilos, logo, índice de memoria) queda cacheado por proceso. Con
+# BABEL_WARMUP=1 la home lo construye todo en un hilo al arrancar el servidor,
+# así la primera sesión no paga esos costos en su primer rerun.
+#
+#   python -m core.warmup        # mide cada etapa en un proceso frío
+
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+
+ENABLED = os.environ.get("BABEL_WARMUP", "").lower() in ("1", "true", "yes")
+
+
+def _pdf():
+    from core.pdf import logo_bytes, plan_styles, register_fonts
+    register_fonts()
+    plan_styles()
+    logo_bytes()
+
+
+def _plan():
+    from core.plan import QUESTION_KEYS, build_plan
+    from core.signals import extract_signals
+    extract_signals("USD 10,000 en marzo")
+    build_plan(dict.fromkeys(QUESTION_KEYS, ""))
+
+
+def _scoring():
+    import core.scoring  # noqa: F401  (numpy)
+
+
+def _memory():
+    from core.memory import get_memory
+    get_memory().count()
+
+
+def _leads():
+    from core.leads import get_store
+    get_store().count()
+
+
+def _dedup():
+    from core.dedup import get_dedup
+    get_dedup()
+
+
+def _analytics():
+    from core.analytics import get_analytics
+    get_analytics().refresh()
+
+
+def _suggest():
+    from core.suggest import get_suggester
+    get_suggester()
+
+
+def _journal():
+    from core.journal import get_journal
+    get_journal()
+
+
+def _rfp():
+    import pypdf  # noqa: F401
+
+
+def _refine():
+    from core.refine import _encoder, get_refiner
+    if get_refiner() is not None:
+        _encoder()
+
+
+# (etapa, función) en orden de ejecución
+STAGES = (
+    ("pdf", _pdf),
+    ("plan", _plan),
+    ("scoring", _scoring),
+    ("memoria", _memory),
+    ("leads", _leads),
+    ("casos", _journal),
+    ("dedup", _dedup),
+    ("analitica", _analytics),
+    ("sugerencias", _suggest),
+    ("rfp", _rfp),
+    ("refine", _refine),
+)
+
+
+@lru_cache(maxsize=1)
+def warm_up() -> dict:
+    """Construye los recursos compartidos una sola vez por proceso; devuelve ms por etapa."""
+    timings = {}
+    for name, fn in STAGES:
+        t0 = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:  # una dependencia opcional ausente no impide arrancar
+            timings[name] = f"error: {e}"
+            continue
+        timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+    return timings
+
+
+_lock = threading.Lock()
+_started = False
+
+
+def start_warm_up() -> None:
+    """Lanza `warm_up` en segundo plano, una vez por proceso, si BABEL_WARMUP está activo."""
+    global _started
+    if not ENABLED:
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=warm_up, name="babel-warmup", daemon=True).start()
+
+
+def main():
+    t0 = time.perf_counter()
+    for name, ms in warm_up().items():
+        print(f"{name:<12}{ms if isinstance(ms, str) else f'{ms:>8.1f} ms'}")
+    print(f"{'total':<12}{(time.perf_counter() - t0) * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,23 @@
-import streamlit as st
+from core import profiler
+
+profiler.begin_run("lead_memoria")
+with profiler.span("import"):
+    import streamlit as st
+
+    from core import state
+    from core.dedup import get_dedup, import_bytes
+    from core.leads import PAGE_SIZE, get_store
+    from core.memory import get_memory
 
 st.header("📌 Fase 1 · Lead & Memoria")
+with profiler.span("estado"):
+    state.attach()
 
-# Estado inicial
-if "leads" not in st.session_state: st.session_state["leads"] = []
+# Estado inicial (los leads viven en el store persistente; aquí solo el id activo)
 if "active_lead_idx" not in st.session_state: st.session_state["active_lead_idx"] = None
 
+store = get_store()
+
 st.markdown("Completa los datos del lead y guárdalos. Podrás seleccionarlo como activo para calificarlo en la Fase 2.")
 
 with st.form("lead_form", clear_on_submit=False):
@@ -22,21 +34,120 @@ with st.form("lead_form", clear_on_submit=False):
     if submitted:
         lead = {"empresa": empresa, "nombre": nombre, "correo": correo,
                 "telefono": telefono, "descripcion": desc}
-        st.session_state["leads"].append(lead)
+        # Mismo empresa + correo → se actualiza el registro existente
+        lead_id = store.upsert(lead)
+        st.session_state["active_lead_idx"] = lead_id
+        # Llevar el listado a la página del lead guardado (sin filtro si la búsqueda no lo incluye)
+        pos = store.position(lead_id, st.session_state.get("lead_buscar", ""))
+        if pos is None:
+            st.session_state["lead_buscar"] = ""
+            pos = store.position(lead_id)
+        st.session_state["lead_pagina"] = pos // PAGE_SIZE + 1
         st.success("✅ Lead guardado en memoria.")
+        # Casi duplicados (otra grafía de la empresa, mismo correo con otro contacto…)
+        with profiler.span("dedup"):
+            dedup = get_dedup()
+            dedup.sync(store)
+            dedup.add(lead_id, lead)
+            similares = dedup.query(lead, exclude=lead_id)[:3]
+        if similares:
+            filas = [(i, s, store.get(i) or {}) for i, s in similares]
+            st.warning("⚠️ Posibles duplicados: " + " · ".join(
+                f'[{i}] {l.get("empresa", "")} — {l.get("nombre", "")} ({s:.0%})' for i, s, l in filas))
+
+with st.expander("📥 Importar leads (CSV/JSONL)"):
+    st.caption("Columnas: empresa, nombre, correo, telefono, descripcion. Los casi duplicados del mismo contacto "
+               "se fusionan (se completan campos vacíos); los demás parecidos se marcan para revisión.")
+    archivo = st.file_uploader("Archivo de leads", type=["csv", "jsonl", "ndjson"], key="lead_import")
+    if archivo is not None and st.button("Importar", use_container_width=True):
+        try:
+            with st.spinner("Importando y buscando duplicados…"), profiler.span("dedup_import"):
+                res = import_bytes(archivo.getvalue(), archivo.name, store)
+        except ValueError as e:
+            st.error(f"No se pudo importar {archivo.name}: {e}")
+        else:
+            st.success(f"{res['filas']} filas · {res['nuevos']} leads nuevos/actualizados · "
+                       f"{res['fusionados']} fusionados con existentes · {len(res['marcados'])} marcados.")
+            if res["marcados"]:
+                st.dataframe(res["marcados"][:500], hide_index=True, use_container_width=True)
 
 # Listado de leads
+def _elegir_lead():
+    # Solo una elección explícita cambia el lead activo (paginar o buscar no)
+    st.session_state["active_lead_idx"] = st.session_state["lead_select"]
+
+
 st.markdown("### Leads guardados")
-if not st.session_state["leads"]:
+if not store.count():
     st.info("Aún no hay leads guardados.")
 else:
-    opts = [f'[{i+1}] {l["empresa"]} · {l["nombre"]}' for i,l in enumerate(st.session_state["leads"])]
-    choice = st.selectbox("Selecciona lead activo", options=list(range(len(opts))), format_func=lambda x: opts[x])
-    st.session_state["active_lead_idx"] = int(choice)
-    lead = st.session_state["leads"][choice]
-    st.markdown(f"""
+    c1, c2 = st.columns([3, 1])
+    prefijo = c1.text_input("Buscar por empresa o correo (prefijo)", key="lead_buscar")
+    total = store.count(prefijo)
+    paginas = max(1, -(-total // PAGE_SIZE))
+    pagina = c2.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, key="lead_pagina")
+
+    with profiler.span("leads_buscar"):
+        rows = store.search(prefijo, limit=PAGE_SIZE, offset=(int(pagina) - 1) * PAGE_SIZE)
+    if not rows:
+        st.info("Ningún lead coincide con la búsqueda.")
+    else:
+        labels = {r["id"]: f'[{r["id"]}] {r["empresa"]} · {r["nombre"]}' for r in rows}
+        ids = list(labels)
+        activo = st.session_state["active_lead_idx"]
+        lead = store.get(activo) if activo is not None else None
+        if lead and activo not in labels:
+            # El lead activo está en otra página (o fuera de la búsqueda): se sigue mostrando
+            labels[activo] = f'[{activo}] {lead["empresa"]} · {lead["nombre"]} (activo)'
+            ids.insert(0, activo)
+        st.session_state["lead_select"] = activo if lead else None
+        st.selectbox("Selecciona lead activo", options=ids, format_func=labels.get, key="lead_select",
+                     placeholder="Elige un lead…", on_change=_elegir_lead)
+        st.session_state["lead"] = lead
+        st.caption(f"{total} leads encontrados.")
+        if lead:
+            st.markdown(f"""
 **Empresa:** {lead['empresa']}  
 **Contacto:** {lead['nombre']} · {lead['correo']} · {lead['telefono']}  
 **Descripción:** {lead['descripcion']}
 """)
-    st.success("Este lead quedará **activo** para la Fase 2.")
+            st.success("Este lead quedará **activo** para la Fase 2.")
+
+# ------------------------------ Memoria de proyectos ------------------------------
+st.markdown("### Memoria de proyectos")
+memoria = get_memory()
+
+with st.form("proyecto_form", clear_on_submit=True):
+    col1, col2 = st.columns(2)
+    with col1:
+        p_nombre  = st.text_input("Proyecto")
+        p_cliente = st.text_input("Cliente")
+    with col2:
+        p_desc      = st.text_area("Descripción del proyecto", height=68)
+        p_resultado = st.text_input("Resultado / aprendizajes")
+    if st.form_submit_button("Registrar proyecto previo"):
+        if not (p_nombre.strip() or p_desc.strip()):
+            st.warning("⚠️ Indica al menos el nombre o la descripción del proyecto.")
+        else:
+            memoria.add({"nombre": p_nombre, "cliente": p_cliente,
+                         "descripcion": p_desc, "resultado": p_resultado})
+            st.success("✅ Proyecto registrado en memoria.")
+
+lead_activo = st.session_state.get("lead") or {}
+if not memoria.count():
+    st.info("Aún no hay proyectos en memoria.")
+elif (lead_activo.get("descripcion") or "").strip():
+    with profiler.span("memoria_buscar"):
+        similares = memoria.search(lead_activo["descripcion"], k=5)
+    st.session_state["memoria_proyectos"] = similares
+    st.markdown("**Proyectos similares al lead activo**")
+    for p in similares:
+        st.markdown(f"- **{p['nombre'] or '(sin nombre)'}** · {p['cliente']} — {p['descripcion']} "
+                    f"*(similitud {p['similitud']:.2f})*")
+else:
+    st.caption("Agrega una descripción al lead activo para ver proyectos similares.")
+
+with profiler.span("estado"):
+    state.commit()
+profiler.end_run()
+profiler.render_panel()
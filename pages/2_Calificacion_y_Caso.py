@@ -1,173 +1,33 @@
-import streamlit as st
-import re
-from datetime import datetime
+from core import profiler
+
+profiler.begin_run("calificacion_caso")
+with profiler.span("import"):
+    import streamlit as st
+    from datetime import datetime
+
+    from core import state
+    from core.analytics import get_analytics
+    from core.chat import CHAT_WINDOW, PAGE_SIZE
+    from core.crawler import comparison_section, get_crawler
+    from core.journal import get_journal
+    from core.pdf import logo_bytes, pdf_cache
+    from core.plan import LivePlan, add_section, build_plan
+    from core.refine import get_refiner
+    from core.rfp import ingest_rfp, prefill_answers
+    from core.scoring import CRITERIA_KEYS, THRESHOLD, score_bytes, score_lead
+    from core.suggest import case_context, get_suggester
 
 # ------------------------------ Config ------------------------------
 st.set_page_config(page_title="Calificación + Caso", page_icon="🧩", layout="wide")
 st.title("2) Calificación + Caso (chat) + Competencia")
-
-# ------------------------------ Cuestionario oficial ------------------------------
-QUESTIONS = [
-    ("objetivos",      "¿Cuáles son los **objetivos de negocio**?"),
-    ("problema",       "¿Cuál es el **problema a resolver**?"),
-    ("solucion",       "¿Cuál es la **solución esperada**?"),
-    ("target",         "¿Quién va a utilizar la solución? — **TARGET**"),
-    ("funcionalidades","¿Qué **funcionalidades** espera tener?"),
-    ("expectativas",   "¿Qué **expectativas** tiene con esta solución?"),
-    ("experiencia",    "¿Ha tenido **experiencia previa** similar a este proyecto?"),
-    ("adjudicacion",   "¿Cuál es la **forma de adjudicación**?"),
-    ("criterios",      "¿Cuáles son los **criterios de evaluación**?"),
-    ("lanzamiento",    "¿Cuál sería la **fecha de lanzamiento**?"),
-    ("presupuesto",    "¿Cuál es el **rango del presupuesto**?"),
-    ("caso",           "**Caso de negocio:** (beneficios, ROI/ahorros/KPIs)"),
-    ("nombre",         "**Nombre de proyecto:**"),
-    ("notas",          "**Notas generales:**"),
-]
-
-# ------------------------------ Parsers / señales ------------------------------
-money_rx = re.compile(r"(?:USD|US\$|MXN|\$|EUR|€)\s?([\d.,]+)|([\d.,]+)\s?(?:USD|US\$|MXN|EUR|€)", re.I)
-date_rx  = re.compile(r"\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b")
-month_words = ("enero","febrero","marzo","abril","mayo","junio","julio","agosto","septiembre","octubre","noviembre","diciembre","q1","q2","q3","q4","semana","mes")
-roles_rx = re.compile(r"\b(CTO|CFO|CEO|COO|CIO|CMO|Compras|Procurement|IT|Operaciones|Soporte|Ventas|Marketing|Finanzas|RH|Direcci[oó]n|Gerente|Jefe|L[ií]der)\b", re.I)
-award_words = ("licitación","invitación","adjudicación directa","concurso","RFP","RFQ","marco","convenio")
-criteria_words = ("precio","calidad","tiempo","soporte","SLA","experiencia","referencias","ROI","seguridad","cumplimiento","integración","capacidad","plazos")
-
-def has_money(t: str) -> bool:
-    return bool(money_rx.search(t or ""))
-
-def has_date(t: str) -> bool:
-    t = t or ""
-    return bool(date_rx.search(t)) or any(w in t.lower() for w in month_words)
-
-def count_list_items(t: str) -> int:
-    t = (t or "").strip()
-    return t.count(",") + t.count(";") + (1 if len(t) > 0 else 0)
-
-def mentions_roles_or_area(t: str) -> bool:
-    t = t or ""
-    return bool(roles_rx.search(t)) or any(w in t.lower() for w in ["usuarios","operadores","clientes","agentes","analistas","administradores"])
-
-def mentions_any(t: str, words) -> bool:
-    t = (t or "").lower()
-    return any(w in t for w in words)
-
-def has_kpis(t: str) -> bool:
-    return bool(re.search(r"\bROI|NPS|CSAT|SLA|MTTR|conversi[oó]n|ingres|ahorro|cost|%|\bhoras\b|\bd[ií]as\b", t or "", re.I))
-
-# ------------------------------ build_plan GLOBAL ------------------------------
-def ai_refine(label, text):
-    t = (text or "").strip()
-    if not t:
-        if label == "funcionalidades":
-            return "MVP con dashboard, gestión de usuarios/roles, alertas y exportación de reportes."
-        if label == "criterios":
-            return "Precio total, calidad de entrega, tiempo de implementación, soporte/SLA y experiencia comprobable."
-        if label == "lanzamiento":
-            return "Definir hito (mes/fecha o trimestre) y plan de piloto previo."
-        if label == "presupuesto":
-            return "Rango estimado a definir con Finanzas y Compras."
-        if label == "caso":
-            return "Se espera ROI positivo mediante ahorro operativo y mejora de KPIs de servicio."
-        return "Pendiente por confirmar."
-    t = t.replace("\n", " ").strip()
-    if label in ("objetivos", "problema", "solucion", "expectativas", "caso") and not has_kpis(t):
-        t += " (Incluir KPIs: ROI esperado, ahorro %, mejora de SLA/MTTR, conversión o NPS/CSAT)."
-    if label == "funcionalidades" and (t.count(",") + t.count(";")) < 2:
-        t += " (Detalle al menos 3–4 funcionalidades del MVP)."
-    return t
-
-def build_plan(a: dict):
-    objetivos = ai_refine("objetivos", a.get("objetivos", ""))
-    problema  = ai_refine("problema", a.get("problema", ""))
-    solucion  = ai_refine("solucion", a.get("solucion", ""))
-    target    = ai_refine("target", a.get("target", ""))
-    funcs     = ai_refine("funcionalidades", a.get("funcionalidades", ""))
-    expectativas = ai_refine("expectativas", a.get("expectativas", ""))
-    experiencia  = ai_refine("experiencia", a.get("experiencia", ""))
-    adjudic      = ai_refine("adjudicacion", a.get("adjudicacion", ""))
-    criterios    = ai_refine("criterios", a.get("criterios", ""))
-    lanzamiento  = ai_refine("lanzamiento", a.get("lanzamiento", ""))
-    presupuesto  = ai_refine("presupuesto", a.get("presupuesto", ""))
-    caso         = ai_refine("caso", a.get("caso", ""))
-    nombre       = (a.get("nombre", "") or "").strip() or "(pendiente)"
-    notas        = (a.get("notas", "") or "").strip()
-
-    faltantes = [k for k, _ in QUESTIONS if not (a.get(k, "") or "").strip()]
-    checklist = ", ".join(faltantes) if faltantes else "Completo ✅"
-
-    # Detección local de riesgos/objeciones en 'notas'
-    risk_rx = re.compile(r"\b(riesgo|objeci[oó]n|costo|seguridad|legal|compliance|privacidad|cambio|adopci[oó]n|integraci[oó]n|soporte)\b", re.I)
-    notas_tienen_riesgos = bool(risk_rx.search(notas or ""))
-
-    siguiente = (
-        "Proponer **POC** de 2 semanas con alcance, métricas y responsables."
-        if (has_kpis(expectativas) or has_kpis(caso)) else
-        "Agendar **workshop** (90 min) para cerrar funcionalidades, KPIs y timeline."
-    )
-
-    md = f"""
-# {nombre}
-
-## 1. Resumen ejecutivo
-**Objetivos de negocio:** {objetivos}
-
-**Problema a resolver:** {problema}
-
-**Solución esperada:** {solucion}
-
-**TARGET / usuarios:** {target}
-
----
-
-## 2. Alcance y MVP
-**Funcionalidades (MVP):** {funcs}
-
-**Expectativas de valor:** {expectativas}
-
-**Caso de negocio (beneficios/KPIs):** {caso}
-
----
-
-## 3. Plan de entrega
-**Fecha de lanzamiento / hito:** {lanzamiento}
-
-**Tipo de adjudicación:** {adjudic}
-
-**Criterios de evaluación:** {criterios}
-
-**Experiencia previa del cliente:** {experiencia}
-
----
-
-## 4. Presupuesto
-**Rango/Monto:** {presupuesto}
-
----
-
-## 5. Riesgos y mitigación
-**Riesgos/objeciones:** {notas if notas_tienen_riesgos else "Identificar riesgos técnicos/legales/operativos y plan de mitigación."}
-
----
-
-## 6. Siguiente paso
-{siguiente}
-
----
-
-### Notas generales
-{notas or "—"}
-
----
-
-**Checklist:** {checklist}
-"""
-    return md, checklist
+with profiler.span("estado"):
+    state.attach()  # restaura la sesión persistida (?sid=...) si este proceso aún no la tiene
 
 # ------------------------------ Tabs ------------------------------
 tabs = st.tabs(["A) Calificación", "B) Caso (chat inteligente)", "C) Competencia & PDF"])
 
 # ============================== TAB A: Calificación ==============================
-with tabs[0]:
+with tabs[0], profiler.span("tab_a"):
     st.subheader("Calificación del lead (20/30/30/5/5)")
     st.write("Debes alcanzar un **70%** para habilitar el chat del caso.")
 
@@ -188,101 +48,175 @@ with tabs[0]:
         ):
             st.warning("⚠️ Responde las 5 preguntas antes de calcular.")
         else:
-            score = 0
-            if fecha == "Sí": score += 20
-            if marketing == "Sí": score += 30
-            if presupuesto == "Sí": score += 30
-            if prioridad == "Sí": score += 5
-            if decision == "Sí": score += 5
+            respuestas = {"fecha": fecha, "marketing": marketing, "presupuesto": presupuesto,
+                          "prioridad": prioridad, "decision": decision}
+            score = score_lead(respuestas)
+            # Evento para la analítica del pipeline (pages/3_Analitica.py)
+            get_analytics().record(respuestas, st.session_state.get("active_lead_idx"))
             st.session_state.lead_score = score
-            if score >= 70:
+            if score >= THRESHOLD:
                 st.success(f"Calificación: **{score}/100** — Puedes pasar a la pestaña **B) Caso (chat)**.")
             else:
                 st.warning(f"Calificación: **{score}/100** — Aún no alcanza el umbral de 70.")
 
     st.caption("Responde las 5 preguntas para calcular la calificación.")
 
+    with st.expander("📦 Calificación por lotes (CSV / JSONL)"):
+        st.caption("Columnas esperadas: " + ", ".join(f"`{k}`" for k in CRITERIA_KEYS) + " (valores Sí/No).")
+        lote = st.file_uploader("Archivo de leads", type=["csv", "jsonl"], key="cal_lote")
+        # Se califica una vez por archivo (al pulsar el botón), no en cada rerun de la página
+        res = st.session_state.get("cal_lote_res")
+        if res and (lote is None or res["file_id"] != lote.file_id):
+            del st.session_state["cal_lote_res"]  # se quitó o cambió el archivo
+            res = None
+        if lote is not None and res is None and st.button("Calificar archivo", use_container_width=True):
+            try:
+                with st.spinner("Calificando…"), profiler.span("lote"):
+                    data, n, n_ok = score_bytes(lote.getvalue(), lote.name)
+            except ValueError as e:
+                st.error(f"No se pudo calificar {lote.name}: {e}")
+            else:
+                res = st.session_state["cal_lote_res"] = {"file_id": lote.file_id, "data": data, "n": n,
+                                                          "n_ok": n_ok}
+        if res:
+            st.success(f"{res['n']} leads calificados · {res['n_ok']} con score ≥ {THRESHOLD}.")
+            # Con un callable el archivo solo se entrega al hacer clic (no se re-registra en cada rerun)
+            st.download_button("⬇️ Descargar leads calificados", data=lambda: res["data"],
+                               file_name=f"calificados_{lote.name}", use_container_width=True)
+
 # ============================== TAB B: Chat del Caso (construcción del plan) ==============================
-with tabs[1]:
-    if st.session_state.get("lead_score", 0) < 70:
+with tabs[1], profiler.span("tab_b"):
+    if st.session_state.get("lead_score", 0) < THRESHOLD:
         st.warning("⚠️ Primero completa la **calificación** y alcanza al menos **70** para continuar.")
+    elif not st.session_state.get("active_lead_idx"):
+        # Sin lead no hay caso propio: un caso "sin lead" lo compartirían todas las sesiones
+        st.warning("⚠️ Elige o guarda un lead en **1) Lead y Memoria** para iniciar el caso.")
     else:
         st.success("✅ Lead calificado. Inicia el **chat**: iré construyendo el **Plan de Negocio** a la derecha.")
 
-        # ---- Estado del chat ----
-        if "case_chat_msgs" not in st.session_state:
-            st.session_state.case_chat_msgs = []
-        if "case_answers" not in st.session_state:
-            st.session_state.case_answers = {k: "" for k, _ in QUESTIONS}
-        if "case_current_key" not in st.session_state:
-            st.session_state.case_current_key = QUESTIONS[0][0]
-
-        def next_unanswered_key():
-            for k, _ in QUESTIONS:
-                if not st.session_state.case_answers.get(k, "").strip():
-                    return k
-            return None
-
-        def question_for(key):
-            for k, q in QUESTIONS:
-                if k == key:
-                    return q
-            return "¿Algo más?"
+        # ---- Caso del lead activo (bitácora por lead: snapshot + cola de eventos) ----
+        journal = get_journal()
+        lead_id = st.session_state["active_lead_idx"]
+        case = st.session_state.get("case")
+        if case is None or case.lead_id != lead_id:
+            with profiler.span("caso_cargar"):
+                case = journal.load(lead_id)
+            st.session_state.case = case
+            st.session_state.case_plan = LivePlan()
+            for k in ("plan_md", "ready_for_pdf", "pdf_bytes"):
+                st.session_state.pop(k, None)
+        # Alias para el resto de la página (y TAB C)
+        st.session_state.case_answers = case.answers
+        st.session_state.case_chat_msgs = case.chat
+        st.session_state.case_current_key = case.current_key
+        refiner = get_refiner()
+
+        # ---- Pre-llenado desde un RFP en PDF (lectura página por página) ----
+        with st.expander("📄 Pre-llenar desde RFP (PDF)"):
+            rfp = st.file_uploader("Documento RFP", type=["pdf"], key="case_rfp")
+            if rfp is not None and st.button("Extraer datos del RFP", use_container_width=True):
+                with st.spinner("Leyendo RFP…"):
+                    campos, n_pag = ingest_rfp(rfp)
+                propuestas = dict(case.answers)
+                rellenados = prefill_answers(propuestas, campos)
+                if rellenados:
+                    journal.record(case, "rfp", campos={k: propuestas[k] for k in rellenados}, paginas=n_pag)
+                    state.commit()
+                    st.rerun()
+                else:
+                    st.info(f"Leí {n_pag} páginas, pero no encontré datos nuevos para los campos pendientes.")
 
         # Layout: Chat | Plan
         left, right = st.columns([0.56, 0.44])
 
-        # Mensajes iniciales
-        if not st.session_state.case_chat_msgs:
-            st.session_state.case_chat_msgs.append(("assistant",
-                "Usaremos el **cuestionario oficial**. A medida que respondas, iré armando el **Plan de Negocio** a la derecha."))
-            st.session_state.case_chat_msgs.append(("assistant", question_for(st.session_state.case_current_key)))
-
         # Izquierda: chat
         with left:
-            for role, content in st.session_state.case_chat_msgs:
+            # Solo se pinta la ventana reciente; lo anterior se consulta por páginas
+            hist = st.session_state.case_chat_msgs
+            antiguos = len(hist) - CHAT_WINDOW
+            if antiguos > 0:
+                with st.expander(f"🕘 Historial anterior ({antiguos} mensajes)"):
+                    n_pag = -(-antiguos // PAGE_SIZE)
+                    pag = st.selectbox("Página", [None] + list(range(n_pag)), key="case_hist_pag",
+                                       format_func=lambda p: "—" if p is None else
+                                       f"Mensajes {p * PAGE_SIZE + 1}–{min((p + 1) * PAGE_SIZE, antiguos)}")
+                    if pag is not None:
+                        for role, content in hist[pag * PAGE_SIZE:min((pag + 1) * PAGE_SIZE, antiguos)]:
+                            with st.chat_message(role):
+                                st.markdown(content)
+            for role, content in hist.tail(CHAT_WINDOW):
                 with st.chat_message(role):
                     st.markdown(content)
 
             user_text = st.chat_input("Escribe tu respuesta…")
+            # Sugerencias: respuestas a esta pregunta en casos completos parecidos
+            if case.current_key:
+                with profiler.span("sugerencias"):
+                    sugerencias = get_suggester().suggest(
+                        case.current_key,
+                        case_context(case.answers, st.session_state.get("lead"), skip=case.current_key))
+                if sugerencias:
+                    st.caption("💡 Respuestas de casos anteriores")
+                    for i, (texto, _) in enumerate(sugerencias):
+                        etiqueta = texto if len(texto) <= 90 else texto[:89] + "…"
+                        if st.button(etiqueta, key=f"case_sug_{i}", help=texto, use_container_width=True):
+                            user_text = texto
             if user_text:
-                cur = st.session_state.case_current_key
-                st.session_state.case_chat_msgs.append(("user", user_text))
-                prev = st.session_state.case_answers.get(cur, "")
-                st.session_state.case_answers[cur] = (prev + " " + user_text).strip()
-
-                # Avanza al siguiente pendiente
-                nxt = next_unanswered_key()
-                st.session_state.case_current_key = nxt
-
-                if nxt:
-                    st.session_state.case_chat_msgs.append(("assistant", f"Anotado. **Siguiente:** {question_for(nxt)}"))
-                else:
-                    st.session_state.case_chat_msgs.append(("assistant", "✅ **Plan completo.** Revisa la vista previa a la derecha."))
+                # Se registra en la bitácora; respuestas, siguiente pregunta y chat salen del evento
+                journal.record(case, "turno", key=case.current_key, text=user_text)
+                if refiner:  # refinamiento con IA en segundo plano (no bloquea el chat)
+                    refiner.submit(case.answers)
+                state.commit()
                 st.rerun()
 
         # Derecha: plan en vivo (SIN botón .md)
         with right:
-            md, checklist = build_plan(st.session_state.case_answers)
+            # Solo se re-renderizan las secciones cuyas respuestas cambiaron
+            # (los textos refinados por IA sustituyen a los de reglas en cuanto llegan)
+            plan = st.session_state.case_plan
+            refined = refiner.lookup(st.session_state.case_answers) if refiner else None
+            with profiler.span("build_plan"):
+                plan.update(st.session_state.case_answers, refined)
+            md = plan.md
 
             # Guardar para el Tab C
             st.session_state.plan_md = md
-            st.session_state.ready_for_pdf = (checklist == "Completo ✅")
+            st.session_state.ready_for_pdf = plan.complete
+            if plan.complete:  # "Completo ✅": sus respuestas alimentan las sugerencias (una vez por contenido)
+                get_suggester().add_case(case.answers, lead_id)
 
-            total_campos = len(QUESTIONS)
-            completos = total_campos if checklist == "Completo ✅" else total_campos - checklist.count(",")
-            prog = int((completos / total_campos) * 100)
+            prog = plan.progress
 
             st.subheader("📋 Plan de Negocio (vivo)")
             st.progress(min(prog, 100), text=f"Progreso: {prog}%")
+            if refiner and refiner.pending():
+                c_ia, c_btn = st.columns([3, 1])
+                c_ia.caption("✨ Refinando respuestas con IA… se muestra la versión basada en reglas.")
+                c_btn.button("🔄 Actualizar", key="case_refresh")
 
             with st.expander("📄 Vista previa (Markdown)", expanded=True):
                 st.markdown(md)
 
 # ============================== TAB C: Competencia & PDF ==============================
-with tabs[2]:
+with tabs[2], profiler.span("tab_c"):
     st.subheader("Competencia & PDF")
 
+    # ---- Inteligencia competitiva (Babel vs. competidores) ----
+    urls_txt = st.text_area("URLs de Babel y competidores (una por línea)",
+                            value="\n".join(st.session_state.get("comp_urls") or []), height=100)
+    if st.button("🔎 Analizar competencia", use_container_width=True):
+        st.session_state["comp_urls"] = [u.strip() for u in urls_txt.splitlines() if u.strip()]
+        crawler = get_crawler()
+        with st.spinner("Descargando páginas…"):
+            paginas = crawler.crawl(st.session_state["comp_urls"])
+        st.session_state["comp_md"] = comparison_section(paginas)
+        fallidas = [p["url"] for p in paginas if p["error"] and not p["text"]]
+        if fallidas:
+            st.warning("No se pudieron descargar: " + ", ".join(fallidas))
+    if st.session_state.get("comp_md"):
+        st.markdown(st.session_state["comp_md"])
+    st.markdown("---")
+
     if not st.session_state.get("ready_for_pdf"):
         st.info("Completa el **Caso (chat)** al 100% para habilitar la exportación a PDF.")
     else:
@@ -292,62 +226,47 @@ with tabs[2]:
         plan_md = st.session_state.get("plan_md")
         if not plan_md:
             plan_md, _ = build_plan(st.session_state.case_answers)
+        plan_md = add_section(plan_md, st.session_state.get("comp_md", ""))
 
-        # ---- Generar PDF con reportlab (importar dentro para evitar errores si no está instalado) ----
-        from io import BytesIO
-        from reportlab.lib.pagesizes import letter
-        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Image
-        from reportlab.lib.styles import getSampleStyleSheet
-
-        pdf_buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            pdf_buffer,
-            pagesize=letter,
-            leftMargin=50, rightMargin=50, topMargin=80, bottomMargin=50
-        )
-
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Logo (opcional)
-        try:
-            story.append(Image("logo_babel.jpeg", width=120, height=60))
-            story.append(Spacer(1, 18))
-        except Exception:
+        # ---- PDF desde caché (solo se reconstruye si cambia el texto del plan) ----
+        if logo_bytes() is None:
             st.caption("No se encontró 'logo_babel.jpeg' (opcional).")
-
-        # Título
-        story.append(Paragraph("<b>Plan de Negocio – Babel</b>", styles["Title"]))
-        story.append(Spacer(1, 12))
-
-        # Pasar el contenido línea por línea (markdown simplificado)
-        for line in plan_md.split("\n"):
-            t = line.strip()
-            if not t:
-                story.append(Spacer(1, 6))
-                continue
-            t = t.lstrip("# ").strip()  # quitar hashes de encabezado
-            story.append(Paragraph(t, styles["Normal"]))
-            story.append(Spacer(1, 6))
-
-        # Construir PDF
-        doc.build(story)
-        pdf_data = pdf_buffer.getvalue()
+        with profiler.span("pdf"):
+            pdf_data = pdf_cache.get_or_render(plan_md)
+        st.session_state["pdf_bytes"] = pdf_data
 
         st.download_button(
             "⬇️ Descargar Plan de Negocio (PDF)",
-            data=pdf_data,
+            data=lambda: pdf_data,   # se entrega al hacer clic (no se re-registra en cada rerun)
             file_name="Plan_de_Negocio_Babel.pdf",
             mime="application/pdf",  # si tu navegador previsualiza, cambia a "application/octet-stream"
             use_container_width=True
         )
+        cs = pdf_cache.stats()
+        st.caption(f"Caché PDF: {cs['hits']} aciertos · {cs['misses']} fallos · {cs['entries']}/{cs['max_entries']} entradas")
 
 # ------------------------------ Sidebar ------------------------------
-with st.sidebar:
+with st.sidebar, profiler.span("sidebar"):
     st.subheader("Estado")
     st.metric("Calificación (lead)", st.session_state.get("lead_score", 0))
     st.metric("Listo para PDF", "Sí" if st.session_state.get("ready_for_pdf", False) else "No")
+    case = st.session_state.get("case")
+    if case is not None:
+        h = get_journal().history(case.lead_id)
+        st.caption(f"Caso del lead #{case.lead_id} · {h['eventos']} eventos en bitácora")
+        if st.button("Empezar caso de nuevo", use_container_width=True):
+            get_journal().record(case, "reinicio")  # la bitácora conserva los turnos anteriores
+            st.session_state.case_plan = LivePlan()
+            state.commit()
+            st.rerun()
+    # El caso sigue en la bitácora del lead: se retoma al volver a esta página
     if st.button("Reiniciar sesión", use_container_width=True):
-        for k in ("lead_score","case_chat_msgs","case_answers","case_current_key","ready_for_pdf","plan_md"):
+        for k in ("lead_score","case","case_chat_msgs","case_answers","case_current_key","case_plan","ready_for_pdf","plan_md","pdf_bytes","comp_md"):
             if k in st.session_state: del st.session_state[k]
-        st.experimental_rerun()
+        state.commit()
+        st.rerun()
+
+with profiler.span("estado"):
+    state.commit()
+profiler.end_run()
+profiler.render_panel()
@@ -0,0 +1,86 @@
+from core import profiler
+
+profiler.begin_run("analitica")
+with profiler.span("import"):
+    import streamlit as st
+    from datetime import timedelta
+
+    from core import state
+    from core.analytics import get_analytics
+    from core.scoring import CRITERIA, THRESHOLD
+
+# ------------------------------ Config ------------------------------
+st.set_page_config(page_title="Analítica", page_icon="📊", layout="wide")
+st.title("3) Analítica de calificación")
+with profiler.span("estado"):
+    state.attach()
+
+PERIODOS = {"Día": "dia", "Semana": "semana", "Mes": "mes"}
+CRITERIOS = [k for k, _, _ in CRITERIA]
+
+# Pliega solo los eventos nuevos desde el último refresco del proceso
+with profiler.span("refresco"):
+    analytics = get_analytics()
+    nuevos = analytics.refresh()
+    total = analytics.summary("mes")
+
+if not total["total"]:
+    st.info("Aún no hay calificaciones registradas. Califica un lead en **2) Calificación + Caso**.")
+else:
+    # ------------------------------ Filtros ------------------------------
+    primer, ultimo = total["primer_dia"].item(), total["ultimo_dia"].item()
+    c1, c2 = st.columns([1, 2])
+    periodo = c1.radio("Agrupar por", list(PERIODOS), index=1, horizontal=True, key="an_periodo")
+    rango = c2.date_input("Rango (días UTC)", value=(max(primer, ultimo - timedelta(days=180)), ultimo),
+                          min_value=primer, max_value=ultimo, key="an_rango")
+    desde, hasta = (rango[0], rango[-1]) if isinstance(rango, (tuple, list)) and rango else (primer, ultimo)
+
+    with profiler.span("consulta"):
+        s = analytics.summary(PERIODOS[periodo], desde, hasta)
+    n = s["total"]
+
+    # ------------------------------ KPIs ------------------------------
+    bloqueos = s["bloqueos"].sum(axis=0)
+    k1, k2, k3, k4, k5 = st.columns(5)
+    k1.metric("Leads calificados", f"{n:,}")
+    k2.metric("Evaluaciones", f"{s['total_evaluaciones']:,}")
+    k3.metric(f"Leads con score ≥ {THRESHOLD}", f"{s['calificados'].sum() / n:.0%}" if n else "—")
+    k4.metric("Score promedio por lead", f"{(s['score_medio'] * s['leads']).sum() / n:.1f}" if n else "—")
+    k5.metric("Criterio que más bloquea", CRITERIOS[int(bloqueos.argmax())] if bloqueos.any() else "—")
+    st.caption("Cada lead cuenta una vez, con su última calificación y en el periodo de esa calificación; "
+               "**Evaluaciones** incluye las re-calificaciones.")
+
+    if n:
+        import pandas as pd
+
+        etiquetas = [str(p) for p in s["periodos"]]
+        g1, g2 = st.columns(2)
+        with g1:
+            st.markdown("**Distribución de score**")
+            valores = list(range(0, 101, 5))
+            st.bar_chart(pd.DataFrame({"leads": s["histograma"][valores]}, index=valores))
+        with g2:
+            st.markdown(f"**Criterios en «No» en leads bajo {THRESHOLD}**")
+            st.bar_chart(pd.DataFrame({"bloqueos": bloqueos}, index=CRITERIOS))
+
+        st.markdown(f"**% de leads ≥ {THRESHOLD} por {periodo.lower()}**")
+        share = (s["calificados"] / s["leads"].clip(min=1) * 100).round(1)
+        st.line_chart(pd.DataFrame({f"% leads ≥ {THRESHOLD}": share}, index=etiquetas))
+
+        tabla = pd.DataFrame({
+            "Periodo": etiquetas,
+            "Leads": s["leads"],
+            "Evaluaciones": s["evaluaciones"],
+            f"Leads ≥ {THRESHOLD}": s["calificados"],
+            f"% leads ≥ {THRESHOLD}": share,
+            "Score promedio": s["score_medio"].round(1),
+            **{f"Bloquea: {c}": s["bloqueos"][:, j] for j, c in enumerate(CRITERIOS)},
+        })
+        st.dataframe(tabla.iloc[::-1], hide_index=True, use_container_width=True)
+
+st.caption(f"{len(analytics.log):,} eventos en el almacén · {nuevos:,} nuevos plegados en este rerun.")
+
+with profiler.span("estado"):
+    state.commit()
+profiler.end_run()
+profiler.render_panel()
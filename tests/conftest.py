@@ -0,0 +1,5 @@
+# tests/conftest.py — Las pruebas importan `core` desde la raíz del repo (como bench/)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,32 @@
+# tests/test_chat.py — ChatHistory se comporta como una lista de (rol, contenido)
+import itertools
+
+import pytest
+
+from core.chat import PAGE_SIZE, ChatHistory
+
+
+@pytest.mark.parametrize("n", [0, 1, PAGE_SIZE - 1, 2 * PAGE_SIZE, 5 * PAGE_SIZE + 7])
+def test_indices_y_slices_como_lista(n):
+    msgs = [("user" if i % 2 else "assistant", f"mensaje {i}") for i in range(n)]
+    h = ChatHistory(msgs)
+    assert len(h) == n and list(h) == msgs
+    for i in range(-n, n):
+        assert h[i] == msgs[i]
+    bounds = [None, 0, 1, 3, PAGE_SIZE, n // 2, n - 1, n, n + 5, -1, -3, -PAGE_SIZE, -n - 5]
+    for start, stop, step in itertools.product(bounds, bounds, [None, 1, 2, 7, -1, -2, -PAGE_SIZE - 1]):
+        s = slice(start, stop, step)
+        assert h[s] == msgs[s], s
+
+
+def test_indice_fuera_de_rango():
+    h = ChatHistory([("user", "hola")])
+    with pytest.raises(IndexError):
+        h[1]
+    with pytest.raises(IndexError):
+        h[-2]
+
+
+def test_serializacion_conserva_mensajes():
+    msgs = [("user", f"ñandú {i}") for i in range(3 * PAGE_SIZE + 2)]
+    assert list(ChatHistory.from_bytes(ChatHistory(msgs).to_bytes())) == msgs